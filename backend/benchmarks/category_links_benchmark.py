@@ -0,0 +1,114 @@
+"""
+Benchmark category-page link discovery.
+
+Compares the previous approach (parse the page with BeautifulSoup, run every
+link selector with soup.select and urljoin each hit) with the single-pass
+harvest used by BaseNewsExtractor, on synthetic category page fixtures.
+
+Run from the backend directory:
+    python -m benchmarks.category_links_benchmark [--cards 300] [--repeat 20]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+from unittest.mock import Mock
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from src.scrapers.aussie_news_extractor import ABCNewsExtractor, NewsComAUExtractor, SMHExtractor
+from src.scrapers.base_extractor import BaseNewsExtractor
+from src.scrapers.link_harvester import harvest_anchors
+
+
+def build_fixture(extractor: BaseNewsExtractor, cards: int, seed: int = 7) -> str:
+    """Build a category page resembling the source's markup"""
+    rng = random.Random(seed)
+    source = extractor.source
+    parts = ['<html><head><title>Category</title></head><body><nav>']
+    parts.extend(f'<a href="/news/section-{i}">Section {i}</a>' for i in range(40))
+    parts.append('</nav><main>')
+
+    for i in range(cards):
+        article_id = 100000000 + rng.randrange(10 ** 8)
+        if source == "ABC News":
+            href = f"/news/2024-05-{i % 28 + 1:02d}/story-title-number-{i}/{article_id}"
+            wrapper = rng.choice(['ContentHub_articles', 'FeaturedContent_item', 'Card'])
+            link = f'<a class="Card_link" href="{href}">Story {i}</a>'
+        elif source == "News.com.au":
+            href = f"/sport/football/story-title-number-{i}/news-story/{article_id:x}"
+            wrapper = rng.choice(['story-block', 'module-story', 'card'])
+            link = f'<h3 class="headline"><a class="story-headline-link" href="{href}">Story {i}</a></h3>'
+        else:
+            href = f"/sport/rugby/story-title-number-{i}-20240501-p5{article_id:x}.html"
+            wrapper = rng.choice(['story', 'card'])
+            link = f'<h3><a class="story-link" data-component="Link" href="{href}">Story {i}</a></h3>'
+
+        parts.append(
+            f'<div class="{wrapper}"><div class="media"><img src="/img/{i}.jpg" alt="">'
+            f'</div>{link}<p>Summary paragraph for story {i} with some text.</p>'
+            f'<a href="{href}#comments">Comments</a></div>'
+        )
+
+    parts.append('</main><footer>')
+    parts.extend(f'<a href="/about/page-{i}">Footer {i}</a>' for i in range(30))
+    parts.append('</footer></body></html>')
+    return ''.join(parts)
+
+
+def legacy_links(extractor: BaseNewsExtractor, html: str) -> List[str]:
+    """Soup parse plus one soup.select per selector, as before"""
+    soup = BeautifulSoup(html, 'html.parser')
+    article_links = set()
+    for selector in extractor.get_link_selectors():
+        for link in soup.select(selector):
+            href = link.get('href')
+            if href:
+                full_url = urljoin(extractor.base_url, href)
+                if extractor.is_valid_category_link(full_url):
+                    article_links.add(full_url)
+    return list(article_links)
+
+
+def harvested_links(extractor: BaseNewsExtractor, html: str) -> List[str]:
+    """Single-pass harvest with selector predicates"""
+    return extractor.get_article_links(harvest_anchors(html), extractor.base_url)
+
+
+def time_call(func: Callable, repeat: int) -> float:
+    """Best wall time of repeated calls in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark category-page link discovery")
+    parser.add_argument('--cards', type=int, default=300, help="Article cards per fixture page")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed repetitions (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'source':<24}{'page KB':>9}{'links':>7}{'legacy ms':>11}{'harvest ms':>12}{'speedup':>9}")
+    for extractor_class in (ABCNewsExtractor, NewsComAUExtractor, SMHExtractor):
+        extractor = extractor_class(Mock())
+        html = build_fixture(extractor, args.cards)
+
+        legacy = legacy_links(extractor, html)
+        harvested = harvested_links(extractor, html)
+        if set(legacy) != set(harvested):
+            print(f"WARNING: {extractor.source} link sets differ "
+                  f"({len(legacy)} legacy vs {len(harvested)} harvested)")
+
+        legacy_ms = time_call(lambda: legacy_links(extractor, html), args.repeat)
+        harvest_ms = time_call(lambda: harvested_links(extractor, html), args.repeat)
+        print(f"{extractor.source:<24}{len(html) / 1024:>9.0f}{len(harvested):>7}"
+              f"{legacy_ms:>11.1f}{harvest_ms:>12.1f}{legacy_ms / harvest_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark NewsDatabase at archive scale.
+
+Generates a synthetic corpus (articles with bodies, similarity pairs,
+clusters and embeddings) into a temporary database and times the main
+ingestion and query paths: bulk save, get_articles with filters,
+get_similar_articles, get_article_clusters, the stats queries, the
+retrieval keyword search and the embedding join. Results are printed as a
+table and written as JSON, with the commit they were measured on, so runs
+can be compared across commits.
+
+Run from the backend directory:
+    python -m benchmarks.db_scale_benchmark [--articles 100000] [--repeat 5] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+from src.db.database_conn import NewsDatabase, encode_cursor
+from src.db.embedding_codec import encode_embedding
+from src.models.news_model import NewsArticle
+from src.services.categorization.base_classifier import ClassificationResult
+from src.services.similarity.similarity_models import ArticleCluster, SimilarityResult
+
+CATEGORIES = ['sports', 'lifestyle', 'music', 'finance']
+SOURCES = ['ABC News', 'News.com.au', 'Sydney Morning Herald', 'The Guardian Australia']
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+WORDS = ("budget council election harbour bushfire rates market shares coach final season album tour "
+         "festival recipe travel housing interest inflation storm rescue court ruling minister policy "
+         "drought rainfall energy battery transport stadium record injury trade profit wages").split()
+BOILERPLATE = ("Subscribe to our newsletter for the latest headlines every morning. "
+               "Our reporters cover breaking news across Australia and the world. ")
+# Articles per story; stories supply the similarity pairs and clusters
+STORY_SIZE = 4
+
+
+def make_batch(start: int, count: int, days: int, now: datetime, rng: random.Random):
+    """Synthetic articles start..start+count with classification results"""
+    articles, results = [], []
+    for index in range(start, start + count):
+        story = index // STORY_SIZE
+        story_rng = random.Random(story)
+        topic = story_rng.sample(WORDS, 3)
+        category = CATEGORIES[story % len(CATEGORIES)]
+        published = now - timedelta(days=story_rng.random() * days, minutes=rng.randrange(600))
+        body = ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(150, 600)))
+        articles.append(NewsArticle(
+            title=f"{' '.join(topic).capitalize()} update {index}",
+            url=f"https://example.com/{category}/{index}",
+            category=category,
+            summary=f"Latest on the {topic[0]} {topic[1]} story.",
+            published_date=published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            author=f"Reporter {rng.randrange(200)}",
+            content=f"{' '.join(topic)} {body} {BOILERPLATE}",
+            source=SOURCES[index % len(SOURCES)],
+            tags=topic[:2],
+            extracted_at=now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        ))
+        results.append(ClassificationResult(
+            category=category,
+            confidence=round(0.5 + rng.random() / 2, 3),
+            method_used=rng.choice(['keyword', 'hybrid', 'ml']),
+            explanation="synthetic",
+            alternatives=[],
+            features_used=[]
+        ))
+    return articles, results
+
+
+def build_corpus(db: NewsDatabase, args, rng: random.Random) -> Dict:
+    """Ingest the synthetic corpus and derived rows, timing the bulk saves"""
+    now = datetime.now(timezone.utc)
+    batch_ms = []
+    started = time.perf_counter()
+    for start in range(0, args.articles, args.batch):
+        articles, results = make_batch(start, min(args.batch, args.articles - start), args.days, now, rng)
+        batch_started = time.perf_counter()
+        db.save_articles_bulk(articles, results)
+        batch_ms.append((time.perf_counter() - batch_started) * 1000)
+    ingest_seconds = time.perf_counter() - started
+
+    # Re-saving the first batch as generated exercises the content hash short cut
+    articles, results = make_batch(0, min(args.batch, args.articles), args.days, now,
+                                    random.Random(args.seed))
+    unchanged_ms = time_call(lambda: db.save_articles_bulk(articles, results), 1)
+
+    with db.reader() as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM articles ORDER BY id")]
+
+    similarities = [
+        SimilarityResult(ids[first], ids[second], round(0.6 + rng.random() * 0.4, 3),
+                         rng.random(), rng.random(), rng.random(), 'synthetic', "same story")
+        for story_start in range(0, len(ids) - STORY_SIZE + 1, STORY_SIZE)
+        for first in range(story_start, story_start + STORY_SIZE)
+        for second in range(first + 1, story_start + STORY_SIZE)
+    ]
+    for start in range(0, len(similarities), args.batch):
+        db.save_similarities_bulk(similarities[start:start + args.batch])
+
+    clusters = [
+        ArticleCluster(f"cluster-{story_start}", ids[story_start], ids[story_start + 1:story_start + STORY_SIZE],
+                       0.8, datetime.now(), "Synthetic story", SOURCES[:STORY_SIZE])
+        for story_start in range(0, len(ids) - STORY_SIZE + 1, STORY_SIZE * 10)
+    ]
+    for start in range(0, len(clusters), args.batch):
+        db.save_article_clusters(clusters[start:start + args.batch])
+
+    embedded = ids[-int(len(ids) * args.embedded):] if args.embedded else []
+    for start in range(0, len(embedded), args.batch):
+        with db.writer() as conn:
+            # Same upsert as save_article_embedding: REPLACE would skip the counter DELETE triggers
+            conn.executemany("""
+                INSERT INTO article_embeddings (article_id, embedding_vector, embedding_model)
+                VALUES (?, ?, ?)
+                ON CONFLICT(article_id, embedding_model) DO UPDATE SET
+                    embedding_vector = excluded.embedding_vector,
+                    created_at = CURRENT_TIMESTAMP
+            """, [(article_id, encode_embedding([rng.gauss(0, 1) for _ in range(args.dimension)]), EMBEDDING_MODEL)
+                  for article_id in embedded[start:start + args.batch]])
+
+    return {
+        'articles': len(ids),
+        'similarities': len(similarities),
+        'clusters': len(clusters),
+        'embeddings': len(embedded),
+        'ingest_seconds': round(ingest_seconds, 3),
+        'articles_per_second': round(len(ids) / ingest_seconds, 1) if ingest_seconds else None,
+        'bulk_save_batch_ms': summarize(batch_ms),
+        'bulk_save_unchanged_batch_ms': round(unchanged_ms, 3),
+    }
+
+
+def time_call(func: Callable, repeat: int) -> float:
+    """Best wall time of repeated calls in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def summarize(durations: List[float]) -> Dict:
+    return {
+        'best_ms': round(min(durations), 3),
+        'median_ms': round(statistics.median(durations), 3),
+        'max_ms': round(max(durations), 3),
+    }
+
+
+def time_query(func: Callable, repeat: int) -> Dict:
+    """Timings of repeated calls plus the size of the last result"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+    timings = summarize(durations)
+    timings['rows'] = len(result) if hasattr(result, '__len__') else None
+    return timings
+
+
+def query_paths(db: NewsDatabase, ids: List[int], rng: random.Random) -> Dict[str, Callable]:
+    """The timed read paths; each call picks fresh parameters from rng"""
+    # Imported here: the chatbot services import numpy
+    from src.services.chatbot import embedding_service, retrieval_service
+
+    with patch.object(embedding_service, 'get_database', return_value=db), \
+            patch.object(retrieval_service, 'get_database', return_value=db):
+        embeddings = embedding_service.EmbeddingService()
+        retrieval = retrieval_service.RetrievalService(embeddings)
+
+    first_page = db.get_articles(limit=100)
+    page_cursor = encode_cursor(first_page[-1]) if first_page else None
+
+    def like_search():
+        fulltext, db.fulltext_enabled = db.fulltext_enabled, False
+        try:
+            return retrieval._keyword_search(f"{rng.choice(WORDS)} {rng.choice(WORDS)}", 10, days_back=30)
+        finally:
+            db.fulltext_enabled = fulltext
+
+    return {
+        'get_articles': lambda: db.get_articles(limit=100),
+        'get_articles_category': lambda: db.get_articles(category=rng.choice(CATEGORIES), limit=100),
+        'get_articles_source': lambda: db.get_articles(source=rng.choice(SOURCES), limit=100),
+        'get_articles_category_source': lambda: db.get_articles(
+            category=rng.choice(CATEGORIES), source=rng.choice(SOURCES), limit=100),
+        'get_articles_cursor_page': lambda: db.get_articles(limit=100, cursor=page_cursor),
+        'get_articles_with_content': lambda: db.get_articles(limit=100, include_content=True),
+        'get_recent_articles_24h': lambda: db.get_recent_articles(24, limit=100),
+        'get_articles_by_ids_100': lambda: db.get_articles_by_ids(rng.sample(ids, min(100, len(ids)))),
+        'get_similar_articles': lambda: db.get_similar_articles(rng.choice(ids)),
+        'get_article_clusters': lambda: db.get_article_clusters(limit=10),
+        'get_stats_counters': db.get_stats_counters,
+        'get_classification_stats': db.get_classification_stats,
+        'keyword_search': lambda: retrieval._keyword_search(
+            f"{rng.choice(WORDS)} {rng.choice(WORDS)}", 10, days_back=30),
+        'keyword_search_like': like_search,
+        'embedding_join': lambda: embeddings._get_articles_with_embeddings(),
+        'embedding_join_category': lambda: embeddings._get_articles_with_embeddings(rng.choice(CATEGORIES)),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args, db_path: str) -> Dict:
+    rng = random.Random(args.seed)
+    db = NewsDatabase(db_path)
+    try:
+        corpus = build_corpus(db, args, rng)
+        with db.reader() as conn:
+            ids = [row[0] for row in conn.execute("SELECT id FROM articles")]
+        if db.query_stats:
+            db.query_stats.reset()
+
+        queries = {name: time_query(func, args.repeat)
+                   for name, func in query_paths(db, ids, rng).items()}
+        statements = db.query_stats.snapshot(limit=20) if db.query_stats else []
+    finally:
+        db.close()
+
+    corpus['database_bytes'] = sum(os.path.getsize(path) for path in (db_path, f"{db_path}-wal")
+                                   if os.path.exists(path))
+    return {
+        'benchmark': 'db_scale',
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'config': {key: getattr(args, key) for key in
+                   ('articles', 'batch', 'days', 'embedded', 'dimension', 'repeat', 'seed')},
+        'corpus': corpus,
+        'queries': queries,
+        'statements': statements,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NewsDatabase at archive scale")
+    parser.add_argument('--articles', type=int, default=100000, help="Synthetic articles to ingest")
+    parser.add_argument('--batch', type=int, default=1000, help="Articles per save_articles_bulk call")
+    parser.add_argument('--days', type=int, default=365, help="Days the publication dates are spread over")
+    parser.add_argument('--embedded', type=float, default=0.1, help="Fraction of articles with an embedding")
+    parser.add_argument('--dimension', type=int, default=384, help="Embedding dimension")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed repetitions per query")
+    parser.add_argument('--seed', type=int, default=7, help="Corpus random seed")
+    parser.add_argument('--db', help="Build the corpus here and keep it, instead of a temporary file")
+    parser.add_argument('--output', default='db_scale_benchmark.json', help="JSON results file")
+    args = parser.parse_args()
+
+    if args.db:
+        results = run(args, args.db)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = run(args, os.path.join(directory, 'news_benchmark.db'))
+
+    corpus = results['corpus']
+    print(f"{corpus['articles']} articles in {corpus['ingest_seconds']:.1f}s "
+          f"({corpus['articles_per_second']:.0f}/s), {corpus['database_bytes'] / 2 ** 20:.1f} MB")
+    print(f"{'path':<32}{'best ms':>10}{'median ms':>11}{'max ms':>10}{'rows':>8}")
+    for name, timings in [('bulk_save_batch', corpus['bulk_save_batch_ms']), *results['queries'].items()]:
+        print(f"{name:<32}{timings['best_ms']:>10.2f}{timings['median_ms']:>11.2f}"
+              f"{timings['max_ms']:>10.2f}{timings.get('rows') if timings.get('rows') is not None else '':>8}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.services.chatbot.chat_service import ChatService
 from src.services.chatbot.embedding_service import EmbeddingService
@@ -72,13 +73,15 @@ async def chat_ask(request: ChatRequest):
         # Create session if not provided
         session_id = request.session_id
         if not session_id:
-            session_id = chat_service.create_session(
+            session_id = await run_in_threadpool(
+                chat_service.create_session,
                 user_id=request.user_id,
                 title=f"Chat: {request.message[:30]}..."
             )
 
         # Process chat message
-        result = chat_service.chat(
+        result = await run_in_threadpool(
+            chat_service.chat,
             session_id=session_id,
             user_message=request.message,
             category_filter=request.category_filter
@@ -110,7 +113,8 @@ async def create_session(request: SessionRequest):
         New session ID and confirmation message
     """
     try:
-        session_id = chat_service.create_session(
+        session_id = await run_in_threadpool(
+            chat_service.create_session,
             user_id=request.user_id,
             title=request.title
         )
@@ -137,7 +141,7 @@ async def get_session_messages(session_id: str, limit: int = Query(50, ge=1, le=
         List of chat messages
     """
     try:
-        messages = chat_service.get_session_history(session_id)
+        messages = await run_in_threadpool(chat_service.get_session_history, session_id)
 
         # Limit results
         messages = messages[-limit:] if len(messages) > limit else messages
@@ -164,7 +168,7 @@ async def clear_session(session_id: str):
         Success confirmation
     """
     try:
-        success = chat_service.clear_session(session_id)
+        success = await run_in_threadpool(chat_service.clear_session, session_id)
 
         if success:
             return {"message": f"Session {session_id} cleared successfully"}
@@ -193,7 +197,8 @@ async def search_articles(
         List of relevant articles
     """
     try:
-        results = retrieval_service.retrieve_context(
+        results = await run_in_threadpool(
+            retrieval_service.retrieve_context,
             query=query,
             max_articles=limit,
             category_filter=category
@@ -209,6 +214,54 @@ async def search_articles(
         logger.error(f"Error in article search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _articles_without_embeddings(category_filter: Optional[str] = None) -> List[tuple]:
+    """Load (NewsArticle, id) pairs for articles that have no embedding yet"""
+    import sqlite3
+    from src.models.news_model import NewsArticle
+
+    # Reuse the embedding service's database and its connection pool
+    db = embedding_service.db
+
+    # This is a simplified version - in production you'd want better pagination
+    with db.reader() as conn:
+        conn.row_factory = sqlite3.Row
+
+        # Get articles that don't have embeddings
+        sql = """
+            SELECT a.id, a.title, a.summary, article_content(b.content) AS content, a.category,
+                   a.source, a.tags, a.url, a.published_date,
+                   a.author, a.extracted_at
+            FROM articles a
+            LEFT JOIN article_bodies b ON b.article_id = a.id
+            LEFT JOIN article_embeddings ae ON a.id = ae.article_id
+            WHERE ae.article_id IS NULL
+        """
+
+        if category_filter:
+            sql += " AND a.category = ?"
+            cursor = conn.execute(sql, (category_filter,))
+        else:
+            cursor = conn.execute(sql)
+
+        articles_to_process = []
+        for row in cursor.fetchall():
+            article_dict = dict(row)
+            article = NewsArticle(
+                title=article_dict['title'],
+                url=article_dict['url'],
+                category=article_dict['category'],
+                summary=article_dict['summary'] or '',
+                published_date=article_dict['published_date'] or '',
+                author=article_dict['author'] or '',
+                content=article_dict['content'] or '',
+                source=article_dict['source'],
+                tags=article_dict['tags'].split(',') if article_dict['tags'] else [],
+                extracted_at=article_dict['extracted_at']
+            )
+            articles_to_process.append((article, article_dict['id']))
+
+    return articles_to_process
+
 @router.post("/embeddings/create", response_model=EmbedResponse)
 async def create_embeddings(request: EmbedRequest):
     """
@@ -224,48 +277,7 @@ async def create_embeddings(request: EmbedRequest):
         logger.info("Starting embedding creation process...")
 
         # Get articles without embeddings
-        from src.db.database_conn import NewsDatabase
-        db = NewsDatabase()
-
-        # This is a simplified version - in production you'd want better pagination
-        import sqlite3
-        with sqlite3.connect(db.db_path, timeout=30.0) as conn:
-            conn.row_factory = sqlite3.Row
-
-            # Get articles that don't have embeddings
-            sql = """
-                SELECT a.id, a.title, a.summary, a.content, a.category,
-                       a.source, a.tags, a.url, a.published_date,
-                       a.author, a.extracted_at
-                FROM articles a
-                LEFT JOIN article_embeddings ae ON a.id = ae.article_id
-                WHERE ae.article_id IS NULL
-            """
-
-            if request.category_filter:
-                sql += " AND a.category = ?"
-                cursor = conn.execute(sql, (request.category_filter,))
-            else:
-                cursor = conn.execute(sql)
-
-            articles_to_process = []
-            for row in cursor.fetchall():
-                article_dict = dict(row)
-                # Convert to NewsArticle
-                from src.models.news_model import NewsArticle
-                article = NewsArticle(
-                    title=article_dict['title'],
-                    url=article_dict['url'],
-                    category=article_dict['category'],
-                    summary=article_dict['summary'] or '',
-                    published_date=article_dict['published_date'] or '',
-                    author=article_dict['author'] or '',
-                    content=article_dict['content'] or '',
-                    source=article_dict['source'],
-                    tags=article_dict['tags'].split(',') if article_dict['tags'] else [],
-                    extracted_at=article_dict['extracted_at']
-                )
-                articles_to_process.append((article, article_dict['id']))
+        articles_to_process = await run_in_threadpool(_articles_without_embeddings, request.category_filter)
 
         total_articles = len(articles_to_process)
         logger.info(f"Found {total_articles} articles to embed")
@@ -279,7 +291,8 @@ async def create_embeddings(request: EmbedRequest):
             )
 
         # Process in batches
-        embedded_count = embedding_service.embed_articles_batch(
+        embedded_count = await run_in_threadpool(
+            embedding_service.embed_articles_batch,
             articles_to_process,
             batch_size=request.batch_size or 10
         )
@@ -304,9 +317,9 @@ async def get_chat_stats():
         System statistics and health information
     """
     try:
-        chat_stats = chat_service.get_chat_stats()
-        retrieval_stats = retrieval_service.get_retrieval_stats()
-        embedding_stats = embedding_service.get_embedding_stats()
+        chat_stats = await run_in_threadpool(chat_service.get_chat_stats)
+        retrieval_stats = await run_in_threadpool(retrieval_service.get_retrieval_stats)
+        embedding_stats = await run_in_threadpool(embedding_service.get_embedding_stats)
 
         return {
             "chat_stats": chat_stats,
@@ -333,8 +346,8 @@ async def chat_health():
     """
     try:
         # Test basic functionality
-        embedding_stats = embedding_service.get_embedding_stats()
-        retrieval_stats = retrieval_service.get_retrieval_stats()
+        embedding_stats = await run_in_threadpool(embedding_service.get_embedding_stats)
+        retrieval_stats = await run_in_threadpool(retrieval_service.get_retrieval_stats)
 
         health_status = {
             "status": "healthy",
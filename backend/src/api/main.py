@@ -1,5 +1,6 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import asyncio
@@ -17,11 +18,15 @@ DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
 from services.news_extraction_pipeline import run_extraction_pipeline
 from scrapers.aussie_news_extractor import ExtractorFactory
-from db.database_conn import NewsDatabase
-from api.models import NewsArticleResponse, DashboardResponse, ExtractionRequest, ExtractionResponse
+# Imported under src. like the services, so they all share one get_database() handle
+from src.db.database_conn import encode_cursor, get_database
+from src.db.async_database import AsyncNewsDatabase
+from api.models import NewsArticleResponse, DashboardResponse, ExtractionRequest, ExtractionResponse, BulkIngestionResponse
 from api.utils import convert_db_article_to_response, convert_backend_article_to_response
 from services.similarity import SimilarityService
 from services.enhanced_news_pipeline import EnhancedNewsPipelineService
+from services.bulk_ingestion import BulkIngestionService
+from services.crawl_coordinator import CrawlCoordinator
 from api.chat import router as chat_router
 
 # Configure logging
@@ -49,16 +54,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize database and services
-db = NewsDatabase()
+db = get_database()
+# Handlers query through adb so sqlite calls never block the event loop
+adb = AsyncNewsDatabase(db)
 similarity_service = SimilarityService(db)
 enhanced_pipeline_service = EnhancedNewsPipelineService(db)
+bulk_ingestion_service = BulkIngestionService(db)
+crawl_coordinator = CrawlCoordinator(adb)
 
 # Include chat router
 app.include_router(chat_router)
 
+@app.on_event("shutdown")
+async def close_database():
+    """Close pooled database connections"""
+    adb.close()
+
 @app.get("/")
 async def root():
     """Root endpoint to verify API is running"""
@@ -105,18 +120,32 @@ async def get_available_categories():
 
 @app.get("/articles", response_model=List[NewsArticleResponse])
 async def get_articles(
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
     source: Optional[str] = Query(None, description="Filter by source"),
-    limit: int = Query(50, ge=1, le=200, description="Number of articles to return")
+    since: Optional[datetime] = Query(None, description="Only articles stored at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only articles stored before this time"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Number of articles to return"),
+    include_archive: bool = Query(False, description="Also search articles moved to the archive"),
+    include_content: bool = Query(False, description="Include the full article bodies")
 ):
-    """Get articles from the database with optional filtering"""
+    """
+    Get articles from the database with optional filtering, newest first.
+
+    When more articles may follow, the X-Next-Cursor response header holds
+    the cursor for the next page.
+    """
     try:
-        # Get articles from database
-        articles = db.get_articles(category=category, limit=limit)
+        articles = await adb.get_articles(category=category, limit=limit, source=source,
+                                          since=since, until=until, cursor=cursor,
+                                          include_content=include_content, include_archive=include_archive)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Filter by source if specified
-        if source:
-            articles = [article for article in articles if article.get('source', '').lower() == source.lower()]
+    try:
+        if len(articles) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(articles[-1])
 
         # Convert to response format
         response_articles = [convert_db_article_to_response(article) for article in articles]
@@ -133,7 +162,7 @@ async def get_dashboard_data():
     """Get dashboard data including top articles by category"""
     try:
         # Get articles from database
-        all_articles = db.get_articles(limit=100)
+        all_articles = await adb.get_articles(limit=100)
 
         if not all_articles:
             # If no articles in database, return empty dashboard
@@ -213,11 +242,15 @@ async def extract_news(request: ExtractionRequest):
     try:
         logger.info(f"Starting extraction for sources: {request.sources}, categories: {request.categories}")
 
-        # Run the extraction pipeline
-        results = await run_extraction_pipeline(
-            sources=request.sources,
-            categories=request.categories,
-            max_articles=request.max_articles
+        # Run the extraction pipeline, or wait for the identical run already in progress
+        results = await crawl_coordinator.run_exclusive(
+            'extraction',
+            {'sources': request.sources, 'categories': request.categories, 'max_articles': request.max_articles},
+            lambda: run_extraction_pipeline(
+                sources=request.sources,
+                categories=request.categories,
+                max_articles=request.max_articles
+            )
         )
 
         # Convert the results to response format
@@ -227,6 +260,7 @@ async def extract_news(request: ExtractionRequest):
             total_articles=results.get('total_articles', 0),
             successful_saves=results.get('successful_saves', 0),
             failed_saves=results.get('failed_saves', 0),
+            unchanged_articles=results.get('unchanged_articles', 0),
             by_category=results.get('by_category', {}),
             by_source=results.get('by_source', {}),
             extraction_time=results.get('extraction_time', 0),
@@ -247,6 +281,38 @@ async def extract_news(request: ExtractionRequest):
             errors=[str(e)]
         )
 
+@app.post("/articles/bulk", response_model=BulkIngestionResponse)
+async def bulk_ingest_articles(request: Request):
+    """
+    Ingest externally scraped articles sent as NDJSON (one article per line).
+
+    The body is parsed as it streams in; records are classified and saved
+    in batches.
+    """
+    try:
+        results = await bulk_ingestion_service.ingest_stream(request.stream())
+
+        return BulkIngestionResponse(
+            success=True,
+            message=f"Ingested {results['accepted']} of {results['total_records']} records",
+            **results
+        )
+
+    except Exception as e:
+        logger.error(f"Error during bulk ingestion: {e}")
+        return BulkIngestionResponse(
+            success=False,
+            message=f"Bulk ingestion failed: {str(e)}",
+            total_records=0,
+            accepted=0,
+            rejected=0,
+            inserted=0,
+            updated=0,
+            by_category={},
+            ingestion_time=0,
+            errors=[str(e)]
+        )
+
 @app.get("/articles/latest", response_model=List[NewsArticleResponse])
 async def get_latest_articles(
     sources: Optional[List[str]] = Query(None, description="Sources to extract from"),
@@ -271,7 +337,7 @@ async def get_latest_articles(
         )
 
         # Get the newly extracted articles from database
-        latest_articles = db.get_articles(limit=max_articles * len(categories))
+        latest_articles = await adb.get_articles(limit=max_articles * len(categories))
 
         # Convert to response format
         response_articles = [convert_db_article_to_response(article) for article in latest_articles]
@@ -306,11 +372,15 @@ async def get_enhanced_latest_articles(
                    f"sources: {sources}, categories: {categories}, "
                    f"articles_per_category: {articles_per_category}")
 
-        # Run the enhanced pipeline
-        results = await enhanced_pipeline_service.run_enhanced_extraction(
-            sources=sources,
-            categories=categories,
-            articles_per_category=articles_per_category
+        # Run the enhanced pipeline, or wait for the identical run already in progress
+        results = await crawl_coordinator.run_exclusive(
+            'enhanced_extraction',
+            {'sources': sources, 'categories': categories, 'articles_per_category': articles_per_category},
+            lambda: enhanced_pipeline_service.run_enhanced_extraction(
+                sources=sources,
+                categories=categories,
+                articles_per_category=articles_per_category
+            )
         )
 
         if not results['success']:
@@ -381,7 +451,7 @@ async def get_enhanced_pipeline_status():
 async def get_similar_articles(article_id: int, limit: int = Query(5, ge=1, le=20)):
     """Get articles similar to the specified article"""
     try:
-        similar_articles = similarity_service.find_similar_articles(article_id, limit)
+        similar_articles = await run_in_threadpool(similarity_service.find_similar_articles, article_id, limit)
 
         if not similar_articles:
             return {"message": "No similar articles found", "similar_articles": []}
@@ -400,7 +470,7 @@ async def get_similar_articles(article_id: int, limit: int = Query(5, ge=1, le=2
 async def get_article_clusters(limit: int = Query(10, ge=1, le=50)):
     """Get clusters of similar articles grouped by story"""
     try:
-        clusters = similarity_service.get_article_clusters(limit)
+        clusters = await run_in_threadpool(similarity_service.get_article_clusters, limit)
 
         return {
             "clusters": clusters,
@@ -417,7 +487,7 @@ async def detect_article_similarities(hours_back: int = Query(48, ge=1, le=168))
     try:
         logger.info(f"Starting similarity detection for articles from last {hours_back} hours")
 
-        metrics = similarity_service.detect_all_similarities(hours_back)
+        metrics = await run_in_threadpool(similarity_service.detect_all_similarities, hours_back)
 
         return {
             "success": True,
@@ -445,7 +515,7 @@ async def get_similarity_statistics():
     """Get statistics about similarity detection performance"""
     try:
         # Get recent similarity data from database
-        recent_similarities = db.get_recent_similarities(limit=100)
+        recent_similarities = await adb.get_recent_similarities(limit=100)
 
         if not recent_similarities:
             return {
@@ -483,6 +553,26 @@ async def get_similarity_statistics():
         logger.error(f"Error getting similarity statistics: {e}")
         raise HTTPException(status_code=500, detail="Failed to get similarity statistics")
 
+@app.get("/diagnostics/queries")
+async def get_query_statistics(
+    limit: int = Query(50, ge=1, le=500, description="Number of statements to return")
+):
+    """Per-statement SQL timings, most total time first, with plans of slow statements"""
+    if db.query_stats is None:
+        raise HTTPException(status_code=404, detail="Query statistics are disabled (DB_QUERY_STATS=0)")
+    return {
+        "slow_query_ms": db.query_stats.slow_query_ms,
+        "statements": db.query_stats.snapshot(limit)
+    }
+
+@app.post("/diagnostics/queries/reset")
+async def reset_query_statistics():
+    """Clear the collected SQL timings"""
+    if db.query_stats is None:
+        raise HTTPException(status_code=404, detail="Query statistics are disabled (DB_QUERY_STATS=0)")
+    db.query_stats.reset()
+    return {"message": "Query statistics reset"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=HOST, port=PORT, reload=DEBUG)
\ No newline at end of file
@@ -48,14 +48,31 @@ class ExtractionResponse(BaseModel):
     total_articles: int
     successful_saves: int
     failed_saves: int
+    unchanged_articles: int = 0
     by_category: Dict[str, int]
     by_source: Dict[str, int]
     extraction_time: float
     errors: List[str]
 
+class BulkIngestionResponse(BaseModel):
+    """Response model for bulk NDJSON ingestion results"""
+    success: bool
+    message: str
+    total_records: int
+    accepted: int
+    rejected: int
+    inserted: int
+    updated: int
+    unchanged: int = 0
+    by_category: Dict[str, int]
+    ingestion_time: float
+    errors: List[str]
+
 class ArticleFilterParams(BaseModel):
     """Model for article filtering parameters"""
     category: Optional[str] = None
     source: Optional[str] = None
-    limit: int = Field(default=50, ge=1, le=200)
-    offset: int = Field(default=0, ge=0)
\ No newline at end of file
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    cursor: Optional[str] = Field(default=None, description="Keyset cursor from X-Next-Cursor")
+    limit: int = Field(default=50, ge=1, le=200)
\ No newline at end of file
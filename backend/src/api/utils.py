@@ -58,7 +58,7 @@ def convert_db_article_to_response(db_article: Dict[str, Any]) -> NewsArticleRes
         id=article_id,
         title=db_article.get('title', 'Untitled'),
         summary=db_article.get('summary', ''),
-        content=db_article.get('content', ''),
+        content=db_article.get('content') or '',
         category=db_article.get('category', 'general'),
         source=db_article.get('source', 'Unknown'),
         author=db_article.get('author', ''),
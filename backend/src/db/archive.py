@@ -0,0 +1,363 @@
+"""
+Monthly shards for old articles.
+
+The hot database keeps the working set; articles published more than
+the retention period ago move, together with their embeddings and
+similarity rows, into one SQLite shard file per publication month:
+
+    news_database_archive/articles_2024-05.db
+
+Archived content is zlib-compressed. Articles keep their ids and
+created_at, so archived rows filter and page with the same keyset
+cursors as hot ones. NewsDatabase routes reads here when asked to:
+
+    db.archive.archive_articles(older_than_days=90)
+    page = db.get_articles(category='sports', limit=20, include_archive=True)
+
+Shards are only written by archive runs and are opened read-only for
+queries. Their created_at and published_ts bounds are cached until the
+file changes, so a time-bounded read opens only the shards that can
+hold matching rows, and a newest-first page stops at the first shard
+older than the rows it already has.
+
+Each batch is written to the archive files before it is deleted from
+the hot database, and archive writes replace by id, so an interrupted
+run is completed by running it again. Pages freed in the hot database
+are reused by new articles, so its file stops growing.
+"""
+
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.request import pathname2url
+
+from src.db.database_conn import (
+    FULLTEXT_DELETE_SQL, NewsDatabase, article_filter_clause, article_time_bounds, fulltext_rows
+)
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", 90))
+ARCHIVE_BATCH_SIZE = 500
+
+# Article columns kept in the archive; content is stored compressed as content_z
+ARCHIVED_COLUMNS = (
+    'id', 'title', 'url', 'category', 'summary', 'published_date', 'author', 'source', 'tags',
+    'extracted_at', 'created_at', 'classification_method', 'classification_confidence',
+    'classification_explanation', 'manual_override', 'content_hash', 'published_ts', 'created_ts',
+    'content_length'
+)
+SIMILARITY_COLUMNS = (
+    'article_id_1', 'article_id_2', 'similarity_score', 'title_similarity', 'keyword_similarity',
+    'time_similarity', 'similarity_method', 'explanation', 'created_at'
+)
+
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        url TEXT UNIQUE NOT NULL,
+        category TEXT NOT NULL,
+        summary TEXT,
+        published_date TEXT,
+        author TEXT,
+        source TEXT NOT NULL,
+        tags TEXT,
+        extracted_at TEXT NOT NULL,
+        created_at TIMESTAMP,
+        classification_method TEXT,
+        classification_confidence REAL,
+        classification_explanation TEXT,
+        manual_override BOOLEAN DEFAULT FALSE,
+        content_hash TEXT,
+        published_ts INTEGER,
+        created_ts INTEGER,
+        content_length INTEGER,
+        content_z BLOB -- zlib-compressed UTF-8 content
+    );
+    CREATE INDEX IF NOT EXISTS idx_articles_created ON articles(created_at);
+    CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles(published_ts);
+    CREATE TABLE IF NOT EXISTS article_embeddings (
+        article_id INTEGER NOT NULL,
+        embedding_model TEXT NOT NULL,
+        embedding_vector BLOB NOT NULL,
+        created_at TIMESTAMP,
+        PRIMARY KEY (article_id, embedding_model)
+    );
+    CREATE TABLE IF NOT EXISTS article_similarities (
+        article_id_1 INTEGER NOT NULL,
+        article_id_2 INTEGER NOT NULL,
+        similarity_score REAL NOT NULL,
+        title_similarity REAL NOT NULL,
+        keyword_similarity REAL NOT NULL,
+        time_similarity REAL NOT NULL,
+        similarity_method TEXT NOT NULL,
+        explanation TEXT,
+        created_at TIMESTAMP,
+        PRIMARY KEY (article_id_1, article_id_2)
+    );
+"""
+
+
+def compress_content(content: Optional[str]) -> Optional[bytes]:
+    """Compress article content for the archive"""
+    return zlib.compress(content.encode('utf-8')) if content is not None else None
+
+
+def decompress_content(content_z: Optional[bytes]) -> Optional[str]:
+    """Restore article content stored by compress_content"""
+    return zlib.decompress(content_z).decode('utf-8') if content_z is not None else None
+
+
+def archive_month(published_ts: Optional[int]) -> str:
+    """The 'YYYY-MM' archive partition for a publication timestamp"""
+    return datetime.fromtimestamp(published_ts or 0, tz=timezone.utc).strftime('%Y-%m')
+
+
+@dataclass(frozen=True)
+class Shard:
+    """An archive file and the range of the articles it holds"""
+    path: str
+    articles: int
+    min_created_at: Optional[str] = None
+    max_created_at: Optional[str] = None
+    min_published_ts: Optional[int] = None
+    max_published_ts: Optional[int] = None
+
+
+class ArticleArchive:
+    """Monthly compressed archive files next to a NewsDatabase"""
+
+    def __init__(self, db: NewsDatabase, archive_dir: str = None):
+        self.db = db
+        self.archive_dir = archive_dir or f"{os.path.splitext(db.db_path)[0]}_archive"
+        # path -> ((mtime, size), Shard)
+        self._shards: Dict[str, Tuple[Tuple[int, int], Shard]] = {}
+        self._shards_lock = threading.Lock()
+
+    def archive_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"articles_{month}.db")
+
+    def archive_files(self) -> List[str]:
+        """Archive files, newest month first"""
+        return sorted(glob.glob(os.path.join(self.archive_dir, "articles_*.db")), reverse=True)
+
+    def shards(self) -> List[Shard]:
+        """Shards with their bounds, newest month first"""
+        shards = []
+        for path in self.archive_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            version = (stat.st_mtime_ns, stat.st_size)
+            with self._shards_lock:
+                cached = self._shards.get(path)
+            if cached is None or cached[0] != version:
+                cached = (version, self._read_bounds(path))
+                with self._shards_lock:
+                    self._shards[path] = cached
+            shards.append(cached[1])
+        return shards
+
+    def _read_bounds(self, path: str) -> Shard:
+        with closing(self._open_shard(path)) as conn:
+            count, min_created, max_created, min_published, max_published = conn.execute("""
+                SELECT COUNT(*), MIN(created_at), MAX(created_at), MIN(published_ts), MAX(published_ts)
+                FROM articles
+            """).fetchone()
+        return Shard(path, count, min_created, max_created, min_published, max_published)
+
+    def _open_shard(self, path: str) -> sqlite3.Connection:
+        """Read-only connection to a shard"""
+        return sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+
+    def _query_shard(self, shard: Shard, sql: str, params: tuple, include_content: bool) -> List[Dict]:
+        articles = []
+        with closing(self._open_shard(shard.path)) as conn:
+            conn.row_factory = sqlite3.Row
+            for row in conn.execute(sql, params):
+                article = dict(row)
+                content_z = article.pop('content_z')
+                if include_content:
+                    article['content'] = decompress_content(content_z)
+                article['archived'] = True
+                articles.append(article)
+        return articles
+
+    def archive_articles(self, older_than_days: float = ARTICLE_RETENTION_DAYS,
+                         batch_size: int = ARCHIVE_BATCH_SIZE) -> Optional[Dict[str, int]]:
+        """
+        Move articles published more than older_than_days ago out of the hot database.
+
+        Returns counts of the archived articles, embeddings and similarity
+        rows, or None if the run failed part way (re-running completes it).
+        """
+        cutoff = int(time.time() - older_than_days * 86400)
+        totals = {'articles': 0, 'embeddings': 0, 'similarities': 0}
+
+        try:
+            while True:
+                batch = self._read_batch(cutoff, batch_size)
+                if not batch['articles']:
+                    break
+                self._write_batch(batch)
+                self.db.submit_write(self._delete_batch, [article['id'] for article in batch['articles']]).result()
+                for key in totals:
+                    totals[key] += len(batch[key])
+
+            logger.info(f"Archived {totals['articles']} articles, {totals['embeddings']} embeddings "
+                        f"and {totals['similarities']} similarities to {self.archive_dir}")
+            return totals
+
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error archiving articles: {e}")
+            return None
+
+    def _read_batch(self, cutoff: int, batch_size: int) -> Dict[str, List[Dict]]:
+        with self.db.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            articles = [dict(row) for row in conn.execute(
+                "SELECT a.*, article_content(b.content) AS content "
+                "FROM articles a LEFT JOIN article_bodies b ON b.article_id = a.id "
+                "WHERE published_ts < ? ORDER BY published_ts LIMIT ?",
+                (cutoff, batch_size)
+            )]
+            if not articles:
+                return {'articles': [], 'embeddings': [], 'similarities': []}
+
+            ids = [article['id'] for article in articles]
+            placeholders = ','.join('?' * len(ids))
+            embeddings = [dict(row) for row in conn.execute(f"""
+                SELECT article_id, embedding_model, embedding_vector, created_at
+                FROM article_embeddings WHERE article_id IN ({placeholders})
+            """, ids)]
+            similarities = [dict(row) for row in conn.execute(f"""
+                SELECT {', '.join(SIMILARITY_COLUMNS)} FROM article_similarities
+                WHERE article_id_1 IN ({placeholders}) OR article_id_2 IN ({placeholders})
+            """, ids + ids)]
+
+        return {'articles': articles, 'embeddings': embeddings, 'similarities': similarities}
+
+    def _write_batch(self, batch: Dict[str, List[Dict]]):
+        months = {article['id']: archive_month(article['published_ts']) for article in batch['articles']}
+        by_month: Dict[str, Dict[str, List[tuple]]] = {}
+
+        def rows(month: str, table: str) -> List[tuple]:
+            return by_month.setdefault(month, {}).setdefault(table, [])
+
+        for article in batch['articles']:
+            rows(months[article['id']], 'articles').append(
+                tuple(article[column] for column in ARCHIVED_COLUMNS) + (compress_content(article['content']),)
+            )
+        for embedding in batch['embeddings']:
+            rows(months[embedding['article_id']], 'article_embeddings').append(
+                (embedding['article_id'], embedding['embedding_model'],
+                 embedding['embedding_vector'], embedding['created_at'])
+            )
+        for similarity in batch['similarities']:
+            # Pairs spanning two months are kept with the first archived article
+            article_id = similarity['article_id_1'] if similarity['article_id_1'] in months else similarity['article_id_2']
+            rows(months[article_id], 'article_similarities').append(
+                tuple(similarity[column] for column in SIMILARITY_COLUMNS)
+            )
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        for month, tables in by_month.items():
+            with closing(sqlite3.connect(self.archive_path(month))) as conn, conn:
+                conn.executescript(ARCHIVE_SCHEMA)
+                if 'content_length' not in {row[1] for row in conn.execute("PRAGMA table_info(articles)")}:
+                    # Files archived before article bodies were split out
+                    conn.execute("ALTER TABLE articles ADD COLUMN content_length INTEGER")
+                columns = ARCHIVED_COLUMNS + ('content_z',)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO articles ({', '.join(columns)}) VALUES ({','.join('?' * len(columns))})",
+                    tables.get('articles', [])
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO article_embeddings VALUES (?, ?, ?, ?)",
+                    tables.get('article_embeddings', [])
+                )
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO article_similarities ({', '.join(SIMILARITY_COLUMNS)}) "
+                    f"VALUES ({','.join('?' * len(SIMILARITY_COLUMNS))})",
+                    tables.get('article_similarities', [])
+                )
+
+    def _delete_batch(self, ids: List[int]):
+        placeholders = ','.join('?' * len(ids))
+        with self.db.writer() as conn:
+            conn.execute(f"DELETE FROM article_embeddings WHERE article_id IN ({placeholders})", ids)
+            conn.execute(f"""
+                DELETE FROM article_similarities
+                WHERE article_id_1 IN ({placeholders}) OR article_id_2 IN ({placeholders})
+            """, ids + ids)
+            conn.execute(f"""
+                DELETE FROM cluster_articles WHERE article_id IN ({placeholders})
+                   OR cluster_id IN (SELECT cluster_id FROM article_clusters WHERE main_article_id IN ({placeholders}))
+            """, ids + ids)
+            conn.execute(f"DELETE FROM article_clusters WHERE main_article_id IN ({placeholders})", ids)
+            if self.db.fulltext_enabled:
+                conn.executemany(FULLTEXT_DELETE_SQL, fulltext_rows(conn, ids, self.db.content_codec.decode))
+            conn.execute(f"DELETE FROM articles WHERE id IN ({placeholders})", ids)
+
+    def get_articles(self, category: str = None, limit: int = 100, source: str = None,
+                     since: Union[str, datetime] = None, until: Union[str, datetime] = None,
+                     cursor: str = None, include_content: bool = False) -> List[Dict]:
+        """
+        Get archived articles, newest first, with the filters and cursor of NewsDatabase.get_articles.
+
+        Rows carry 'archived': True, and their decompressed content when
+        include_content is set.
+        """
+        where, params = article_filter_clause(category, source, since, until, cursor)
+        lowest, highest = article_time_bounds(since, until, cursor)
+        shards = [shard for shard in self.shards() if shard.articles
+                  and (lowest is None or shard.max_created_at >= lowest)
+                  and (highest is None or shard.min_created_at <= highest)]
+        shards.sort(key=lambda shard: shard.max_created_at, reverse=True)
+
+        articles = []
+        for shard in shards:
+            # Every remaining shard is older than a full page
+            if len(articles) >= limit and shard.max_created_at < articles[limit - 1]['created_at']:
+                break
+            articles += self._query_shard(shard, f"""
+                SELECT * FROM articles {where}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            """, (*params, limit), include_content)
+            articles.sort(key=lambda article: (article['created_at'], article['id']), reverse=True)
+            del articles[limit:]
+        return articles
+
+    def get_recent_articles(self, hours_back: float, limit: int = None, category: str = None,
+                            source: str = None, include_content: bool = False) -> List[Dict]:
+        """Archived articles published within the last hours_back hours, newest first"""
+        cutoff = int(time.time() - hours_back * 3600)
+        conditions = ["published_ts >= ?"]
+        params: List = [cutoff]
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        sql = f"SELECT * FROM articles WHERE {' AND '.join(conditions)} ORDER BY published_ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        articles = []
+        for shard in self.shards():
+            if shard.articles and shard.max_published_ts >= cutoff:
+                articles += self._query_shard(shard, sql, tuple(params), include_content)
+        articles.sort(key=lambda article: article['published_ts'], reverse=True)
+        return articles[:limit] if limit is not None else articles
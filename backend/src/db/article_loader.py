@@ -0,0 +1,67 @@
+"""
+Request-scoped batching of article lookups by id.
+
+Code that needs articles one id at a time asks an ArticleLoader instead
+of querying per id. Ids announced with want() are fetched together by
+the next load, in one NewsDatabase.get_articles_by_ids call, and every
+row fetched or primed is memoized for the loader's lifetime:
+
+    loader = ArticleLoader(db)
+    loader.want(similarity.article_id_2 for similarity in similarities)
+    rows = [loader.load(similarity.article_id_2) for similarity in similarities]  # one query
+
+Create one loader per request or service call: it never sees changes
+made after a row was loaded.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.db.database_conn import NewsDatabase
+
+
+class ArticleLoader:
+    """Collects article ids and resolves them in batches, memoizing the rows"""
+
+    def __init__(self, db: NewsDatabase, columns: Tuple[str, ...] = None, include_content: bool = False):
+        self.db = db
+        self.columns = columns
+        self.include_content = include_content
+        # id -> row, or None for ids that do not exist
+        self._rows: Dict[int, Optional[Dict]] = {}
+        self._pending: Set[int] = set()
+        self.queries = 0
+
+    def want(self, article_ids: Iterable[int]) -> 'ArticleLoader':
+        """Queue ids to be fetched with the next batch"""
+        self._pending.update(article_id for article_id in article_ids if article_id not in self._rows)
+        return self
+
+    def prime(self, articles: Iterable[Dict]) -> 'ArticleLoader':
+        """Memoize rows already read elsewhere, e.g. by a listing query"""
+        for article in articles:
+            self._rows.setdefault(article['id'], article)
+            self._pending.discard(article['id'])
+        return self
+
+    def load(self, article_id: int) -> Optional[Dict]:
+        """The article row with this id, or None if it does not exist"""
+        if article_id not in self._rows:
+            self._pending.add(article_id)
+            self._dispatch()
+        return self._rows[article_id]
+
+    def load_many(self, article_ids: Iterable[int]) -> List[Optional[Dict]]:
+        """Rows for the ids in order, fetched in one batch"""
+        article_ids = list(article_ids)
+        self.want(article_ids)
+        self._dispatch()
+        return [self._rows[article_id] for article_id in article_ids]
+
+    def _dispatch(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, set()
+        rows = self.db.get_articles_by_ids(list(pending), self.columns, self.include_content)
+        self.queries += 1
+        for article_id in pending:
+            self._rows[article_id] = rows.get(article_id)
@@ -0,0 +1,69 @@
+"""
+Awaitable access to NewsDatabase for async request handlers.
+
+sqlite3 calls block, so calling NewsDatabase directly from an async def
+handler stalls the event loop and every other request with it.
+AsyncNewsDatabase runs each call on a dedicated thread pool sized to the
+connection pool, so queries wait for a connection there instead of on
+the loop:
+
+    adb = AsyncNewsDatabase(db)
+    articles = await adb.get_articles(category='sports', limit=20)
+
+Write methods go straight to the database's writer queue and await its
+Future, so a handler waiting for a commit holds no thread at all.
+
+Long-running service work that merely touches the database (similarity
+detection, embedding, LLM calls) should not use this pool, or it would
+hold the threads that cheap queries need; run it with run_in_threadpool
+or loop.run_in_executor(None, ...) instead.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.db.database_conn import NewsDatabase
+
+
+class AsyncNewsDatabase:
+    """NewsDatabase whose methods return awaitables run on a database thread pool"""
+
+    def __init__(self, db: NewsDatabase, max_workers: int = None):
+        self.db = db
+        # One thread per pooled reader plus one for the writer
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or db.pool.read_pool_size + 1,
+            thread_name_prefix="news-db"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking database function on the database thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func on the database writer thread and wait for its commit"""
+        return await asyncio.wrap_future(self.db.submit_write(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.db, name)
+        if not callable(attribute):
+            return attribute
+
+        if getattr(attribute, 'queued_write', False):
+            @functools.wraps(attribute)
+            async def write(*args, **kwargs):
+                return await self.write(attribute.__wrapped__, self.db, *args, **kwargs)
+            return write
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+        return call
+
+    def close(self):
+        """Wait for running queries, then close the database connections"""
+        self._executor.shutdown(wait=True)
+        self.db.close()
@@ -0,0 +1,196 @@
+"""
+Compressed storage of article bodies in the article_bodies table.
+
+A compressed body is stored as a BLOB with an 8 byte header:
+
+    magic (2 bytes, b'AC') | codec (1 byte) | padding (1 byte) | dictionary id (uint32)
+
+Codec 1 is zlib from the standard library; codec 2 is zstd and needs the
+optional zstandard package. Dictionary id 0 means no dictionary; other
+ids refer to rows of the content_dictionaries table, trained from stored
+articles so that boilerplate shared between articles compresses away.
+Rows stored as TEXT (before compression, or with it turned off) are
+returned unchanged, so old and new rows can be mixed freely.
+
+ContentCodec registers the SQL function article_content(content) on
+NewsDatabase connections, so their queries can select decoded bodies. The
+schema itself never calls it: other sqlite3 connections can read and
+write every table, and see bodies as stored. The full-text index is fed
+the decoded text by NewsDatabase when it saves an article.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import struct
+import zlib
+from collections import Counter
+from contextlib import closing
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CONTENT_MAGIC = b'AC'
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {'zlib': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+
+# 'zlib', 'zstd' or 'none' (store plain text)
+CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "zlib").lower()
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+# zlib only looks back 32KB, so a larger dictionary would never be used
+DICTIONARY_SIZE = 32 * 1024
+
+_HEADER = struct.Struct('<2sBxI')
+HEADER_SIZE = _HEADER.size
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def read_header(blob: bytes) -> Tuple[int, int]:
+    """Return the (codec, dictionary id) of an encoded body, raising ValueError if malformed"""
+    if len(blob) < HEADER_SIZE:
+        raise ValueError("content blob shorter than its header")
+    magic, codec, dictionary_id = _HEADER.unpack_from(blob)
+    if magic != CONTENT_MAGIC or codec not in CODECS.values():
+        raise ValueError("unsupported content encoding")
+    return codec, dictionary_id
+
+
+def compress(text: str, codec: int = CODEC_ZLIB, dictionary_id: int = 0, dictionary: bytes = None) -> bytes:
+    """Encode text with a codec and optional dictionary, header included"""
+    data = text.encode('utf-8')
+    if codec == CODEC_ZSTD:
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(data)
+    else:
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=dictionary) if dictionary else zlib.compressobj(ZLIB_LEVEL)
+        payload = compressor.compress(data) + compressor.flush()
+    return _HEADER.pack(CONTENT_MAGIC, codec, dictionary_id) + payload
+
+
+def decompress(blob: bytes, dictionary: bytes = None) -> str:
+    """Decode a body written by compress; dictionary must be the one named in its header"""
+    codec, _ = read_header(blob)
+    payload = blob[HEADER_SIZE:]
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd-compressed content needs the zstandard package")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        data = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+    else:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        data = decompressor.decompress(payload) + decompressor.flush()
+    return data.decode('utf-8')
+
+
+def train_dictionary(samples: Iterable[str], codec: int = CODEC_ZLIB, size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Build a compression dictionary from sample article bodies.
+
+    zstd trains its own. For zlib the dictionary is the sentences that
+    recur across articles (bylines, sign-offs, newsletter prompts), most
+    valuable last because zlib reaches the end of the dictionary cheapest.
+    """
+    samples = [sample for sample in samples if sample]
+    if codec == CODEC_ZSTD:
+        return zstandard.train_dictionary(size, [sample.encode('utf-8') for sample in samples]).as_bytes()
+
+    counts = Counter()
+    for sample in samples:
+        counts.update({sentence.strip() for sentence in _SENTENCE_END.split(sample) if len(sentence.strip()) > 20})
+    shared = [sentence for sentence, count in counts.items() if count > 1]
+    shared.sort(key=lambda sentence: counts[sentence] * len(sentence), reverse=True)
+
+    chosen = []
+    used = 0
+    for sentence in shared:
+        encoded = sentence.encode('utf-8') + b' '
+        if used + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        used += len(encoded)
+    return b''.join(reversed(chosen))
+
+
+class ContentCodec:
+    """
+    Encodes article bodies with the configured codec and the newest
+    dictionary, and decodes any stored body.
+
+    Dictionaries are read from the database on first use and cached;
+    a dictionary trained by another process is loaded when a body
+    referring to it is first decoded.
+    """
+
+    def __init__(self, db_path: str, compression: str = CONTENT_COMPRESSION):
+        self.db_path = db_path
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed, compressing article content with zlib")
+            compression = 'zlib'
+        self.codec = CODECS.get(compression)
+        self._dictionaries: Dict[int, bytes] = {}
+        self.dictionary_id = 0
+
+    def load_dictionaries(self, conn: sqlite3.Connection):
+        """Cache the stored dictionaries and encode with the newest one for this codec"""
+        try:
+            rows = conn.execute("SELECT id, codec, dictionary FROM content_dictionaries ORDER BY id").fetchall()
+        except sqlite3.OperationalError:
+            # Database not yet migrated to compressed content
+            return
+        for dictionary_id, codec, dictionary in rows:
+            self._dictionaries[dictionary_id] = dictionary
+            if codec == self.codec:
+                self.dictionary_id = dictionary_id
+
+    def use_dictionary(self, dictionary_id: int, dictionary: bytes):
+        """Encode new bodies with a newly stored dictionary"""
+        self._dictionaries[dictionary_id] = dictionary
+        self.dictionary_id = dictionary_id
+
+    def _dictionary(self, dictionary_id: int) -> Optional[bytes]:
+        if not dictionary_id:
+            return None
+        if dictionary_id not in self._dictionaries:
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                row = conn.execute("SELECT dictionary FROM content_dictionaries WHERE id = ?",
+                                   (dictionary_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"unknown content dictionary {dictionary_id}")
+            self._dictionaries[dictionary_id] = row[0]
+        return self._dictionaries[dictionary_id]
+
+    def encode(self, text: Optional[str]) -> Union[bytes, str, None]:
+        """Value to store for a body: compressed, or the text itself when compression is off"""
+        if text is None or self.codec is None:
+            return text
+        return compress(text, self.codec, self.dictionary_id, self._dictionary(self.dictionary_id))
+
+    def decode(self, stored: Union[bytes, str, None]) -> Optional[str]:
+        """Body text of a stored value, compressed or not"""
+        if stored is None or isinstance(stored, str):
+            return stored
+        _, dictionary_id = read_header(stored)
+        return decompress(stored, self._dictionary(dictionary_id))
+
+    def is_current(self, stored: Union[bytes, str, None]) -> bool:
+        """Whether a stored body already uses the codec and dictionary encode would use"""
+        if stored is None:
+            return True
+        if isinstance(stored, str):
+            return self.codec is None
+        return read_header(stored) == (self.codec, self.dictionary_id)
+
+    def register(self, conn: sqlite3.Connection):
+        """Make article_content(content) available to SQL on this connection"""
+        conn.create_function("article_content", 1, self.decode, deterministic=True)
@@ -1,8 +1,23 @@
 import sqlite3
 import logging
 from src.models.news_model import NewsArticle
+from src.db.content_codec import DICTIONARY_SIZE, ContentCodec, train_dictionary
+from src.db.embedding_codec import encode_embedding, decode_embedding
+from src.db.query_stats import QUERY_STATS_ENABLED, InstrumentedConnection, QueryStats
+import base64
+import functools
+import hashlib
 import json
-from typing import List, Dict
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import closing, contextmanager
+from dataclasses import replace
+from dateutil import parser as date_parser
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Optional, Tuple, Union
 
 # Configure logging
 logging.basicConfig(
@@ -15,211 +30,1052 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_DB_PATH = "news_database.db"
+# Number of pooled read connections (in addition to the single writer)
+DEFAULT_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 4))
+# Seconds to wait for a lock or a free pooled connection
+DEFAULT_TIMEOUT = 30.0
+
+# Applied to every pooled connection. WAL itself is persistent and is set
+# once when the database is initialized.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, no fsync per commit
+    "PRAGMA cache_size = -16000",      # 16MB page cache per connection
+    "PRAGMA mmap_size = 268435456",    # Memory-map up to 256MB of the file
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Bound on queued write operations before producers block
+DEFAULT_WRITE_QUEUE_SIZE = int(os.getenv("DB_WRITE_QUEUE_SIZE", 1000))
+# Most queued write operations committed in one transaction
+DEFAULT_WRITE_BATCH_SIZE = 64
+
+# Parameters per IN (...) lookup, well below SQLite's variable limit
+LOOKUP_CHUNK_SIZE = 500
+
+# Article fields returned with clusters (everything but the full content)
+CLUSTER_ARTICLE_COLUMNS = ('id', 'title', 'url', 'category', 'summary', 'published_date',
+                           'published_ts', 'content_length', 'author', 'source', 'tags', 'extracted_at')
+
+
+def _article_columns(include_content: bool) -> str:
+    """Select list for article rows; bodies live, compressed, in article_bodies"""
+    return "a.*, article_content(b.content) AS content" if include_content else "a.*"
+
+
+def _body_join(include_content: bool) -> str:
+    return "LEFT JOIN article_bodies b ON b.article_id = a.id" if include_content else ""
+
+
+def content_hash(title, summary, published_date, author, content, source, tags) -> str:
+    """
+    Fingerprint of the crawled content of an article.
+
+    Category and extraction time are left out: the former is rewritten by
+    classification and the latter changes on every crawl.
+    """
+    payload = json.dumps(
+        [title or '', summary or '', published_date or '', author or '', content or '', source or '', tags or []],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def encode_cursor(article: Dict) -> str:
+    """Opaque pagination cursor pointing just after an article row"""
+    payload = json.dumps([article['created_at'], article['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor from encode_cursor, raising ValueError if it is invalid"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, article_id = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"invalid cursor: {e}")
+    if not isinstance(created_at, str) or not isinstance(article_id, int):
+        raise ValueError("invalid cursor")
+    return created_at, article_id
+
+
+def _timestamp_param(value: Union[str, datetime]) -> str:
+    """Format a bound in the UTC 'YYYY-MM-DD HH:MM:SS' form used by created_at"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _epoch_param(value: Union[int, str, datetime]) -> int:
+    """Convert a bound to Unix seconds for comparison with published_ts; naive datetimes are UTC"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return parse_timestamp(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def article_filter_clause(category: str = None, source: str = None,
+                          since: Union[str, datetime] = None, until: Union[str, datetime] = None,
+                          cursor: str = None) -> Tuple[str, List]:
+    """
+    Build the WHERE clause and parameters for the get_articles filters.
+
+    Shared by every store holding rows of the articles schema, so hot and
+    archived articles filter and page identically.
+    """
+    conditions = []
+    params = []
+    if category:
+        conditions.append("category = ?")
+        params.append(category)
+    if source:
+        conditions.append("source = ? COLLATE NOCASE")
+        params.append(source)
+    if since:
+        conditions.append("created_at >= ?")
+        params.append(_timestamp_param(since))
+    if until:
+        conditions.append("created_at < ?")
+        params.append(_timestamp_param(until))
+    if cursor:
+        conditions.append("(created_at, id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def article_time_bounds(since: Union[str, datetime] = None, until: Union[str, datetime] = None,
+                        cursor: str = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    The lowest and highest created_at (both inclusive, None if unbounded)
+    a row matching the get_articles filters can have; used to skip
+    shards that cannot hold matching rows.
+    """
+    lowest = _timestamp_param(since) if since else None
+    highest = _timestamp_param(until) if until else None
+    if cursor:
+        cursor_created_at = decode_cursor(cursor)[0]
+        highest = min(highest, cursor_created_at) if highest else cursor_created_at
+    return lowest, highest
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Parse a free-form date string into a Unix timestamp (seconds, UTC).
+
+    Dates without a timezone are taken as UTC. Returns None for empty or
+    unparseable values.
+    """
+    if not value:
+        return None
+    try:
+        parsed = date_parser.parse(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def article_content_hash(article: NewsArticle) -> str:
+    """Content hash of a NewsArticle"""
+    return content_hash(article.title, article.summary, article.published_date, article.author,
+                        article.content, article.source, article.tags)
+
+
+# The full-text index is contentless: it keeps no copy of the text, so
+# rows are removed by repeating the exact values they were indexed with
+FULLTEXT_INSERT_SQL = "INSERT INTO articles_fts(rowid, title, summary, content) VALUES (?, ?, ?, ?)"
+FULLTEXT_DELETE_SQL = """
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, content) VALUES ('delete', ?, ?, ?, ?)
+"""
+
+
+def fulltext_rows(conn, article_ids: List[int], decode: Callable) -> List[Tuple]:
+    """(id, title, summary, body text) of stored articles, the values their index rows were written with"""
+    rows = []
+    for start in range(0, len(article_ids), LOOKUP_CHUNK_SIZE):
+        chunk = article_ids[start:start + LOOKUP_CHUNK_SIZE]
+        cursor = conn.execute(f"""
+            SELECT a.id, a.title, a.summary, b.content
+            FROM articles a LEFT JOIN article_bodies b ON b.article_id = a.id
+            WHERE a.id IN ({','.join('?' * len(chunk))})
+        """, chunk)
+        rows.extend((article_id, title, summary, decode(content)) for article_id, title, summary, content in cursor)
+    return rows
+
+
+def fill_fulltext_index(conn, decode: Callable):
+    """Replace the full-text index with every article's title, summary and decoded body"""
+    conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('delete-all')")
+    rows = conn.execute("""
+        SELECT a.id, a.title, a.summary, b.content
+        FROM articles a LEFT JOIN article_bodies b ON b.article_id = a.id
+    """)
+    conn.executemany(
+        FULLTEXT_INSERT_SQL,
+        ((article_id, title, summary, decode(content)) for article_id, title, summary, content in rows)
+    )
+
+
+class ConnectionPool:
+    """
+    Long-lived SQLite connections: one writer guarded by a lock and a
+    fixed number of readers handed out from a queue.
+
+    Connections are opened lazily on first use, so creating the pool does
+    not touch the database.
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, on_connect: Callable[[sqlite3.Connection], None] = None,
+                 query_stats: QueryStats = None):
+        self.db_path = db_path
+        self.on_connect = on_connect
+        # When set, connections time every statement into it
+        self.query_stats = query_stats
+        self.read_pool_size = max(1, read_pool_size)
+        self.timeout = timeout
+
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._write_owner: Optional[int] = None
+
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._all_connections: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.query_stats is not None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                                   factory=InstrumentedConnection)
+            conn.query_stats = self.query_stats
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if self.on_connect:
+            self.on_connect(conn)
+        self._all_connections.append(conn)
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Borrow the writer connection inside a transaction.
+
+        Commits when the outermost block exits normally and rolls back on an
+        exception. Nested use from the same thread joins the open transaction
+        under a savepoint, so a failing inner block only undoes its own work.
+        """
+        if not self._write_lock.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError("Timed out waiting for the database writer")
+        try:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            depth = self._write_depth
+            if depth == 0:
+                conn.row_factory = None
+                conn.execute("BEGIN IMMEDIATE")
+                self._write_owner = threading.get_ident()
+            else:
+                conn.execute(f"SAVEPOINT writer_{depth}")
+
+            self._write_depth += 1
+            try:
+                yield conn
+            except BaseException:
+                self._write_depth -= 1
+                if depth == 0:
+                    self._write_owner = None
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO writer_{depth}")
+                    conn.execute(f"RELEASE writer_{depth}")
+                raise
+            self._write_depth -= 1
+            if depth == 0:
+                self._write_owner = None
+                try:
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            else:
+                conn.execute(f"RELEASE writer_{depth}")
+        finally:
+            self._write_lock.release()
+
+    def holds_writer(self) -> bool:
+        """Whether the calling thread is inside a writer() block"""
+        return self._write_owner == threading.get_ident()
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read connection from the pool"""
+        conn = self._checkout_reader()
+        try:
+            conn.row_factory = None
+            yield conn
+        finally:
+            if conn.in_transaction:
+                # Readers never keep a transaction (and its snapshot) open
+                conn.rollback()
+            self._readers.put(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            if self._reader_count < self.read_pool_size:
+                conn = self._connect()
+                self._reader_count += 1
+                return conn
+
+        try:
+            return self._readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database reader")
+
+    def close(self):
+        """Close every connection opened by the pool"""
+        with self._write_lock:
+            for conn in self._all_connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.debug(f"Error closing pooled connection: {e}")
+            self._all_connections.clear()
+            self._writer = None
+            self._readers = queue.LifoQueue()
+            self._reader_count = 0
+
+
+_shared_databases: Dict[str, 'NewsDatabase'] = {}
+_shared_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = DEFAULT_DB_PATH) -> 'NewsDatabase':
+    """
+    The process-wide NewsDatabase for db_path, created on first use.
+
+    Services share it instead of constructing their own, so the schema is
+    checked once per process and every caller draws on one connection pool.
+    """
+    key = os.path.abspath(db_path)
+    with _shared_databases_lock:
+        db = _shared_databases.get(key)
+        if db is None:
+            db = _shared_databases[key] = NewsDatabase(db_path)
+        return db
+
+
+class WriteQueue:
+    """
+    A single writer thread applying queued write operations in group transactions.
+
+    Producers submit callables and get a Future back. The writer thread
+    drains up to max_batch waiting operations into one transaction, each
+    under its own savepoint, so a failing operation only undoes itself and
+    concurrent writers share one commit. The queue is bounded: when it is
+    full, submit blocks, pushing back on producers, and times out like a
+    busy database.
+
+    Operations run on the writer thread with the batch transaction open;
+    their own writer() blocks join it. Calls made from inside a writer()
+    block run inline instead of queueing behind themselves.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_pending: int = DEFAULT_WRITE_QUEUE_SIZE,
+                 max_batch: int = DEFAULT_WRITE_BATCH_SIZE):
+        self.pool = pool
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """Queue func(*args, **kwargs) for the writer thread"""
+        future: Future = Future()
+        if self.pool.holds_writer():
+            self._run_inline(future, func, args, kwargs)
+            return future
+
+        self._ensure_started()
+        try:
+            self._queue.put((future, func, args, kwargs), timeout=self.pool.timeout)
+        except queue.Full:
+            raise sqlite3.OperationalError("Timed out waiting for space in the write queue")
+        return future
+
+    def call(self, func, *args, **kwargs):
+        """Run func on the writer thread and return its result once committed"""
+        return self.submit(func, *args, **kwargs).result()
+
+    def _run_inline(self, future: Future, func, args, kwargs):
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="news-db-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            operations = [item for item in batch if item is not None and item[0].set_running_or_notify_cancel()]
+            if operations:
+                self._apply(operations)
+            if stop:
+                return
+
+    def _apply(self, operations: List[tuple]):
+        outcomes = []
+        try:
+            with self.pool.writer():
+                for future, func, args, kwargs in operations:
+                    try:
+                        # Nested writer(): a savepoint scoped to this operation
+                        with self.pool.writer():
+                            outcomes.append((future, True, func(*args, **kwargs)))
+                    except Exception as e:
+                        outcomes.append((future, False, e))
+        except Exception as e:
+            # The shared transaction failed as a whole: run each operation on
+            # its own, with its own writer() blocks and error handling
+            logger.warning(f"Group write of {len(operations)} operations failed, retrying individually: {e}")
+            for future, func, args, kwargs in operations:
+                self._run_inline(future, func, args, kwargs)
+            return
+
+        # Results are released only after the commit
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def close(self):
+        """Apply the operations already queued, then stop the writer thread"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+
+def queued_write(method):
+    """Run a NewsDatabase write method on the writer thread, grouped with concurrent writes"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.write_queue.call(method, self, *args, **kwargs)
+    wrapper.queued_write = True
+    return wrapper
+
+
 class NewsDatabase:
     """SQLite database handler for storing extracted news"""
     
-    def __init__(self, db_path: str = "news_database.db"):
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, read_pool_size: int = None):
         self.db_path = db_path
+        self.content_codec = ContentCodec(db_path)
+        self.query_stats = QueryStats() if QUERY_STATS_ENABLED else None
+        self.pool = ConnectionPool(
+            db_path, read_pool_size if read_pool_size is not None else DEFAULT_READ_POOL_SIZE,
+            on_connect=self.content_codec.register, query_stats=self.query_stats
+        )
+        self.write_queue = WriteQueue(self.pool)
+        self._archive = None
+        # Set by init_database; False when SQLite was built without FTS5
+        self.fulltext_enabled = False
         self.init_database()
-    
+
+    def writer(self):
+        """Context manager yielding the pooled writer connection in a transaction"""
+        return self.pool.writer()
+
+    def reader(self):
+        """Context manager yielding a pooled read connection"""
+        return self.pool.reader()
+
+    def submit_write(self, func, *args, **kwargs) -> Future:
+        """
+        Queue func(*args, **kwargs) for the writer thread and return a Future.
+
+        The Future resolves once the group transaction holding func has
+        committed; writer() blocks inside func join that transaction.
+        """
+        return self.write_queue.submit(func, *args, **kwargs)
+
+    @property
+    def archive(self):
+        """The ArticleArchive holding this database's monthly shards of old articles"""
+        if self._archive is None:
+            # Imported here: the archive module builds on this one
+            from src.db.archive import ArticleArchive
+            self._archive = ArticleArchive(self)
+        return self._archive
+
+    def close(self):
+        """Finish queued writes and close all pooled connections"""
+        self.write_queue.close()
+        self.pool.close()
+
     def init_database(self):
-        """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    url TEXT UNIQUE NOT NULL,
-                    category TEXT NOT NULL,
-                    summary TEXT,
-                    published_date TEXT,
-                    author TEXT,
-                    content TEXT,
-                    source TEXT NOT NULL,
-                    tags TEXT,
-                    extracted_at TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    classification_method TEXT,
-                    classification_confidence REAL,
-                    classification_explanation TEXT,
-                    manual_override BOOLEAN DEFAULT FALSE
-                )
-            """)
-
-            # Add new columns to existing tables if they don't exist
-            self._add_classification_columns(conn)
-            self._add_similarity_tables(conn)
-            self._add_chatbot_tables(conn)
-
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_category ON articles(category);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_source ON articles(source);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_published_date ON articles(published_date);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_classification_confidence ON articles(classification_confidence);
-            """)
-
-    def _add_classification_columns(self, conn):
-        """Add classification columns to existing tables if they don't exist."""
-        try:
-            # Check if columns exist by trying to select them
-            conn.execute("SELECT classification_method FROM articles LIMIT 1")
-        except sqlite3.OperationalError:
-            # Columns don't exist, add them
-            logger.info("Adding classification columns to existing articles table")
-            conn.execute("ALTER TABLE articles ADD COLUMN classification_method TEXT")
-            conn.execute("ALTER TABLE articles ADD COLUMN classification_confidence REAL")
-            conn.execute("ALTER TABLE articles ADD COLUMN classification_explanation TEXT")
-            conn.execute("ALTER TABLE articles ADD COLUMN manual_override BOOLEAN DEFAULT FALSE")
-
-    def _add_similarity_tables(self, conn):
-        """Add similarity tables for article similarity detection."""
-        try:
-            # Create article_similarities table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS article_similarities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    article_id_1 INTEGER NOT NULL,
-                    article_id_2 INTEGER NOT NULL,
-                    similarity_score REAL NOT NULL,
-                    title_similarity REAL NOT NULL,
-                    keyword_similarity REAL NOT NULL,
-                    time_similarity REAL NOT NULL,
-                    similarity_method TEXT NOT NULL,
-                    explanation TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (article_id_1) REFERENCES articles(id),
-                    FOREIGN KEY (article_id_2) REFERENCES articles(id),
-                    UNIQUE(article_id_1, article_id_2)
-                )
-            """)
-
-            # Create article_clusters table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS article_clusters (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cluster_id TEXT UNIQUE NOT NULL,
-                    main_article_id INTEGER NOT NULL,
-                    cluster_score REAL NOT NULL,
-                    summary TEXT,
-                    sources_covered TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (main_article_id) REFERENCES articles(id)
-                )
-            """)
-
-            # Create cluster_articles table (many-to-many)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cluster_articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cluster_id TEXT NOT NULL,
-                    article_id INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (article_id) REFERENCES articles(id),
-                    UNIQUE(cluster_id, article_id)
-                )
-            """)
-
-            # Create indexes for performance
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_similarities_article1 ON article_similarities(article_id_1);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_similarities_article2 ON article_similarities(article_id_2);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_similarities_score ON article_similarities(similarity_score);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_clusters_main_article ON article_clusters(main_article_id);
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_cluster_articles_cluster ON cluster_articles(cluster_id);
-            """)
-
-            logger.info("Successfully created similarity tables and indexes")
-
-        except sqlite3.OperationalError as e:
-            # Tables might already exist
-            logger.debug(f"Similarity tables might already exist: {e}")
+        """Apply any pending schema migrations"""
+        # Imported here: the migrations reuse this module's helpers
+        from src.db.migrations import migrate
 
-    def save_article(self, article: NewsArticle) -> bool:
-        """Save an article to the database"""
+        # Schema setup uses its own short-lived connection; the pool stays untouched
+        with closing(sqlite3.connect(self.db_path, timeout=DEFAULT_TIMEOUT, isolation_level=None)) as conn:
+            self.content_codec.register(conn)
+            self.schema_version = migrate(conn)
+            self.content_codec.load_dictionaries(conn)
+            self.fulltext_enabled = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+            ).fetchone() is not None
+
+    def get_recent_articles(self, hours_back: float, limit: int = None, category: str = None,
+                            source: str = None, include_content: bool = False,
+                            include_archive: bool = False) -> List[Dict]:
+        """
+        Get articles published within the last hours_back hours, newest first.
+
+        Served by a range scan on the published_ts indexes, so the cost
+        follows the size of the window rather than of the table. Rows
+        carry 'content' only when include_content is set. include_archive
+        adds archived articles from the shards the window reaches.
+        """
+        conditions = ["published_ts >= ?"]
+        params: List = [int(time.time() - hours_back * 3600)]
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+
+        sql = f"""
+            SELECT {_article_columns(include_content)} FROM articles a {_body_join(include_content)}
+            WHERE {' AND '.join(conditions)} ORDER BY published_ts DESC
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(sql, params)
+            articles = [dict(row) for row in cursor.fetchall()]
+
+        if include_archive:
+            articles += self.archive.get_recent_articles(hours_back, limit, category, source, include_content)
+            articles.sort(key=lambda article: article['published_ts'], reverse=True)
+            if limit is not None:
+                del articles[limit:]
+        return articles
+
+    @queued_write
+    def rebuild_fulltext_index(self) -> bool:
+        """Rebuild the full-text index from the stored articles and their bodies and merge its segments"""
+        if not self.fulltext_enabled:
+            logger.error("Full-text index is not available in this SQLite build")
+            return False
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO articles 
-                    (title, url, category, summary, published_date, author, content, source, tags, extracted_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    article.title, article.url, article.category, article.summary,
-                    article.published_date, article.author, article.content,
-                    article.source, json.dumps(article.tags), article.extracted_at
-                ))
+            with self.writer() as conn:
+                fill_fulltext_index(conn, self.content_codec.decode)
+                conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
             return True
         except Exception as e:
-            logger.error(f"Error saving article to database: {e}")
+            logger.error(f"Error rebuilding full-text index: {e}")
             return False
-    
-    def get_articles(self, category: str = None, limit: int = 100) -> List[Dict]:
-        """Retrieve articles from the database"""
-        with sqlite3.connect(self.db_path) as conn:
+
+    def search_articles(self, keywords: List[str], limit: int = 10, category: str = None,
+                        since: Union[int, str, datetime] = None) -> List[Dict]:
+        """
+        Full-text search for articles matching any of the keywords.
+
+        Keywords match as prefixes of indexed (stemmed) words. Results are
+        ordered by BM25, with title matches weighted above summary and
+        content matches; each row carries its 'bm25' score (lower is better).
+        since limits results to articles published at or after that time.
+        """
+        if not keywords:
+            return []
+
+        match = ' OR '.join('"{}"*'.format(keyword.replace('"', '""')) for keyword in keywords)
+        conditions = ["articles_fts MATCH ?"]
+        params: List = [match]
+        if category:
+            conditions.append("a.category = ?")
+            params.append(category)
+        if since:
+            conditions.append("a.published_ts >= ?")
+            params.append(_epoch_param(since))
+
+        with self.reader() as conn:
             conn.row_factory = sqlite3.Row
-            if category:
-                cursor = conn.execute("""
-                    SELECT * FROM articles WHERE category = ? 
-                    ORDER BY created_at DESC LIMIT ?
-                """, (category, limit))
-            else:
-                cursor = conn.execute("""
-                    SELECT * FROM articles ORDER BY created_at DESC LIMIT ?
-                """, (limit,))
+            cursor = conn.execute(f"""
+                SELECT a.id, a.title, a.summary, a.category, a.source, a.url, a.created_at, a.published_ts,
+                       bm25(articles_fts, 10.0, 5.0, 1.0) AS bm25
+                FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+                WHERE {' AND '.join(conditions)}
+                ORDER BY bm25
+                LIMIT ?
+            """, (*params, limit))
             return [dict(row) for row in cursor.fetchall()]
 
+    def save_article(self, article: NewsArticle) -> bool:
+        """Save an article to the database, keeping its id if the URL is already stored"""
+        return self.save_articles_bulk([article])[0] != 'failed'
+    
+    def get_articles(self, category: str = None, limit: int = 100, source: str = None,
+                     since: Union[str, datetime] = None, until: Union[str, datetime] = None,
+                     cursor: str = None, include_content: bool = False,
+                     include_archive: bool = False) -> List[Dict]:
+        """
+        Retrieve articles from the database, newest first.
+
+        Args:
+            category: Only articles in this category
+            limit: Maximum number of articles to return
+            source: Only articles from this source (case-insensitive)
+            since: Only articles stored at or after this time
+            until: Only articles stored before this time
+            cursor: Continue after the article encoded by encode_cursor;
+                raises ValueError if it is invalid
+            include_content: Also load each article's body as 'content'
+            include_archive: Merge in archived articles from the shards
+                the filters and cursor can reach
+
+        Pages are read with a keyset on (created_at, id), so every page
+        costs the same however deep it is.
+        """
+        where, params = article_filter_clause(category, source, since, until, cursor)
+        with self.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"""
+                SELECT {_article_columns(include_content)} FROM articles a {_body_join(include_content)}
+                {where}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            """, (*params, limit))
+            articles = [dict(row) for row in rows.fetchall()]
+
+        if include_archive:
+            if len(articles) == limit and (not since or _timestamp_param(since) < articles[-1]['created_at']):
+                # Only archived rows at least as new as the last hot row can enter the page
+                since = articles[-1]['created_at']
+            articles += self.archive.get_articles(category, limit, source, since, until, cursor,
+                                                  include_content)
+            articles.sort(key=lambda article: (article['created_at'], article['id']), reverse=True)
+            del articles[limit:]
+        return articles
+
+    def get_article_bodies(self, article_ids: List[int]) -> Dict[int, Optional[str]]:
+        """Get the content of each stored article id"""
+        bodies = {}
+        ids = list(set(article_ids))
+        try:
+            with self.reader() as conn:
+                for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                    chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                    cursor = conn.execute(
+                        f"SELECT article_id, content FROM article_bodies WHERE article_id IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    bodies.update((article_id, self.content_codec.decode(content))
+                                  for article_id, content in cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error reading article bodies: {e}")
+        return bodies
+
+    def get_articles_by_ids(self, article_ids: List[int], columns: Tuple[str, ...] = None,
+                            include_content: bool = False) -> Dict[int, Dict]:
+        """
+        Get many articles by id with one IN (...) query per LOOKUP_CHUNK_SIZE ids.
+
+        Returns {id: row} for the ids that exist. columns narrows the
+        article columns read ('id' is always included); include_content
+        adds each body as 'content'.
+        """
+        if columns is not None:
+            if not all(column.isidentifier() for column in columns):
+                raise ValueError(f"invalid article columns: {columns}")
+            select = ', '.join(dict.fromkeys(f"a.{column}" for column in ('id', *columns)))
+            if include_content:
+                select += ", article_content(b.content) AS content"
+        else:
+            select = _article_columns(include_content)
+
+        articles = {}
+        ids = list(set(article_ids))
+        try:
+            with self.reader() as conn:
+                conn.row_factory = sqlite3.Row
+                for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                    chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                    cursor = conn.execute(f"""
+                        SELECT {select} FROM articles a {_body_join(include_content)}
+                        WHERE a.id IN ({','.join('?' * len(chunk))})
+                    """, chunk)
+                    articles.update((row['id'], dict(row)) for row in cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error reading articles by id: {e}")
+        return articles
+
+    @queued_write
+    def train_content_dictionary(self, sample_size: int = 1000, size: int = DICTIONARY_SIZE) -> Optional[int]:
+        """
+        Train a compression dictionary on the newest article bodies and
+        compress new bodies with it. Returns the dictionary id, or None if
+        compression is off or training failed.
+
+        Bodies already stored keep their dictionary until
+        recompress_article_bodies rewrites them.
+        """
+        codec = self.content_codec
+        if codec.codec is None:
+            logger.error("Article content compression is turned off")
+            return None
+        try:
+            with self.writer() as conn:
+                samples = [codec.decode(content) for content, in conn.execute(
+                    "SELECT content FROM article_bodies ORDER BY article_id DESC LIMIT ?", (sample_size,)
+                )]
+                dictionary = train_dictionary(samples, codec.codec, size)
+                if not dictionary:
+                    logger.warning("No shared text found to train a content dictionary")
+                    return None
+                cursor = conn.execute("INSERT INTO content_dictionaries (codec, dictionary) VALUES (?, ?)",
+                                      (codec.codec, dictionary))
+            codec.use_dictionary(cursor.lastrowid, dictionary)
+            logger.info(f"Trained {len(dictionary)} byte content dictionary {cursor.lastrowid} "
+                        f"from {len(samples)} articles")
+            return cursor.lastrowid
+        except Exception as e:
+            logger.error(f"Error training content dictionary: {e}")
+            return None
+
+    def recompress_article_bodies(self, batch_size: int = LOOKUP_CHUNK_SIZE) -> Optional[int]:
+        """
+        Rewrite stored bodies not yet using the current codec and dictionary.
+
+        Runs in batches through the write queue so ingestion keeps going;
+        returns the number of bodies rewritten, or None on error.
+        """
+        def rewrite(after: int) -> Tuple[Optional[int], int]:
+            with self.writer() as conn:
+                rows = conn.execute(
+                    "SELECT article_id, content FROM article_bodies WHERE article_id > ? ORDER BY article_id LIMIT ?",
+                    (after, batch_size)
+                ).fetchall()
+                stale = [(self.content_codec.encode(self.content_codec.decode(content)), article_id)
+                         for article_id, content in rows if not self.content_codec.is_current(content)]
+                conn.executemany("UPDATE article_bodies SET content = ? WHERE article_id = ?", stale)
+            return (rows[-1][0] if rows else None), len(stale)
+
+        rewritten = 0
+        last_id = 0
+        try:
+            while last_id is not None:
+                last_id, count = self.submit_write(rewrite, last_id).result()
+                rewritten += count
+            return rewritten
+        except Exception as e:
+            logger.error(f"Error recompressing article bodies: {e}")
+            return None
+
     def save_article_with_classification(self, article: NewsArticle,
                                        classification_result=None) -> bool:
         """Save an article with classification information to the database"""
+        if classification_result:
+            article = replace(article, category=classification_result.category)
+        return self.save_articles_bulk([article], [classification_result])[0] != 'failed'
+
+    def get_content_hashes(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """Get the stored content hash of each known URL"""
+        hashes = {}
+        urls = list(set(urls))
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                if classification_result:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO articles
-                        (title, url, category, summary, published_date, author, content, source, tags, extracted_at,
-                         classification_method, classification_confidence, classification_explanation)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        article.title, article.url, classification_result.category, article.summary,
-                        article.published_date, article.author, article.content,
-                        article.source, json.dumps(article.tags), article.extracted_at,
-                        classification_result.method_used, classification_result.confidence,
-                        classification_result.explanation
-                    ))
-                else:
-                    # Fallback to original save method
-                    conn.execute("""
-                        INSERT OR REPLACE INTO articles
-                        (title, url, category, summary, published_date, author, content, source, tags, extracted_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+            with self.reader() as conn:
+                for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+                    chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+                    cursor = conn.execute(
+                        f"SELECT url, content_hash FROM articles WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                    hashes.update(cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error reading content hashes: {e}")
+        return hashes
+
+    @queued_write
+    def save_articles_bulk(self, articles: List[NewsArticle], classification_results: List = None) -> List[str]:
+        """
+        Save many articles with classification information in one transaction.
+
+        Articles are stored with their own category; the classification
+        results only provide the classification columns. Returns the outcome
+        of each article in order: 'inserted', 'updated', 'unchanged' or
+        'failed'.
+
+        Known URLs are updated in place, so ids and the rows referring to
+        them survive. Articles whose content hash matches the stored one are
+        not written at all; for changed articles the embeddings and
+        similarities computed from the old content are dropped. Rows are
+        written with a single executemany; if that fails, they are retried
+        one by one so a bad row only fails itself.
+        """
+        if not articles:
+            return []
+        if classification_results is None:
+            classification_results = [None] * len(articles)
+
+        upsert_sql = """
+            INSERT INTO articles
+            (title, url, category, summary, published_date, author, content_length, source, tags, extracted_at,
+             classification_method, classification_confidence, classification_explanation, content_hash,
+             published_ts, created_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                summary = excluded.summary,
+                published_date = excluded.published_date,
+                published_ts = excluded.published_ts,
+                author = excluded.author,
+                content_length = excluded.content_length,
+                source = excluded.source,
+                tags = excluded.tags,
+                extracted_at = excluded.extracted_at,
+                content_hash = excluded.content_hash,
+                -- A manual classification outlives content updates
+                category = CASE WHEN articles.manual_override THEN articles.category
+                    ELSE excluded.category END,
+                classification_method = CASE WHEN articles.manual_override THEN articles.classification_method
+                    ELSE COALESCE(excluded.classification_method, articles.classification_method) END,
+                classification_confidence = CASE WHEN articles.manual_override THEN articles.classification_confidence
+                    ELSE COALESCE(excluded.classification_confidence, articles.classification_confidence) END,
+                classification_explanation = CASE WHEN articles.manual_override THEN articles.classification_explanation
+                    ELSE COALESCE(excluded.classification_explanation, articles.classification_explanation) END
+            WHERE articles.content_hash IS NOT excluded.content_hash
+        """
+        body_sql = """
+            INSERT INTO article_bodies (article_id, content)
+            SELECT id, ? FROM articles WHERE url = ?
+            ON CONFLICT(article_id) DO UPDATE SET content = excluded.content
+        """
+        # The contentless full-text index is kept here: old rows are removed with the text they were indexed with
+        index_sql = """
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            SELECT id, ?, ?, ? FROM articles WHERE url = ?
+        """
+        unindex_sql = """
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            SELECT 'delete', id, ?, ?, ? FROM articles WHERE url = ?
+        """
+
+        try:
+            with self.writer() as conn:
+                # Stored hashes decide between inserted, updated and unchanged
+                urls = list({article.url for article in articles})
+                stored = {}
+                stored_ids = {}
+                for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+                    chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+                    cursor = conn.execute(
+                        f"SELECT url, content_hash, id FROM articles WHERE url IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    for url, digest, article_id in cursor.fetchall():
+                        stored[url] = digest
+                        stored_ids[article_id] = url
+
+                outcomes = []
+                pending = []
+                now = int(time.time())
+                for index, (article, result) in enumerate(zip(articles, classification_results)):
+                    digest = article_content_hash(article)
+                    if article.url not in stored:
+                        outcomes.append('inserted')
+                    elif stored[article.url] == digest:
+                        outcomes.append('unchanged')
+                        continue
+                    else:
+                        outcomes.append('updated')
+                    stored[article.url] = digest
+                    pending.append((index, (
                         article.title, article.url, article.category, article.summary,
-                        article.published_date, article.author, article.content,
-                        article.source, json.dumps(article.tags), article.extracted_at
-                    ))
-            return True
+                        article.published_date, article.author, len(article.content or ''),
+                        article.source, json.dumps(article.tags), article.extracted_at,
+                        result.method_used if result else None,
+                        result.confidence if result else None,
+                        result.explanation if result else None,
+                        digest,
+                        parse_timestamp(article.published_date) or now,
+                        now
+                    ), (self.content_codec.encode(article.content), article.url),
+                        (article.title, article.summary, article.content, article.url)))
+
+                # Indexed text of the stored articles about to change, by URL
+                indexed = {}
+                if self.fulltext_enabled:
+                    pending_urls = {text[3] for _, _, _, text in pending}
+                    changed_ids = [article_id for article_id, url in stored_ids.items() if url in pending_urls]
+                    indexed = {stored_ids[article_id]: (title, summary, content, stored_ids[article_id])
+                               for article_id, title, summary, content
+                               in fulltext_rows(conn, changed_ids, self.content_codec.decode)}
+
+                try:
+                    conn.execute("SAVEPOINT bulk_save")
+                    conn.executemany(upsert_sql, [row for _, row, _, _ in pending])
+                    conn.executemany(body_sql, [body for _, _, body, _ in pending])
+                    if self.fulltext_enabled:
+                        # A URL saved twice in the batch ends up with its last version
+                        final = {text[3]: text for _, _, _, text in pending}
+                        conn.executemany(unindex_sql, [indexed[url] for url in final if url in indexed])
+                        conn.executemany(index_sql, list(final.values()))
+                    conn.execute("RELEASE SAVEPOINT bulk_save")
+                except sqlite3.Error as e:
+                    logger.warning(f"Bulk save failed, retrying {len(pending)} articles individually: {e}")
+                    conn.execute("ROLLBACK TO SAVEPOINT bulk_save")
+                    conn.execute("RELEASE SAVEPOINT bulk_save")
+                    for index, row, body, text in pending:
+                        try:
+                            conn.execute("SAVEPOINT article_save")
+                            conn.execute(upsert_sql, row)
+                            conn.execute(body_sql, body)
+                            if self.fulltext_enabled:
+                                if text[3] in indexed:
+                                    conn.execute(unindex_sql, indexed[text[3]])
+                                conn.execute(index_sql, text)
+                            conn.execute("RELEASE SAVEPOINT article_save")
+                            indexed[text[3]] = text
+                        except sqlite3.Error as row_error:
+                            conn.execute("ROLLBACK TO SAVEPOINT article_save")
+                            conn.execute("RELEASE SAVEPOINT article_save")
+                            logger.error(f"Error saving article {row[1]} to database: {row_error}")
+                            outcomes[index] = 'failed'
+
+                changed_urls = [article.url for article, outcome in zip(articles, outcomes) if outcome == 'updated']
+                self._drop_derived_data(conn, changed_urls)
+
+            return outcomes
+        except Exception as e:
+            logger.error(f"Error bulk saving articles to database: {e}")
+            return ['failed'] * len(articles)
+
+    def _drop_derived_data(self, conn, urls: List[str]):
+        """Delete embeddings and similarities computed from the previous content of these articles"""
+        urls = list(set(urls))
+        for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+            chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+            ids_sql = f"SELECT id FROM articles WHERE url IN ({','.join('?' * len(chunk))})"
+            conn.execute(f"DELETE FROM article_embeddings WHERE article_id IN ({ids_sql})", chunk)
+            conn.execute(f"""
+                DELETE FROM article_similarities
+                WHERE article_id_1 IN ({ids_sql}) OR article_id_2 IN ({ids_sql})
+            """, chunk + chunk)
+
+    @queued_write
+    def try_acquire_crawl_lease(self, job_key: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Take the lease for a crawl job unless another owner holds an unexpired one.
+
+        A single conditional upsert makes acquisition atomic across processes;
+        finished and expired leases are taken over.
+        """
+        now = time.time()
+        try:
+            with self.writer() as conn:
+                cursor = conn.execute("""
+                    INSERT INTO crawl_leases (job_key, owner, status, acquired_at, expires_at)
+                    VALUES (?, ?, 'running', ?, ?)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        owner = excluded.owner,
+                        status = 'running',
+                        acquired_at = excluded.acquired_at,
+                        expires_at = excluded.expires_at,
+                        finished_at = NULL,
+                        result = NULL,
+                        error = NULL
+                    WHERE crawl_leases.status != 'running' OR crawl_leases.expires_at <= ?
+                """, (job_key, owner, now, now + ttl_seconds, now))
+                return cursor.rowcount > 0
         except Exception as e:
-            logger.error(f"Error saving article with classification to database: {e}")
+            logger.error(f"Error acquiring crawl lease {job_key}: {e}")
             return False
 
+    @queued_write
+    def renew_crawl_lease(self, job_key: str, owner: str, ttl_seconds: float) -> bool:
+        """Extend a running lease; returns False if the owner no longer holds it"""
+        try:
+            with self.writer() as conn:
+                cursor = conn.execute("""
+                    UPDATE crawl_leases SET expires_at = ?
+                    WHERE job_key = ? AND owner = ? AND status = 'running'
+                """, (time.time() + ttl_seconds, job_key, owner))
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error renewing crawl lease {job_key}: {e}")
+            return False
+
+    @queued_write
+    def finish_crawl_lease(self, job_key: str, owner: str, result: str = None, error: str = None) -> bool:
+        """Release a lease with the job's JSON result, or its error if it failed"""
+        try:
+            with self.writer() as conn:
+                cursor = conn.execute("""
+                    UPDATE crawl_leases
+                    SET status = ?, finished_at = ?, result = ?, error = ?
+                    WHERE job_key = ? AND owner = ? AND status = 'running'
+                """, ('failed' if error is not None else 'completed', time.time(), result, error,
+                      job_key, owner))
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error finishing crawl lease {job_key}: {e}")
+            return False
+
+    def get_crawl_lease(self, job_key: str) -> Optional[Dict]:
+        """Get the current lease row for a crawl job"""
+        try:
+            with self.reader() as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute("SELECT * FROM crawl_leases WHERE job_key = ?", (job_key,))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error reading crawl lease {job_key}: {e}")
+            return None
+
+    @queued_write
     def update_article_classification(self, article_id: int, classification_result,
                                     manual_override: bool = False) -> bool:
         """Update classification information for an existing article"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.writer() as conn:
                 cursor = conn.execute("""
                     UPDATE articles
                     SET category = ?, classification_method = ?, classification_confidence = ?,
@@ -236,88 +1092,101 @@ class NewsDatabase:
             return False
 
     def get_articles_for_reclassification(self, limit: int = 100) -> List[Dict]:
-        """Get articles that need reclassification (no classification data)"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get articles, with their content, that need reclassification (no classification data)"""
+        with self.reader() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM articles
+            cursor = conn.execute(f"""
+                SELECT {_article_columns(True)} FROM articles a {_body_join(True)}
                 WHERE classification_method IS NULL
                 ORDER BY created_at DESC
                 LIMIT ?
             """, (limit,))
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_stats_counters(self) -> Dict[str, Dict[str, Tuple[int, float]]]:
+        """
+        Get the trigger-maintained counters as {scope: {key: (count, total)}}.
+
+        Scopes are articles, category, source, classification_method,
+        category_confidence (total is the confidence sum), chat_sessions,
+        chat_role and embedding_model; see migrations.STATS_COUNTERS. The
+        read costs the number of counters, not the size of the tables.
+        """
+        counters: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        with self.reader() as conn:
+            for scope, key, count, total in conn.execute(
+                "SELECT scope, key, count, total FROM stats_counters WHERE count != 0"
+            ):
+                counters.setdefault(scope, {})[key] = (count, total)
+        return counters
+
     def get_classification_stats(self) -> Dict:
         """Get statistics about article classifications"""
-        with sqlite3.connect(self.db_path) as conn:
-            stats = {}
+        counters = self.get_stats_counters()
 
-            # Total articles
-            cursor = conn.execute("SELECT COUNT(*) FROM articles")
-            stats['total_articles'] = cursor.fetchone()[0]
+        def counts(scope: str) -> Dict[str, int]:
+            return {key: count for key, (count, _) in counters.get(scope, {}).items()}
 
-            # Articles with classification data
-            cursor = conn.execute("SELECT COUNT(*) FROM articles WHERE classification_method IS NOT NULL")
-            stats['classified_articles'] = cursor.fetchone()[0]
-
-            # By category
-            cursor = conn.execute("""
-                SELECT category, COUNT(*)
-                FROM articles
-                GROUP BY category
-                ORDER BY COUNT(*) DESC
-            """)
-            stats['by_category'] = dict(cursor.fetchall())
-
-            # By classification method
-            cursor = conn.execute("""
-                SELECT classification_method, COUNT(*)
-                FROM articles
-                WHERE classification_method IS NOT NULL
-                GROUP BY classification_method
-            """)
-            stats['by_method'] = dict(cursor.fetchall())
-
-            # Average confidence by category
-            cursor = conn.execute("""
-                SELECT category, AVG(classification_confidence)
-                FROM articles
-                WHERE classification_confidence IS NOT NULL
-                GROUP BY category
-            """)
-            stats['avg_confidence_by_category'] = {
-                cat: round(conf, 3) for cat, conf in cursor.fetchall()
+        by_category = counts('category')
+        by_method = counts('classification_method')
+        return {
+            'total_articles': counts('articles').get('', 0),
+            'classified_articles': sum(by_method.values()),
+            'by_category': dict(sorted(by_category.items(), key=lambda item: item[1], reverse=True)),
+            'by_method': by_method,
+            'avg_confidence_by_category': {
+                category: round(total / count, 3)
+                for category, (count, total) in counters.get('category_confidence', {}).items()
             }
-
-            return stats
+        }
 
     def save_similarity(self, similarity_result) -> bool:
         """Save similarity result to the database."""
+        return self.save_similarities_bulk([similarity_result]) == 1
+
+    @queued_write
+    def save_similarities_bulk(self, similarity_results: List) -> int:
+        """
+        Save many similarity results in one transaction.
+
+        Pairs are stored with the lower article id first, so a pair found in
+        either order updates the same row. Returns the number of rows written.
+        """
+        rows = []
+        for result in similarity_results:
+            first, second = sorted((result.article_id_1, result.article_id_2))
+            rows.append((
+                first, second, result.similarity_score, result.title_similarity,
+                result.keyword_similarity, result.time_similarity,
+                result.method_used, result.explanation
+            ))
+        if not rows:
+            return 0
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO article_similarities
+            with self.writer() as conn:
+                conn.executemany("""
+                    INSERT INTO article_similarities
                     (article_id_1, article_id_2, similarity_score, title_similarity,
                      keyword_similarity, time_similarity, similarity_method, explanation)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    similarity_result.article_id_1,
-                    similarity_result.article_id_2,
-                    similarity_result.similarity_score,
-                    similarity_result.title_similarity,
-                    similarity_result.keyword_similarity,
-                    similarity_result.time_similarity,
-                    similarity_result.method_used,
-                    similarity_result.explanation
-                ))
-            return True
+                    ON CONFLICT(article_id_1, article_id_2) DO UPDATE SET
+                        similarity_score = excluded.similarity_score,
+                        title_similarity = excluded.title_similarity,
+                        keyword_similarity = excluded.keyword_similarity,
+                        time_similarity = excluded.time_similarity,
+                        similarity_method = excluded.similarity_method,
+                        explanation = excluded.explanation,
+                        created_at = CURRENT_TIMESTAMP
+                """, rows)
+            return len(rows)
         except Exception as e:
-            logger.error(f"Error saving similarity result: {e}")
-            return False
+            logger.error(f"Error saving {len(rows)} similarity results: {e}")
+            return 0
 
     def get_similar_articles(self, article_id: int, limit: int = 10) -> List[Dict]:
         """Get articles similar to the specified article."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.reader() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("""
                 SELECT s.*, a.title, a.source, a.category, a.summary, a.url, a.published_date
@@ -338,7 +1207,7 @@ class NewsDatabase:
 
     def get_recent_similarities(self, limit: int = 50) -> List[Dict]:
         """Get recent similarity results."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.reader() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("""
                 SELECT * FROM article_similarities
@@ -350,125 +1219,123 @@ class NewsDatabase:
 
     def save_article_cluster(self, cluster) -> bool:
         """Save article cluster to the database."""
+        return self.save_article_clusters([cluster]) == 1
+
+    @queued_write
+    def save_article_clusters(self, clusters: List) -> int:
+        """
+        Save many article clusters and their memberships in one transaction.
+
+        Stored clusters sharing an article with a new cluster are superseded
+        and removed, so each article belongs to at most one cluster. Returns
+        the number of clusters written.
+        """
+        if not clusters:
+            return 0
+
+        article_ids = list({article_id for cluster in clusters
+                            for article_id in [cluster.main_article_id, *cluster.similar_articles]})
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Save cluster metadata
-                conn.execute("""
-                    INSERT OR REPLACE INTO article_clusters
-                    (cluster_id, main_article_id, cluster_score, summary, sources_covered)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    cluster.cluster_id,
-                    cluster.main_article_id,
-                    cluster.cluster_score,
-                    cluster.summary,
-                    ','.join(cluster.sources_covered)
-                ))
+            with self.writer() as conn:
+                stale = set()
+                for start in range(0, len(article_ids), LOOKUP_CHUNK_SIZE):
+                    chunk = article_ids[start:start + LOOKUP_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(f"""
+                        SELECT cluster_id FROM article_clusters WHERE main_article_id IN ({placeholders})
+                        UNION
+                        SELECT cluster_id FROM cluster_articles WHERE article_id IN ({placeholders})
+                    """, chunk + chunk)
+                    stale.update(row[0] for row in cursor.fetchall())
 
-                # Save cluster article relationships
-                for article_id in cluster.similar_articles:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO cluster_articles
-                        (cluster_id, article_id)
-                        VALUES (?, ?)
-                    """, (cluster.cluster_id, article_id))
+                stale_rows = [(cluster_id,) for cluster_id in stale]
+                conn.executemany("DELETE FROM cluster_articles WHERE cluster_id = ?", stale_rows)
+                conn.executemany("DELETE FROM article_clusters WHERE cluster_id = ?", stale_rows)
 
-            return True
+                conn.executemany("""
+                    INSERT INTO article_clusters
+                    (cluster_id, main_article_id, cluster_score, summary, sources_covered)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [
+                    (cluster.cluster_id, cluster.main_article_id, cluster.cluster_score,
+                     cluster.summary, ','.join(cluster.sources_covered))
+                    for cluster in clusters
+                ])
+                conn.executemany("""
+                    INSERT OR IGNORE INTO cluster_articles (cluster_id, article_id) VALUES (?, ?)
+                """, [
+                    (cluster.cluster_id, article_id)
+                    for cluster in clusters for article_id in cluster.similar_articles
+                ])
+            return len(clusters)
         except Exception as e:
-            logger.error(f"Error saving article cluster: {e}")
-            return False
+            logger.error(f"Error saving {len(clusters)} article clusters: {e}")
+            return 0
 
     def get_article_clusters(self, limit: int = 10) -> List[Dict]:
-        """Get article clusters with their associated articles."""
-        with sqlite3.connect(self.db_path) as conn:
+        """
+        Get article clusters with their associated articles.
+
+        Reads the clusters with their main article in one query and all
+        member articles in a second one, then assembles them in memory.
+        """
+        article_columns = ', '.join(f"a.{column} AS main_{column}" for column in CLUSTER_ARTICLE_COLUMNS)
+        with self.reader() as conn:
             conn.row_factory = sqlite3.Row
 
-            # Get cluster metadata
-            cursor = conn.execute("""
-                SELECT c.*, a.title as main_title, a.source as main_source
+            # Cluster metadata and main articles
+            cursor = conn.execute(f"""
+                SELECT c.*, {article_columns}
                 FROM article_clusters c
                 JOIN articles a ON c.main_article_id = a.id
-                ORDER BY c.created_at DESC
+                ORDER BY c.created_at DESC, c.cluster_score DESC
                 LIMIT ?
             """, (limit,))
 
-            clusters = []
+            clusters = {}
             for cluster_row in cursor.fetchall():
                 cluster_dict = dict(cluster_row)
+                cluster_dict['main_article'] = {
+                    column: cluster_dict.pop(f"main_{column}") for column in CLUSTER_ARTICLE_COLUMNS
+                }
+                # Kept for callers reading the flat main article fields
+                cluster_dict['main_title'] = cluster_dict['main_article']['title']
+                cluster_dict['main_source'] = cluster_dict['main_article']['source']
+                cluster_dict['similar_articles'] = []
+                cluster_dict['sources_covered'] = cluster_dict['sources_covered'].split(',') if cluster_dict['sources_covered'] else []
+                clusters[cluster_dict['cluster_id']] = cluster_dict
 
-                # Get cluster articles
-                article_cursor = conn.execute("""
-                    SELECT a.id, a.title, a.source, a.category, a.url
+            # Member articles of every cluster
+            cluster_ids = list(clusters)
+            member_columns = ', '.join(f"a.{column}" for column in CLUSTER_ARTICLE_COLUMNS)
+            for start in range(0, len(cluster_ids), LOOKUP_CHUNK_SIZE):
+                chunk = cluster_ids[start:start + LOOKUP_CHUNK_SIZE]
+                cursor = conn.execute(f"""
+                    SELECT ca.cluster_id, {member_columns}
                     FROM cluster_articles ca
                     JOIN articles a ON ca.article_id = a.id
-                    WHERE ca.cluster_id = ?
-                """, (cluster_dict['cluster_id'],))
-
-                cluster_dict['similar_articles'] = [dict(row) for row in article_cursor.fetchall()]
-                cluster_dict['sources_covered'] = cluster_dict['sources_covered'].split(',') if cluster_dict['sources_covered'] else []
+                    WHERE ca.cluster_id IN ({','.join('?' * len(chunk))})
+                    ORDER BY ca.id
+                """, chunk)
+                for row in cursor.fetchall():
+                    article = dict(row)
+                    clusters[article.pop('cluster_id')]['similar_articles'].append(article)
 
-                clusters.append(cluster_dict)
-
-            return clusters
-
-    def _add_chatbot_tables(self, conn):
-        """Add tables for chatbot functionality"""
-        logger.info("Adding chatbot tables to database")
-
-        # Table for storing article embeddings
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS article_embeddings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_id INTEGER NOT NULL,
-                embedding_vector TEXT NOT NULL,
-                embedding_model TEXT NOT NULL DEFAULT 'all-MiniLM-L6-v2',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles (id) ON DELETE CASCADE,
-                UNIQUE(article_id, embedding_model)
-            )
-        """)
-
-        # Table for chat sessions
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS chat_sessions (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                title TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Table for chat messages
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
-                content TEXT NOT NULL,
-                metadata TEXT, -- JSON string for additional data
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE
-            )
-        """)
-
-        # Indexes for better performance
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_article_embeddings_article_id ON article_embeddings(article_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_id ON chat_sessions(user_id)")
+            return list(clusters.values())
 
+    @queued_write
     def save_article_embedding(self, article_id: int, embedding_vector: list, model_name: str = 'all-MiniLM-L6-v2'):
-        """Save article embedding to database"""
+        """Save article embedding to database as a float32 BLOB"""
         try:
-            import json
-            embedding_json = json.dumps(embedding_vector)
-
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.writer() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO article_embeddings
+                    INSERT INTO article_embeddings
                     (article_id, embedding_vector, embedding_model)
                     VALUES (?, ?, ?)
-                """, (article_id, embedding_json, model_name))
+                    ON CONFLICT(article_id, embedding_model) DO UPDATE SET
+                        embedding_vector = excluded.embedding_vector,
+                        created_at = CURRENT_TIMESTAMP
+                """, (article_id, encode_embedding(embedding_vector), model_name))
 
             return True
         except Exception as e:
@@ -478,8 +1345,7 @@ class NewsDatabase:
     def get_article_embedding(self, article_id: int, model_name: str = 'all-MiniLM-L6-v2'):
         """Get article embedding from database"""
         try:
-            import json
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.reader() as conn:
                 cursor = conn.execute("""
                     SELECT embedding_vector FROM article_embeddings
                     WHERE article_id = ? AND embedding_model = ?
@@ -487,33 +1353,39 @@ class NewsDatabase:
 
                 result = cursor.fetchone()
                 if result:
-                    return json.loads(result[0])
+                    return decode_embedding(result[0])
                 return None
         except Exception as e:
             logger.error(f"Error getting embedding for article {article_id}: {e}")
             return None
 
+    @queued_write
     def save_chat_session(self, session_id: str, user_id: str = None, title: str = None):
         """Save or update chat session"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.writer() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO chat_sessions
+                    INSERT INTO chat_sessions
                     (id, user_id, title, updated_at)
                     VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(id) DO UPDATE SET
+                        user_id = excluded.user_id,
+                        title = excluded.title,
+                        updated_at = excluded.updated_at
                 """, (session_id, user_id, title))
             return True
         except Exception as e:
             logger.error(f"Error saving chat session {session_id}: {e}")
             return False
 
+    @queued_write
     def save_chat_message(self, session_id: str, role: str, content: str, metadata: dict = None):
         """Save chat message to database"""
         try:
             import json
             metadata_json = json.dumps(metadata) if metadata else None
 
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.writer() as conn:
                 cursor = conn.execute("""
                     INSERT INTO chat_messages
                     (session_id, role, content, metadata)
@@ -536,7 +1408,7 @@ class NewsDatabase:
         """Get chat messages for a session"""
         try:
             import json
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.reader() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute("""
                     SELECT role, content, metadata, created_at
@@ -0,0 +1,57 @@
+"""
+Binary encoding of embedding vectors for the article_embeddings table.
+
+A vector is stored as an 8 byte header followed by packed little-endian
+float32 values:
+
+    magic (2 bytes, b'EV') | dtype code (1 byte) | padding (1 byte) | dimension (uint32)
+
+The header keeps the payload 8-byte aligned, so readers can map it with
+np.frombuffer(blob, dtype='<f4', count=dimension, offset=HEADER_SIZE)
+without copying. Rows written before this format are JSON text and are
+still decoded.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from typing import List, Sequence, Tuple, Union
+
+EMBEDDING_MAGIC = b'EV'
+DTYPE_FLOAT32 = 1
+
+_HEADER = struct.Struct('<2sBxI')
+HEADER_SIZE = _HEADER.size
+
+
+def encode_embedding(vector: Sequence[float]) -> bytes:
+    """Pack a vector as a float32 BLOB with its header"""
+    values = array('f', vector)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return _HEADER.pack(EMBEDDING_MAGIC, DTYPE_FLOAT32, len(values)) + values.tobytes()
+
+
+def read_header(blob: bytes) -> Tuple[int, int]:
+    """Return the (dtype code, dimension) of an encoded embedding, raising ValueError if malformed"""
+    if len(blob) < HEADER_SIZE:
+        raise ValueError("embedding blob shorter than its header")
+    magic, dtype, dimension = _HEADER.unpack_from(blob)
+    if magic != EMBEDDING_MAGIC or dtype != DTYPE_FLOAT32:
+        raise ValueError("unsupported embedding encoding")
+    if len(blob) != HEADER_SIZE + 4 * dimension:
+        raise ValueError(f"embedding blob size does not match dimension {dimension}")
+    return dtype, dimension
+
+
+def decode_embedding(stored: Union[bytes, str]) -> List[float]:
+    """Decode a stored embedding (binary or legacy JSON text) into a list of floats"""
+    if isinstance(stored, str):
+        return json.loads(stored)
+    read_header(stored)
+    values = array('f')
+    values.frombytes(stored[HEADER_SIZE:])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tolist()
@@ -0,0 +1,77 @@
+"""
+Database maintenance commands.
+
+Usage:
+    python -m src.db.maintenance rebuild-fts [--db news_database.db]
+    python -m src.db.maintenance archive [--db news_database.db] [--days 90]
+    python -m src.db.maintenance train-dictionary [--db news_database.db]
+    python -m src.db.maintenance recompress [--db news_database.db]
+"""
+
+import argparse
+import logging
+import sys
+
+from src.db.archive import ARTICLE_RETENTION_DAYS
+from src.db.database_conn import NewsDatabase
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_fts(db: NewsDatabase, args: argparse.Namespace) -> bool:
+    """Rebuild the full-text index, e.g. after articles were edited through another sqlite3 connection"""
+    logger.info(f"Rebuilding full-text index in {db.db_path}")
+    return db.rebuild_fulltext_index()
+
+
+def archive_articles(db: NewsDatabase, args: argparse.Namespace) -> bool:
+    """Move articles older than the retention period to the monthly archive files"""
+    counts = db.archive.archive_articles(older_than_days=args.days)
+    if counts is not None:
+        print(f"Archived {counts['articles']} articles")
+    return counts is not None
+
+
+def train_content_dictionary(db: NewsDatabase, args: argparse.Namespace) -> bool:
+    """Train a compression dictionary on stored articles and rewrite their bodies with it"""
+    if db.train_content_dictionary() is None:
+        return False
+    return recompress_bodies(db, args)
+
+
+def recompress_bodies(db: NewsDatabase, args: argparse.Namespace) -> bool:
+    """Rewrite article bodies with the configured compression and newest dictionary"""
+    rewritten = db.recompress_article_bodies()
+    if rewritten is not None:
+        print(f"Recompressed {rewritten} article bodies")
+    return rewritten is not None
+
+
+COMMANDS = {
+    'rebuild-fts': rebuild_fts,
+    'archive': archive_articles,
+    'train-dictionary': train_content_dictionary,
+    'recompress': recompress_bodies,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="News database maintenance")
+    parser.add_argument('command', choices=sorted(COMMANDS), help="Maintenance task to run")
+    parser.add_argument('--db', default="news_database.db", help="SQLite database path")
+    parser.add_argument('--days', type=float, default=ARTICLE_RETENTION_DAYS,
+                        help="archive: move articles published more than this many days ago")
+    args = parser.parse_args()
+
+    db = NewsDatabase(args.db)
+    try:
+        ok = COMMANDS[args.command](db, args)
+    finally:
+        db.close()
+
+    print(f"{args.command}: {'done' if ok else 'failed'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
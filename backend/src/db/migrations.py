@@ -0,0 +1,678 @@
+"""
+Versioned schema migrations for the news database.
+
+Each migration runs once per database, in order, and is recorded in the
+schema_version table; opening an up-to-date database costs one query
+instead of re-running every CREATE ... IF NOT EXISTS and ALTER probe.
+
+The early migrations were written before versioning existed and still
+tolerate databases that already have their tables and columns, so an
+unversioned database is brought up to date by running them all. New
+migrations are appended to MIGRATIONS with the next version number and
+may assume everything before them has been applied.
+"""
+
+import json
+import logging
+import sqlite3
+from typing import Callable, List, Tuple
+
+from src.db.content_codec import ContentCodec, compress
+from src.db.database_conn import content_hash, fill_fulltext_index, parse_timestamp
+from src.db.embedding_codec import encode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def _create_articles_table(conn):
+    """Create the articles table as first released, with its lookup indexes."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            url TEXT UNIQUE NOT NULL,
+            category TEXT NOT NULL,
+            summary TEXT,
+            published_date TEXT,
+            author TEXT,
+            content TEXT,
+            source TEXT NOT NULL,
+            tags TEXT,
+            extracted_at TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_category ON articles(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_source ON articles(source)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_published_date ON articles(published_date)")
+
+
+def _add_classification_columns(conn):
+    """Add classification columns to existing tables if they don't exist."""
+    try:
+        # Check if columns exist by trying to select them
+        conn.execute("SELECT classification_method FROM articles LIMIT 1")
+    except sqlite3.OperationalError:
+        # Columns don't exist, add them
+        logger.info("Adding classification columns to existing articles table")
+        conn.execute("ALTER TABLE articles ADD COLUMN classification_method TEXT")
+        conn.execute("ALTER TABLE articles ADD COLUMN classification_confidence REAL")
+        conn.execute("ALTER TABLE articles ADD COLUMN classification_explanation TEXT")
+        conn.execute("ALTER TABLE articles ADD COLUMN manual_override BOOLEAN DEFAULT FALSE")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_classification_confidence ON articles(classification_confidence)")
+
+
+def _add_similarity_tables(conn):
+    """Add similarity tables for article similarity detection."""
+    try:
+        # Create article_similarities table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS article_similarities (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                article_id_1 INTEGER NOT NULL,
+                article_id_2 INTEGER NOT NULL,
+                similarity_score REAL NOT NULL,
+                title_similarity REAL NOT NULL,
+                keyword_similarity REAL NOT NULL,
+                time_similarity REAL NOT NULL,
+                similarity_method TEXT NOT NULL,
+                explanation TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (article_id_1) REFERENCES articles(id),
+                FOREIGN KEY (article_id_2) REFERENCES articles(id),
+                UNIQUE(article_id_1, article_id_2)
+            )
+        """)
+
+        # Create article_clusters table
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS article_clusters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cluster_id TEXT UNIQUE NOT NULL,
+                main_article_id INTEGER NOT NULL,
+                cluster_score REAL NOT NULL,
+                summary TEXT,
+                sources_covered TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (main_article_id) REFERENCES articles(id)
+            )
+        """)
+
+        # Create cluster_articles table (many-to-many)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cluster_articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cluster_id TEXT NOT NULL,
+                article_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (article_id) REFERENCES articles(id),
+                UNIQUE(cluster_id, article_id)
+            )
+        """)
+
+        # Create indexes for performance
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_similarities_article1 ON article_similarities(article_id_1);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_similarities_article2 ON article_similarities(article_id_2);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_similarities_score ON article_similarities(similarity_score);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_clusters_main_article ON article_clusters(main_article_id);
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cluster_articles_cluster ON cluster_articles(cluster_id);
+        """)
+
+        logger.info("Successfully created similarity tables and indexes")
+
+    except sqlite3.OperationalError as e:
+        # Tables might already exist
+        logger.debug(f"Similarity tables might already exist: {e}")
+
+
+def _add_chatbot_tables(conn):
+    """Add tables for chatbot functionality"""
+    # Table for storing article embeddings
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_embeddings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER NOT NULL,
+            embedding_vector BLOB NOT NULL, -- float32 vector, see embedding_codec
+            embedding_model TEXT NOT NULL DEFAULT 'all-MiniLM-L6-v2',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (article_id) REFERENCES articles (id) ON DELETE CASCADE,
+            UNIQUE(article_id, embedding_model)
+        )
+    """)
+
+    # Table for chat sessions
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chat_sessions (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            title TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Table for chat messages
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS chat_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+            content TEXT NOT NULL,
+            metadata TEXT, -- JSON string for additional data
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE
+        )
+    """)
+
+    # Indexes for better performance
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_article_embeddings_article_id ON article_embeddings(article_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_id ON chat_sessions(user_id)")
+
+
+def _migrate_embedding_vectors(conn):
+    """Convert embeddings stored as JSON text to float32 BLOBs."""
+    migrated = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, embedding_vector FROM article_embeddings
+            WHERE id > ? AND typeof(embedding_vector) = 'text'
+            ORDER BY id LIMIT 1000
+        """, (last_id,)).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE article_embeddings SET embedding_vector = ? WHERE id = ?",
+            [(encode_embedding(json.loads(vector)), row_id) for row_id, vector in rows]
+        )
+        migrated += len(rows)
+        last_id = rows[-1][0]
+    if migrated:
+        logger.info(f"Converted {migrated} JSON embeddings to float32 BLOBs")
+
+
+def _add_crawl_lease_table(conn):
+    """Add the lease table used to run each crawl job once across processes."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_leases (
+            job_key TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            status TEXT NOT NULL CHECK (status IN ('running', 'completed', 'failed')),
+            acquired_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            finished_at REAL,
+            result TEXT, -- JSON result of the last completed run
+            error TEXT
+        )
+    """)
+
+
+def _add_content_hash_column(conn):
+    """Add the content hash column and fill it in for stored articles."""
+    try:
+        conn.execute("SELECT content_hash FROM articles LIMIT 1")
+        return
+    except sqlite3.OperationalError:
+        logger.info("Adding content_hash column to existing articles table")
+        conn.execute("ALTER TABLE articles ADD COLUMN content_hash TEXT")
+
+    # Hash existing rows so their first re-crawl is recognised as unchanged
+    cursor = conn.execute("""
+        SELECT id, title, summary, published_date, author, content, source, tags FROM articles
+    """)
+    updates = []
+    for article_id, title, summary, published_date, author, content, source, tags in cursor:
+        try:
+            tags = json.loads(tags) if tags else []
+        except json.JSONDecodeError:
+            tags = []
+        updates.append((content_hash(title, summary, published_date, author, content, source, tags), article_id))
+    conn.executemany("UPDATE articles SET content_hash = ? WHERE id = ?", updates)
+
+
+def _add_listing_indexes(conn):
+    """Index each listing filter followed by the (created_at, id) sort key."""
+    # The rowid is implicitly the last column of every index
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_created ON articles(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_category_created ON articles(category, created_at)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_articles_source_created ON articles(source COLLATE NOCASE, created_at)"
+    )
+
+
+def _add_fulltext_index(conn) -> bool:
+    """
+    Add the FTS5 index over article text, kept in sync by triggers.
+
+    The index is external-content: it stores only the inverted index and
+    reads the text back from the articles table. Returns False if FTS5
+    is not available.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone()
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content,
+                content='articles', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Full-text search unavailable, keyword search falls back to LIKE: {e}")
+        return False
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, new.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, old.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary, content ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, old.content);
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, new.content);
+        END
+    """)
+
+    if not exists:
+        # Index the articles stored before the index existed
+        logger.info("Building full-text index for existing articles")
+        conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+    return True
+
+
+def _add_timestamp_columns(conn):
+    """Add the integer published/created timestamps and fill them in for stored articles."""
+    try:
+        conn.execute("SELECT published_ts FROM articles LIMIT 1")
+        return
+    except sqlite3.OperationalError:
+        logger.info("Adding published_ts and created_ts columns to existing articles table")
+        conn.execute("ALTER TABLE articles ADD COLUMN published_ts INTEGER")
+        conn.execute("ALTER TABLE articles ADD COLUMN created_ts INTEGER")
+
+    conn.execute("UPDATE articles SET created_ts = CAST(strftime('%s', created_at) AS INTEGER)")
+    cursor = conn.execute("SELECT id, published_date, created_ts FROM articles")
+    updates = [
+        (parse_timestamp(published_date) or created_ts, article_id)
+        for article_id, published_date, created_ts in cursor.fetchall()
+    ]
+    conn.executemany("UPDATE articles SET published_ts = ? WHERE id = ?", updates)
+
+    # Time-window indexes on the normalized timestamps
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles(published_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_category_published_ts ON articles(category, published_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_source_published_ts ON articles(source, published_ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_created_ts ON articles(created_ts)")
+
+
+# Materialized statistics: (scope, key, amount summed into total, condition) per
+# table, written against each inserted row and subtracted for each deleted one.
+# Rows must not be written with INSERT OR REPLACE, whose implicit deletes skip
+# DELETE triggers.
+STATS_COUNTERS = {
+    'articles': [
+        ('articles', "''", '0', None),
+        ('category', '{row}.category', '0', None),
+        ('source', '{row}.source', '0', None),
+        ('classification_method', '{row}.classification_method', '0',
+         '{row}.classification_method IS NOT NULL'),
+        ('category_confidence', '{row}.category', '{row}.classification_confidence',
+         '{row}.classification_confidence IS NOT NULL'),
+    ],
+    'chat_sessions': [('chat_sessions', "''", '0', None)],
+    'chat_messages': [('chat_role', '{row}.role', '0', None)],
+    'article_embeddings': [('embedding_model', '{row}.embedding_model', '0', None)],
+}
+# Columns whose updates move a row between counters
+STATS_COUNTED_COLUMNS = {
+    'articles': ('category', 'source', 'classification_method', 'classification_confidence'),
+    'chat_messages': ('role',),
+    'article_embeddings': ('embedding_model',),
+}
+
+
+def _counter_statements(table: str, row: str, sign: int) -> str:
+    statements = []
+    for scope, key, total, condition in STATS_COUNTERS[table]:
+        statements.append(f"""
+            INSERT INTO stats_counters (scope, key, count, total)
+            SELECT '{scope}', {key.format(row=row)}, {sign}, {sign} * {total.format(row=row)}
+            WHERE {condition.format(row=row) if condition else 1}
+            ON CONFLICT(scope, key) DO UPDATE SET
+                count = count + excluded.count, total = total + excluded.total;""")
+    return ''.join(statements)
+
+
+def _add_stats_counters(conn):
+    """Add the stats_counters table, its maintenance triggers, and count existing rows."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("DELETE FROM stats_counters")
+
+    for table, counters in STATS_COUNTERS.items():
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_stats_insert AFTER INSERT ON {table} BEGIN
+                {_counter_statements(table, 'new', 1)}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_stats_delete AFTER DELETE ON {table} BEGIN
+                {_counter_statements(table, 'old', -1)}
+            END
+        """)
+        if table in STATS_COUNTED_COLUMNS:
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_stats_update
+                AFTER UPDATE OF {', '.join(STATS_COUNTED_COLUMNS[table])} ON {table} BEGIN
+                    {_counter_statements(table, 'old', -1)}
+                    {_counter_statements(table, 'new', 1)}
+                END
+            """)
+
+        for scope, key, total, condition in counters:
+            conn.execute(f"""
+                INSERT INTO stats_counters (scope, key, count, total)
+                SELECT '{scope}', {key.format(row=table)}, COUNT(*), TOTAL({total.format(row=table)})
+                FROM {table}
+                WHERE {condition.format(row=table) if condition else 1}
+                GROUP BY 2
+            """)
+
+
+def _move_article_bodies(conn):
+    """
+    Move article content into article_bodies so list queries read narrow rows.
+
+    articles keeps content_length for ranking. The full-text index keeps
+    covering title, summary and content, now through the article_documents
+    view.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            article_id INTEGER PRIMARY KEY REFERENCES articles(id),
+            content TEXT
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO article_bodies (article_id, content)
+        SELECT id, content FROM articles
+    """)
+    conn.execute("ALTER TABLE articles ADD COLUMN content_length INTEGER NOT NULL DEFAULT 0")
+    conn.execute("UPDATE articles SET content_length = COALESCE(length(content), 0)")
+
+    fulltext = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone() is not None
+    for trigger in ('articles_fts_insert', 'articles_fts_delete', 'articles_fts_update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    if fulltext:
+        conn.execute("DROP TABLE articles_fts")
+
+    try:
+        conn.execute("ALTER TABLE articles DROP COLUMN content")
+    except sqlite3.OperationalError as e:
+        # SQLite before 3.35: keep the column but empty it
+        logger.warning(f"Cannot drop articles.content, clearing it instead: {e}")
+        conn.execute("UPDATE articles SET content = NULL")
+
+    _create_document_index(conn, fulltext, decode="{}")
+    if fulltext:
+        conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def _create_document_index(conn, fulltext: bool, decode: str):
+    """
+    Create the article_documents view and the triggers tying articles,
+    article_bodies and the full-text index together.
+
+    decode wraps a stored body expression ("{}" for plain text). Each index
+    row is kept equal to its view row, and deleting an article deletes
+    its body.
+    """
+    conn.execute(f"""
+        CREATE VIEW IF NOT EXISTS article_documents AS
+        SELECT a.id, a.title, a.summary, {decode.format('b.content')} AS content
+        FROM articles a LEFT JOIN article_bodies b ON b.article_id = a.id
+    """)
+
+    if not fulltext:
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS articles_body_delete AFTER DELETE ON articles BEGIN
+                DELETE FROM article_bodies WHERE article_id = old.id;
+            END
+        """)
+        return
+
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, content,
+            content='article_documents', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    body = decode.format("(SELECT content FROM article_bodies WHERE article_id = {row}.id)")
+    conn.execute(f"""
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, {body.format(row='new')});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, {body.format(row='old')});
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            VALUES (new.id, new.title, new.summary, {body.format(row='new')});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER articles_body_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            VALUES ('delete', old.id, old.title, old.summary, {body.format(row='old')});
+            DELETE FROM article_bodies WHERE article_id = old.id;
+        END
+    """)
+    # Bodies are written after their article, replacing the row indexed without them
+    conn.execute(f"""
+        CREATE TRIGGER article_bodies_fts_insert AFTER INSERT ON article_bodies BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            SELECT 'delete', id, title, summary, NULL FROM articles WHERE id = new.article_id;
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            SELECT id, title, summary, {decode.format('new.content')} FROM articles WHERE id = new.article_id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER article_bodies_fts_update AFTER UPDATE OF content ON article_bodies BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+            SELECT 'delete', id, title, summary, {decode.format('old.content')} FROM articles WHERE id = old.article_id;
+            INSERT INTO articles_fts(rowid, title, summary, content)
+            SELECT id, title, summary, {decode.format('new.content')} FROM articles WHERE id = new.article_id;
+        END
+    """)
+
+
+def _drop_document_index_triggers(conn):
+    for trigger in ('articles_fts_insert', 'articles_fts_update', 'articles_body_delete',
+                    'article_bodies_fts_insert', 'article_bodies_fts_update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP VIEW IF EXISTS article_documents")
+
+
+def _compress_article_bodies(conn):
+    """
+    Store article bodies compressed.
+
+    Existing bodies are rewritten with zlib; the view and triggers decode
+    them with article_content(), which the connection must have registered
+    (ContentCodec.register). Decoded text is unchanged, so the full-text
+    index is kept as it is.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_dictionaries (
+            id INTEGER PRIMARY KEY,
+            codec INTEGER NOT NULL,
+            dictionary BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    fulltext = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone() is not None
+    _drop_document_index_triggers(conn)
+
+    rows = conn.execute("SELECT article_id, content FROM article_bodies WHERE typeof(content) = 'text'").fetchall()
+    if rows:
+        logger.info(f"Compressing {len(rows)} stored article bodies")
+        conn.executemany("UPDATE article_bodies SET content = ? WHERE article_id = ?",
+                         [(compress(content), article_id) for article_id, content in rows])
+
+    _create_document_index(conn, fulltext, decode="article_content({})")
+
+
+def _create_fulltext_index(conn, fulltext: bool):
+    """
+    Create the contentless full-text index and the trigger deleting an
+    article's body with the article.
+
+    The index keeps no copy of the text it covers, and the trigger is
+    plain SQL, so any sqlite3 connection can write articles. Bodies are
+    compressed and cannot be read by a trigger: NewsDatabase indexes the
+    decoded text when it saves an article and removes it with the old
+    values before the article changes or leaves the table. Articles
+    edited through other connections are reindexed by rebuild-fts.
+    """
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_body_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_bodies WHERE article_id = old.id;
+        END
+    """)
+    if fulltext:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content,
+                content='',
+                tokenize='porter unicode61'
+            )
+        """)
+
+
+def _store_fulltext_text(conn):
+    """
+    Make the full-text index independent of article_content().
+
+    The view and triggers created by migration 13 call article_content(),
+    which only NewsDatabase connections register, so other sqlite3
+    connections failed to update or delete articles. The index becomes
+    contentless and is kept by NewsDatabase; see _create_fulltext_index.
+    """
+    fulltext = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone() is not None
+    _drop_document_index_triggers(conn)
+    if fulltext:
+        conn.execute("DROP TABLE articles_fts")
+
+    _create_fulltext_index(conn, fulltext)
+    if fulltext:
+        codec = ContentCodec(conn.execute("PRAGMA database_list").fetchone()[2])
+        codec.load_dictionaries(conn)
+        fill_fulltext_index(conn, codec.decode)
+
+# (version, description, migration); append only, never renumber
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "articles table", _create_articles_table),
+    (2, "classification columns", _add_classification_columns),
+    (3, "similarity and cluster tables", _add_similarity_tables),
+    (4, "chatbot tables", _add_chatbot_tables),
+    (5, "float32 BLOB embeddings", _migrate_embedding_vectors),
+    (6, "crawl lease table", _add_crawl_lease_table),
+    (7, "content hash column", _add_content_hash_column),
+    (8, "listing indexes", _add_listing_indexes),
+    (9, "full-text index", _add_fulltext_index),
+    (10, "epoch timestamp columns", _add_timestamp_columns),
+    (11, "materialized statistics counters", _add_stats_counters),
+    (12, "article bodies table", _move_article_bodies),
+    (13, "compressed article bodies", _compress_article_bodies),
+    (14, "self-contained full-text index", _store_fulltext_text),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """The highest migration applied to the database, 0 if it is unversioned"""
+    try:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply the migrations the database has not had yet and return its version.
+
+    conn must be in autocommit mode (isolation_level=None). Each migration
+    commits together with its schema_version row in an IMMEDIATE
+    transaction, so concurrent processes apply it exactly once and a
+    failing migration leaves the database at the previous version.
+    """
+    version = schema_version(conn)
+    if version >= LATEST_VERSION:
+        return version
+
+    if version == 0:
+        # Readers no longer block on writers; persists in the database file
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    for number, description, apply in MIGRATIONS:
+        if number <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the lock
+            if schema_version(conn) < number:
+                logger.info(f"Applying schema migration {number}: {description}")
+                apply(conn)
+                conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                             (number, description))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        version = number
+
+    return version
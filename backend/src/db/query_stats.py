@@ -0,0 +1,245 @@
+"""
+Per-statement timing for the pooled SQLite connections.
+
+Pooled connections are InstrumentedConnection objects. Each statement
+is timed from execute until its result set is exhausted, so full scans
+that do their work while rows are fetched are charged correctly, and is
+recorded under its fingerprint: the SQL with literals replaced by ? and
+IN lists collapsed, so every call of the same query shares one entry.
+
+Statements slower than DB_SLOW_QUERY_MS are logged with their
+EXPLAIN QUERY PLAN; the plan is also kept with the statement's entry:
+
+    db.query_stats.snapshot()[0]
+    {'statement': 'SELECT ... FROM articles WHERE LOWER(title) LIKE ? ...',
+     'count': 42, 'total_ms': 812.4, 'mean_ms': 19.3, 'p99_ms': 61.0,
+     'max_ms': 75.2, 'rows': 420, 'slow': 3, 'plan': ['SCAN articles']}
+
+Set DB_QUERY_STATS=0 to open plain connections instead.
+"""
+
+import itertools
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS", "1") != "0"
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 100))
+# Durations kept per statement for the percentile
+TIMING_SAMPLES = 1000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_SAVEPOINT = re.compile(r"^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT) \w+$", re.IGNORECASE)
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize a statement so calls differing only in literals share an entry"""
+    statement = _WHITESPACE.sub(' ', sql).strip()
+    statement = _STRING_LITERAL.sub('?', statement)
+    statement = _NUMBER_LITERAL.sub('?', statement)
+    statement = _IN_LIST.sub('IN (...)', statement)
+    return _SAVEPOINT.sub(lambda match: f"{match.group(1).upper()} ?", statement)
+
+
+class _StatementStats:
+    __slots__ = ('count', 'total', 'max', 'rows', 'slow', 'durations', 'plan')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.durations = deque(maxlen=TIMING_SAMPLES)
+        self.plan: Optional[List[str]] = None
+
+
+class QueryStats:
+    """Thread-safe statement statistics shared by the connections of a pool"""
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._statements: Dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, elapsed: float, rows: int) -> bool:
+        """Add one execution; returns True if it was slow and its statement has no plan yet"""
+        key = fingerprint(sql)
+        slow = elapsed * 1000 >= self.slow_query_ms
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = _StatementStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.rows += max(rows, 0)
+            stats.durations.append(elapsed)
+            if slow:
+                stats.slow += 1
+            return slow and stats.plan is None
+
+    def set_plan(self, sql: str, plan: List[str]):
+        with self._lock:
+            stats = self._statements.get(fingerprint(sql))
+            if stats is not None:
+                stats.plan = plan
+
+    def snapshot(self, limit: int = None) -> List[Dict]:
+        """Statement entries, most total time first"""
+        with self._lock:
+            entries = [(key, stats, sorted(stats.durations)) for key, stats in self._statements.items()]
+
+        result = []
+        for key, stats, durations in entries:
+            p99 = durations[min(len(durations) - 1, math.ceil(len(durations) * 0.99) - 1)] if durations else 0.0
+            result.append({
+                'statement': key,
+                'count': stats.count,
+                'total_ms': round(stats.total * 1000, 3),
+                'mean_ms': round(stats.total * 1000 / stats.count, 3),
+                'p99_ms': round(p99 * 1000, 3),
+                'max_ms': round(stats.max * 1000, 3),
+                'rows': stats.rows,
+                'slow': stats.slow,
+                'plan': stats.plan,
+            })
+        result.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return result[:limit] if limit else result
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to the connection's QueryStats once its rows are consumed"""
+
+    _sql: Optional[str] = None
+
+    def _start(self, sql: str, params):
+        self._finish()
+        self._sql = sql
+        self._params = params
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def _finish(self):
+        sql = self._sql
+        if sql is None:
+            return
+        self._sql = None
+        rows = self._rows if self.description else self.rowcount
+        stats = self.connection.query_stats
+        if stats.record(sql, self._elapsed, rows):
+            self._explain(stats, sql)
+
+    def _explain(self, stats: QueryStats, sql: str):
+        try:
+            plan = [row[3] for row in sqlite3.Connection.execute(
+                self.connection, f"EXPLAIN QUERY PLAN {sql}", self._params
+            )]
+        except sqlite3.Error:
+            plan = []
+        stats.set_plan(sql, plan)
+        logger.warning(f"Slow query ({self._elapsed * 1000:.1f} ms): {fingerprint(sql)} | plan: {'; '.join(plan)}")
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            if not self.description:
+                self._finish()
+
+    def executemany(self, sql, seq_of_parameters):
+        # The first row's parameters are kept to bind EXPLAIN QUERY PLAN if the batch is slow
+        rows = iter(seq_of_parameters)
+        first = next(rows, None)
+        self._start(sql, () if first is None else first)
+        if first is not None:
+            rows = itertools.chain([first], rows)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, rows)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        if len(rows) < (self.arraysize if size is None else size):
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - start
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Result sets read only partly (fetchone of a single row) are recorded here
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements run on InstrumentedCursors; open with sqlite3.connect(factory=...)"""
+
+    query_stats: QueryStats
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
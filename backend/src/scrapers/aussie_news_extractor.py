@@ -1,10 +1,10 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import logging
 import aiohttp
 
 from src.scrapers.base_extractor import BaseNewsExtractor
+from src.scrapers.url_filters import UrlFilterRules
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -66,12 +66,9 @@ class ABCNewsExtractor(BaseNewsExtractor):
             ]
         }
     
-    def get_article_links_from_category_page(self, soup: BeautifulSoup, category_url: str) -> List[str]:
-        """ABC News specific method to extract article links from category pages"""
-        article_links = set()
-
+    def get_link_selectors(self) -> List[str]:
         # Multiple selectors to catch different article types on ABC News
-        selectors = [
+        return [
             'a[href*="/news/"]',
             '.ContentHub_articles a',
             '.FeaturedContent_item a',
@@ -80,86 +77,49 @@ class ABCNewsExtractor(BaseNewsExtractor):
             '.Story_link'
         ]
 
-        for selector in selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href and '/news/' in href:
-                    full_url = urljoin(self.base_url, href)
-
-                    # Enhanced filtering for actual articles only
-                    if (self._is_valid_abc_article_url(full_url)):
-                        article_links.add(full_url)
-
-        return list(article_links)
+    def get_url_filter_rules(self) -> Dict[str, UrlFilterRules]:
+        return {
+            # Enhanced filtering for actual articles only
+            'links': UrlFilterRules(
+                # Skip non-article pages, anchor links and query parameters
+                exclude_substrings=(
+                    '/news/emergency', '/news/sport/', '/news/business/', '/news/health/',
+                    '/news/music/', '/news/tok-pisin', '/news/rural', '/news/analysis-and-opinion',
+                    '/news/corrections', '/news/contact', '/news/about', '/news/for-you',
+                    '/news/weather', '/news/radio', '/news/tv', '/topic/', '/categories/',
+                    '/news/entertainment/', '/news/politics/', '/news/science/', '/news/arts/',
+                    '/news/religion/', '/news/environment/', '#', '?'
+                ),
+                require_patterns=('/news/',),
+                include_patterns=(
+                    # Pattern: /news/YYYY-MM-DD/article-title/NNNNNNNN
+                    r'/news/\d{4}-\d{2}-\d{2}/[^/]+/\d+$',
+                    # A date path segment and a numeric ID of at least 6 digits
+                    r'/\d{4}-\d{2}-\d{2}[^/]*/(?:[^/]*/)*\d{6,}$'
+                )
+            ),
+            'article': UrlFilterRules(
+                exclude_substrings=('/topic/', '#'),
+                # Exclude known non-article slugs
+                exclude_suffixes=tuple('/' + slug for slug in (
+                    'tok-pisin', 'analysis-and-opinion', 'sport', 'business', 'health', 'music',
+                    'lifestyle', 'entertainment', 'politics', 'rural', 'science', 'arts', 'religion',
+                    'corrections', 'contact', 'about', 'editorial', 'weather', 'radio', 'tv', 'for-you',
+                    'ashes', 'rugby-league', 'environment', 'rugby-union-world-cup', 'nrl'
+                )),
+                require_patterns=(r'abc\.net\.au', r'/news/'),
+                include_patterns=(
+                    # Either numeric article ID (at least 8 digits)
+                    r'/\d{8,}$',
+                    # Or descriptive slug with at least 2 dashes and more than 8 characters
+                    r'/(?=[^/]*-[^/]*-)[^/]{9,}$'
+                )
+            )
+        }
 
     def _is_valid_abc_article_url(self, url: str) -> bool:
         """Enhanced URL validation for ABC News articles"""
-        import re
-
-        # Skip non-article pages
-        excluded_patterns = [
-            '/news/emergency', '/news/sport/', '/news/business/', '/news/health/',
-            '/news/music/', '/news/tok-pisin', '/news/rural', '/news/analysis-and-opinion',
-            '/news/corrections', '/news/contact', '/news/about', '/news/for-you',
-            '/news/weather', '/news/radio', '/news/tv', '/topic/', '/categories/',
-            '/news/entertainment/', '/news/politics/', '/news/science/', '/news/arts/',
-            '/news/religion/', '/news/environment/'
-        ]
-
-        # Check if URL contains any excluded patterns
-        for pattern in excluded_patterns:
-            if pattern in url:
-                return False
-
-        # Skip anchor links and query parameters
-        if '#' in url or '?' in url:
-            return False
-
-        # ABC article URLs typically have date patterns or numeric IDs
-        # Pattern: /news/YYYY-MM-DD/article-title/NNNNNNNN or similar
-        abc_article_pattern = r'/news/\d{4}-\d{2}-\d{2}/[^/]+/\d+$'
-
-        if re.search(abc_article_pattern, url):
-            return True
-
-        # Alternative pattern: URLs with substantive content slug and numeric ID
-        # Must have a meaningful slug (more than just category) and end with numbers
-        url_parts = url.split('/')
-        if len(url_parts) >= 5 and url_parts[-1].isdigit() and len(url_parts[-1]) >= 6:
-            # Check that the URL has date and title components
-            for part in url_parts:
-                if re.match(r'\d{4}-\d{2}-\d{2}', part):
-                    return True
-
-        return False
-
-    def validate_article_url(self, url: str) -> bool:
-        """ABC-specific URL validation"""
-        url_slug = url.split('/')[-1]
-
-        # Exclude known non-article patterns
-        excluded_patterns = [
-            'tok-pisin', 'analysis-and-opinion', 'sport', 'business', 'health', 'music',
-            'lifestyle', 'entertainment', 'politics', 'rural', 'science', 'arts', 'religion',
-            'corrections', 'contact', 'about', 'editorial', 'weather', 'radio', 'tv', 'for-you',
-            'ashes', 'rugby-league', 'environment', 'rugby-union-world-cup', 'nrl'
-        ]
-
-        # ABC News uses numeric article IDs or descriptive slugs
-        return (
-            'abc.net.au' in url and
-            '/news/' in url and
-            '/topic/' not in url and
-            '#' not in url and
-            url_slug not in excluded_patterns and
-            (
-                # Either numeric article ID (at least 8 digits)
-                (url_slug.isdigit() and len(url_slug) >= 8) or
-                # Or descriptive slug with dashes (at least 2 dashes for specificity)
-                ('-' in url_slug and url_slug.count('-') >= 2 and len(url_slug) > 8)
-            )
-        )
+        return self.is_valid_category_link(url)
 
 class GuardianAUExtractor(BaseNewsExtractor):
     """The Guardian Australia specific extractor"""
@@ -215,44 +175,31 @@ class GuardianAUExtractor(BaseNewsExtractor):
             ]
         }
     
-    def get_article_links_from_category_page(self, soup: BeautifulSoup, category_url: str) -> List[str]:
-        """Guardian AU specific method to extract article links"""
-        article_links = set()
-
-        selectors = [
+    def get_link_selectors(self) -> List[str]:
+        return [
             '.fc-item__link',
             '.u-faux-block-link__overlay',
             'a[data-link-name="article"]',
             '.headline-link'
         ]
 
-        for selector in selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    # Guardian uses relative URLs
-                    if href.startswith('/'):
-                        full_url = urljoin(self.base_url, href)
-                    else:
-                        full_url = href
-
-                    # Filter for Australian content and valid articles
-                    if ('/australia-news/' in full_url or '/music' in full_url or '/sport' in full_url or '/lifeandstyle' in full_url or '/business' in full_url) and len(full_url) > 50:
-                        article_links.add(full_url)
-
-        return list(article_links)
-    
-    def validate_article_url(self, url: str) -> bool:
-        """Guardian-specific URL validation"""
-        return (
-            'theguardian.com' in url and
-            any(path in url for path in ['/australia-news/', '/music/', '/sport/', '/lifeandstyle/', '/business/']) and
-            '/live/' not in url and  # Exclude live blogs
-            '/gallery/' not in url and  # Exclude photo galleries
-            '/series/' not in url and  # Exclude series pages
-            len(url.split('/')[-1]) > 10  # Ensure URL has a substantial article slug
-        )
+    def get_url_filter_rules(self) -> Dict[str, UrlFilterRules]:
+        return {
+            'links': UrlFilterRules(
+                include_patterns=(r'/australia-news/', r'/music', r'/sport', r'/lifeandstyle', r'/business'),
+                min_length=51
+            ),
+            'article': UrlFilterRules(
+                # Exclude live blogs, photo galleries and series pages
+                exclude_substrings=('/live/', '/gallery/', '/series/'),
+                require_patterns=(
+                    r'theguardian\.com',
+                    r'/(?:australia-news|music|sport|lifeandstyle|business)/',
+                    # Ensure URL has a substantial article slug
+                    r'/[^/]{11,}$'
+                )
+            )
+        }
 
 class NewsComAUExtractor(BaseNewsExtractor):
     """News.com.au specific extractor"""
@@ -311,12 +258,9 @@ class NewsComAUExtractor(BaseNewsExtractor):
             ]
         }
     
-    def get_article_links_from_category_page(self, soup: BeautifulSoup, category_url: str) -> List[str]:
-        """News.com.au specific method to extract article links"""
-        article_links = set()
-
+    def get_link_selectors(self) -> List[str]:
         # Updated selectors for current News.com.au structure
-        selectors = [
+        return [
             'a[href*="/news-story/"]',  # Current URL pattern
             'a[href*="/story/"]',       # Legacy pattern
             '.story-block a',
@@ -326,26 +270,22 @@ class NewsComAUExtractor(BaseNewsExtractor):
             '.headline a'               # Alternative headline links
         ]
 
-        for selector in selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    full_url = urljoin(self.base_url, href)
-                    if ('/news-story/' in full_url or '/story/' in full_url):
-                        article_links.add(full_url)
-
-        return list(article_links)
-    
-    def validate_article_url(self, url: str) -> bool:
-        """News.com.au specific URL validation"""
-        return (
-            'news.com.au' in url and
-            ('/news-story/' in url or '/story/' in url) and
-            len(url) > 50 and
-            any(path in url for path in ['/sport/', '/lifestyle/', '/entertainment/', '/finance/', '/business/']) and
-            not url.endswith('/')  # Avoid category pages
-        )
+    def get_url_filter_rules(self) -> Dict[str, UrlFilterRules]:
+        return {
+            'links': UrlFilterRules(
+                include_patterns=(r'/news-story/', r'/story/')
+            ),
+            'article': UrlFilterRules(
+                # Avoid category pages
+                exclude_suffixes=('/',),
+                require_patterns=(
+                    r'news\.com\.au',
+                    r'/(?:news-)?story/',
+                    r'/(?:sport|lifestyle|entertainment|finance|business)/'
+                ),
+                min_length=51
+            )
+        }
 
 class SMHExtractor(BaseNewsExtractor):
     """Sydney Morning Herald specific extractor"""
@@ -399,12 +339,9 @@ class SMHExtractor(BaseNewsExtractor):
             ]
         }
     
-    def get_article_links_from_category_page(self, soup: BeautifulSoup, category_url: str) -> List[str]:
-        """SMH specific method to extract article links"""
-        article_links = set()
-
+    def get_link_selectors(self) -> List[str]:
         # Updated selectors for current SMH website structure
-        selectors = [
+        return [
             'a[href*="/2025/"]',  # Current year articles
             'a[href*="/2024/"]',  # Recent articles
             'a[href*="-p5"]',     # SMH article ID pattern
@@ -413,80 +350,52 @@ class SMHExtractor(BaseNewsExtractor):
             '[data-component="Link"]'  # Component-based links
         ]
 
-        for selector in selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    full_url = urljoin(self.base_url, href)
-                    # Enhanced filtering for SMH URL patterns
-                    if self._is_valid_smh_article_url(full_url):
-                        article_links.add(full_url)
-
-        return list(article_links)
+    def get_url_filter_rules(self) -> Dict[str, UrlFilterRules]:
+        return {
+            # Enhanced filtering for SMH URL patterns
+            'links': UrlFilterRules(
+                # Skip URLs with query parameters or fragments
+                exclude_substrings=('?', '#'),
+                # Skip category pages themselves
+                exclude_suffixes=tuple(
+                    suffix
+                    for section in (
+                        '/sport', '/lifestyle', '/culture', '/business',
+                        '/politics', '/national', '/world', '/technology',
+                        '/property', '/environment', '/entertainment'
+                    )
+                    for suffix in (section + '/', section)
+                ) + (
+                    '/subscribe', '/premium', '/plus', '/account',
+                    '/newsletters', '/contact', '/about'
+                ),
+                # SMH article URLs should contain one of our categories
+                require_patterns=(r'/(?:sport|lifestyle|culture|business)/',),
+                include_patterns=(
+                    r'/\d{4}/\d{2}/\d{2}/[^/]+-p5[a-z0-9]+\.html$',  # Standard date pattern
+                    r'/[^/]+-p5[a-z0-9]+-h2[a-z0-9]+\.html$',        # Article with hash
+                    r'/\d{8}/[^/]+-p5[a-z0-9]+\.html$',              # Compact date format
+                    r'/[^/]+-p5[a-z0-9]+\.html$',                     # Simple article pattern
+                    r'^(?=.{51}).*/202[4-5]/'                         # Recent articles with date indicators
+                )
+            ),
+            'article': UrlFilterRules(
+                # Avoid category pages and skip live blog pages for now
+                exclude_substrings=('live-updates',),
+                exclude_suffixes=('/',),
+                require_patterns=(
+                    r'smh\.com\.au',
+                    r'-p5|/20',  # SMH article patterns
+                    r'/(?:sport|lifestyle|culture|business)/'
+                ),
+                min_length=51
+            )
+        }
 
     def _is_valid_smh_article_url(self, url: str) -> bool:
         """Enhanced URL validation for SMH articles"""
-        import re
+        return self.is_valid_category_link(url)
 
-        # Skip non-article pages
-        excluded_patterns = [
-            '/sport/', '/lifestyle/', '/culture/', '/business/',  # Category pages themselves
-            '/politics/', '/national/', '/world/', '/technology/',
-            '/property/', '/environment/', '/entertainment/',
-            '/subscribe', '/premium', '/plus', '/account',
-            '/newsletters', '/contact', '/about'
-        ]
-
-        # Check if URL is a category page (exact match)
-        for pattern in excluded_patterns:
-            if url.endswith(pattern) or url.endswith(pattern.rstrip('/')):
-                return False
-
-        # Skip URLs with query parameters or fragments
-        if '?' in url or '#' in url:
-            return False
-
-        # SMH article URLs should contain category and have proper article structure
-        valid_categories = ['/sport/', '/lifestyle/', '/culture/', '/business/']
-        has_valid_category = any(cat in url for cat in valid_categories)
-
-        if not has_valid_category:
-            return False
-
-        # SMH article URLs typically have specific patterns:
-        # 1. /category/YYYY/MM/DD/article-title-p5XXXXXXX.html
-        # 2. /category/article-title-p5XXXXXXX-h2YYYYYY.html
-        # 3. /category/YYYYMMDD/article-title-p5XXXXXXX.html
-
-        smh_patterns = [
-            r'/\d{4}/\d{2}/\d{2}/[^/]+-p5[a-z0-9]+\.html$',  # Standard date pattern
-            r'/[^/]+-p5[a-z0-9]+-h2[a-z0-9]+\.html$',        # Article with hash
-            r'/\d{8}/[^/]+-p5[a-z0-9]+\.html$',              # Compact date format
-            r'/[^/]+-p5[a-z0-9]+\.html$'                     # Simple article pattern
-        ]
-
-        for pattern in smh_patterns:
-            if re.search(pattern, url):
-                return True
-
-        # Alternative: check for recent articles with date indicators
-        if re.search(r'/(202[4-5]|2025)/', url) and len(url) > 50:
-            return True
-
-        return False
-
-    def validate_article_url(self, url: str) -> bool:
-        """SMH-specific URL validation"""
-        return (
-            'smh.com.au' in url and
-            ('-p5' in url or '/20' in url) and  # SMH article patterns
-            any(path in url for path in ['/sport/', '/lifestyle/', '/culture/', '/business/']) and
-            len(url) > 50 and
-            not url.endswith('/') and  # Avoid category pages
-            'live-updates' not in url  # Skip live blog pages for now
-        )
-    
 
 class ExtractorFactory:
     """Factory class for creating news extractors"""
@@ -6,11 +6,15 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 import re
+import time
 
 
 from src.models.news_model import NewsArticle
+from src.scrapers.html_stream import MAX_PAGE_BYTES, ContentBoundaryTracker, read_html
+from src.scrapers.link_harvester import Anchor, AnchorCollector, anchors_from_soup, parse_selector
+from src.scrapers.url_filters import UrlFilter, UrlFilterRules
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +40,11 @@ class BaseNewsExtractor(ABC):
         self.category_urls = self.get_category_urls()
         self.selectors = self.get_selectors()
         self.headers = self.get_default_headers()
+        self.url_filters = {
+            stage: UrlFilter(rules) for stage, rules in self.get_url_filter_rules().items()
+        }
+        self.link_selectors = [parse_selector(selector) for selector in self.get_link_selectors()]
+        self.max_page_bytes = MAX_PAGE_BYTES
 
     def get_default_headers(self) -> Dict[str, str]:
         """Return default headers for requests"""
@@ -69,13 +78,79 @@ class BaseNewsExtractor(ABC):
         """Return CSS selectors for extracting different elements"""
         pass
     
-    @abstractmethod
+    def get_link_selectors(self) -> List[str]:
+        """
+        Return CSS selectors for article links on category pages - can be overridden.
+
+        Selectors are evaluated against harvested anchors, so only the subset
+        supported by link_harvester can be used (descendant combinators, tag,
+        #id, .class and attribute conditions).
+        """
+        return ['a[href]']
+
+    def get_article_links(self, anchors: List[Anchor], category_url: str) -> List[str]:
+        """Select, resolve and filter article links from harvested anchors"""
+        article_links = {}
+        seen_hrefs = set()
+
+        for anchor in anchors:
+            href = anchor.href
+            if href in seen_hrefs:
+                continue
+            if not any(selector.matches(anchor) for selector in self.link_selectors):
+                continue
+
+            # Each distinct href is resolved and validated once
+            seen_hrefs.add(href)
+            full_url = urljoin(self.base_url, href)
+            if full_url not in article_links and self.is_valid_category_link(full_url):
+                article_links[full_url] = None
+
+        # Keys keep document order
+        return list(article_links)
+
     def get_article_links_from_category_page(self, soup: BeautifulSoup, category_url: str) -> List[str]:
-        """Extract article links from category page - source-specific implementation"""
-        pass
-    
+        """Extract article links from an already parsed category page"""
+        return self.get_article_links(anchors_from_soup(soup), category_url)
+
+    async def _read_article_links(self, response, category_url: str) -> Optional[List[str]]:
+        """Stream a category page and extract its article links in a single pass"""
+        if type(self).get_article_links_from_category_page is not BaseNewsExtractor.get_article_links_from_category_page:
+            # Subclass still works on a parsed document
+            html = await read_html(response, max_bytes=self.max_page_bytes)
+            if html is None:
+                return None
+            return self.get_article_links_from_category_page(BeautifulSoup(html, 'html.parser'), category_url)
+
+        collector = AnchorCollector()
+        if await read_html(response, collector, self.max_page_bytes, keep_text=False) is None:
+            return None
+        return self.get_article_links(collector.anchors, category_url)
+
+    def get_url_filter_rules(self) -> Dict[str, UrlFilterRules]:
+        """
+        Return URL filter rules by stage - can be overridden.
+
+        Supported stages are 'links' (applied to links found on category pages)
+        and 'article' (applied by validate_article_url before fetching).
+        """
+        return {}
+
+    def is_valid_category_link(self, url: str) -> bool:
+        """Check a category page link against the 'links' filter rules"""
+        link_filter = self.url_filters.get('links')
+        return link_filter.accepts(url) if link_filter else True
+
+    def get_url_filter_stats(self) -> Dict[str, Dict]:
+        """Get per-rule rejection counts for each URL filter stage"""
+        return {stage: url_filter.get_stats() for stage, url_filter in self.url_filters.items()}
+
     def validate_article_url(self, url: str) -> bool:
         """Validate if URL is a valid article URL for this source"""
+        article_filter = self.url_filters.get('article')
+        if article_filter:
+            return article_filter.accepts(url)
+
         # Default implementation - can be overridden
         parsed_url = urlparse(url)
         url_slug = url.split('/')[-1]
@@ -142,16 +217,22 @@ class BaseNewsExtractor(ABC):
                     logger.error(f"Failed to fetch {category_url}: {response.status}")
                     return []
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Get article links using source-specific method
-                article_links = self.get_article_links_from_category_page(soup, category_url)
+                # Get article links using source-specific selectors and rules
+                started = time.perf_counter()
+                article_links = await self._read_article_links(response, category_url)
+                if article_links is None:
+                    return []
+                logger.debug(
+                    f"Harvested {len(article_links)} links from {category_url} "
+                    f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+                )
                 
                 # Validate and limit articles
                 valid_links = []
                 for link in article_links:
-                    if self.validate_article_url(link) and len(valid_links) < max_articles:
+                    if len(valid_links) >= max_articles:
+                        break
+                    if self.validate_article_url(link):
                         valid_links.append(link)
                 
                 logger.info(f"Found {len(valid_links)} valid article links for {category} from {self.source}")
@@ -181,8 +262,12 @@ class BaseNewsExtractor(ABC):
                 if response.status != 200:
                     logger.debug(f"Failed to fetch article {url}: {response.status}")
                     return None
-                
-                html = await response.text()
+
+                # Stop downloading once the content containers have been read
+                tracker = ContentBoundaryTracker(self.selectors.get('content', ['article', 'main']))
+                html = await read_html(response, tracker, self.max_page_bytes)
+                if html is None:
+                    return None
                 soup = BeautifulSoup(html, 'html.parser')
                 
                 # Extract article data using selectors
@@ -0,0 +1,190 @@
+"""
+Streaming HTML reads for news extractors.
+
+Pages are read chunk by chunk from the response, decoded incrementally and
+fed to an incremental parser. Reading stops as soon as the parser reports
+that it has seen everything it needs, and a hard byte cap aborts oversized
+responses, so neither the full body nor its decoded copy has to be held
+before parsing starts.
+"""
+
+import codecs
+import logging
+from html.parser import HTMLParser
+from typing import List, Optional, Sequence
+
+from src.scrapers.link_harvester import VOID_ELEMENTS, Element, LinkSelector, parse_selector
+
+logger = logging.getLogger(__name__)
+
+# Hard cap on the bytes read from a single page
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+# Size of the chunks read from the response stream
+STREAM_CHUNK_SIZE = 64 * 1024
+# Text required inside the content containers before reading can stop
+MIN_CONTENT_LENGTH = 200
+# Elements that enclose a whole article body
+CONTAINER_TAGS = ('article', 'main')
+
+
+class ContentBoundaryTracker(HTMLParser):
+    """
+    Incremental parser that detects when the article content has been read.
+
+    The content selectors are matched against elements as they open. The
+    first match opens a content scope: the element matching the selector's
+    first compound (e.g. the [data-component="Text"] container for
+    '[data-component="Text"] p'). Selectors such as SMH's
+    [data-component="TextBlock"] match a run of sibling blocks, so reading
+    continues until the scope's enclosing container closes: its nearest
+    article or main ancestor, or else its parent element. Once that closes
+    with enough text inside matched containers, `done` is set and the rest
+    of the page can be skipped.
+    """
+
+    def __init__(self, selectors: Sequence[str], min_text_length: int = MIN_CONTENT_LENGTH):
+        super().__init__(convert_charrefs=True)
+        self.selectors: List[LinkSelector] = []
+        for selector in selectors:
+            try:
+                self.selectors.append(parse_selector(selector))
+            except ValueError:
+                # Unsupported selectors only disable early termination for themselves
+                logger.debug(f"Content selector not tracked while streaming: {selector}")
+
+        self.min_text_length = min_text_length
+        self.text_length = 0
+        self.done = False
+        self._stack: List[Element] = []
+        # Stack depths of the element enclosing the open content scope and of the outermost matched container
+        self._container_depth: Optional[int] = None
+        self._content_depth: Optional[int] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+
+        element = Element.from_attrs(tag, attrs)
+        depth = len(self._stack)
+
+        for selector in self.selectors:
+            if selector.matches_element(element, self._stack):
+                if self._content_depth is None:
+                    self._content_depth = depth
+                if self._container_depth is None:
+                    self._container_depth = self._find_container_depth(
+                        self._find_scope_depth(selector, depth), element
+                    )
+                break
+
+        self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+
+        # Pop back to the matching open element; stray end tags are ignored
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                break
+        else:
+            return
+
+        depth = len(self._stack)
+        if self._content_depth is not None and depth <= self._content_depth:
+            self._content_depth = None
+        if self._container_depth is not None and depth <= self._container_depth:
+            if self.text_length >= self.min_text_length:
+                self.done = True
+            else:
+                # Too little text so far (e.g. a teaser block), keep reading
+                self._container_depth = None
+
+    def handle_data(self, data):
+        if self._content_depth is None or self.done:
+            return
+        if self._stack and self._stack[-1].tag in ('script', 'style'):
+            return
+        self.text_length += len(data.strip())
+
+    def _find_scope_depth(self, selector: LinkSelector, depth: int) -> int:
+        """Stack depth of the outermost element matching the selector's first compound"""
+        if len(selector.compounds) == 1:
+            return depth
+        first = selector.compounds[0]
+        for index, ancestor in enumerate(self._stack):
+            if first.matches(ancestor):
+                return index
+        return depth
+
+    def _find_container_depth(self, scope_depth: int, element: Element) -> int:
+        """Stack depth of the element whose closing ends the content that started at scope_depth"""
+        path = self._stack[:scope_depth] + [self._stack[scope_depth] if scope_depth < len(self._stack) else element]
+        for index in range(len(path) - 1, -1, -1):
+            if path[index].tag in CONTAINER_TAGS:
+                return index
+        # Further blocks may follow as siblings, so wait for the parent to close
+        return max(scope_depth - 1, 0)
+
+
+def _response_charset(response) -> str:
+    """Charset declared by the response, falling back to UTF-8"""
+    charset = getattr(response, 'charset', None) or 'utf-8'
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return 'utf-8'
+    return charset
+
+
+async def read_html(response, parser: Optional[HTMLParser] = None, max_bytes: int = MAX_PAGE_BYTES,
+                    keep_text: bool = True) -> Optional[str]:
+    """
+    Stream a response body into an incremental parser.
+
+    Stops early once the parser sets a truthy `done` attribute. Returns the
+    decoded text read so far (empty when keep_text is False), or None when
+    the page exceeds max_bytes.
+    """
+    content_length = response.content_length
+    if content_length is not None and content_length > max_bytes:
+        logger.warning(f"Skipping {response.url}: {content_length} bytes exceeds the {max_bytes} byte cap")
+        return None
+
+    decoder = codecs.getincrementaldecoder(_response_charset(response))(errors='replace')
+    parts = []
+    received = 0
+    stopped_early = False
+
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        received += len(chunk)
+        if received > max_bytes:
+            logger.warning(f"Aborting {response.url}: more than {max_bytes} bytes")
+            return None
+
+        text = decoder.decode(chunk)
+        if keep_text:
+            parts.append(text)
+        if parser is not None:
+            parser.feed(text)
+            if getattr(parser, 'done', False):
+                stopped_early = True
+                break
+
+    if stopped_early:
+        logger.debug(f"Stopped reading {response.url} after {received} bytes")
+    else:
+        text = decoder.decode(b'', final=True)
+        if keep_text:
+            parts.append(text)
+        if parser is not None:
+            parser.feed(text)
+            parser.close()
+
+    return ''.join(parts)
@@ -0,0 +1,214 @@
+"""
+Single-pass link harvesting for category pages.
+
+Category pages are scanned once with the standard library HTML parser to
+collect every <a href> together with its ancestor chain, without building a
+document tree. Link selectors are compiled from a small CSS subset into
+predicates that are evaluated against the harvested anchors.
+
+Supported selector syntax: descendant combinators (whitespace) between
+compound selectors made of an optional tag name, #id, .class and attribute
+conditions ([attr], [attr="v"], [attr*="v"], [attr^="v"], [attr$="v"],
+[attr~="v"]).
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Elements that never have children, so they are never pushed on the stack
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+})
+
+
+@dataclass(frozen=True, eq=False)
+class Element:
+    """An element as seen by the selectors: tag name, attributes and classes"""
+    tag: str
+    attrs: Dict[str, str]
+    classes: frozenset
+
+    @classmethod
+    def from_attrs(cls, tag: str, attrs: Iterable[Tuple[str, Optional[str]]]) -> 'Element':
+        attr_dict = {name: (value if value is not None else '') for name, value in attrs}
+        return cls(tag, attr_dict, frozenset(attr_dict.get('class', '').split()))
+
+
+@dataclass(frozen=True, eq=False)
+class Anchor:
+    """A harvested <a href> with its ancestors (outermost first)"""
+    href: str
+    element: Element
+    ancestors: Tuple[Element, ...]
+
+
+# Compound selector parsing
+_TOKEN = re.compile(
+    r'(?P<tag>^[a-zA-Z][a-zA-Z0-9-]*|^\*)'
+    r'|\.(?P<cls>[-\w]+)'
+    r'|#(?P<id>[-\w]+)'
+    r'|\[\s*(?P<attr>[-\w:]+)\s*(?:(?P<op>[*^$~]?=)\s*(?P<quote>["\']?)(?P<value>.*?)(?P=quote))?\s*\]'
+)
+
+
+@dataclass(frozen=True)
+class CompoundSelector:
+    """A single compound selector such as a.Card_link[href*="/news/"]"""
+    tag: Optional[str] = None
+    classes: frozenset = frozenset()
+    attrs: Tuple[Tuple[str, Optional[str], Optional[str]], ...] = ()
+
+    def matches(self, element: Element) -> bool:
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        if self.classes and not self.classes <= element.classes:
+            return False
+        for name, op, value in self.attrs:
+            actual = element.attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and value not in actual:
+                return False
+            if op == '^=' and not actual.startswith(value):
+                return False
+            if op == '$=' and not actual.endswith(value):
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+        return True
+
+
+def _parse_compound(text: str) -> CompoundSelector:
+    tag = None
+    classes = set()
+    attrs = []
+    position = 0
+
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported selector syntax: {text!r}")
+        if match.group('tag'):
+            tag = None if match.group('tag') == '*' else match.group('tag').lower()
+        elif match.group('cls'):
+            classes.add(match.group('cls'))
+        elif match.group('id'):
+            attrs.append(('id', '=', match.group('id')))
+        else:
+            attrs.append((match.group('attr').lower(), match.group('op'), match.group('value')))
+        position = match.end()
+
+    return CompoundSelector(tag=tag, classes=frozenset(classes), attrs=tuple(attrs))
+
+
+@dataclass(frozen=True)
+class LinkSelector:
+    """A compiled selector; the last compound must match the anchor itself"""
+    selector: str
+    compounds: Tuple[CompoundSelector, ...]
+
+    def matches(self, anchor: Anchor) -> bool:
+        return self.matches_element(anchor.element, anchor.ancestors)
+
+    def matches_element(self, element: Element, ancestors: Sequence[Element]) -> bool:
+        """Match an element given its ancestors (outermost first)"""
+        *ancestor_compounds, target = self.compounds
+        if not target.matches(element):
+            return False
+
+        # Descendant combinators: match the remaining compounds right to left
+        # against the ancestor chain, innermost ancestor first.
+        index = len(ancestors) - 1
+        for compound in reversed(ancestor_compounds):
+            while index >= 0 and not compound.matches(ancestors[index]):
+                index -= 1
+            if index < 0:
+                return False
+            index -= 1
+        return True
+
+
+@lru_cache(maxsize=None)
+def parse_selector(selector: str) -> LinkSelector:
+    """Compile a CSS selector from the supported subset (cached per selector)"""
+    parts = selector.split()
+    if not parts:
+        raise ValueError("Empty selector")
+    return LinkSelector(selector, tuple(_parse_compound(part) for part in parts))
+
+
+class AnchorCollector(HTMLParser):
+    """
+    Incremental HTML parser that collects anchors in one pass.
+
+    Text content is never accumulated, so feeding a large page costs only
+    the tokenisation. Can be fed chunk by chunk.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.anchors: List[Anchor] = []
+        self._stack: List[Element] = []
+
+    def handle_starttag(self, tag, attrs):
+        element = Element.from_attrs(tag, attrs)
+
+        if tag == 'a':
+            href = element.attrs.get('href', '').strip()
+            if href:
+                self.anchors.append(Anchor(href, element, tuple(self._stack)))
+
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching open element; stray end tags are ignored
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+
+def harvest_anchors(html: str) -> List[Anchor]:
+    """Collect every <a href> of a page in a single pass"""
+    collector = AnchorCollector()
+    collector.feed(html)
+    collector.close()
+    return collector.anchors
+
+
+def anchors_from_soup(soup) -> List[Anchor]:
+    """Build anchors from an already parsed BeautifulSoup document"""
+    anchors = []
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '').strip()
+        if not href:
+            continue
+        ancestors = tuple(
+            Element.from_attrs(parent.name, _soup_attrs(parent))
+            for parent in reversed(list(link.parents))
+            if parent.name and parent.name != '[document]'
+        )
+        anchors.append(Anchor(href, Element.from_attrs('a', _soup_attrs(link)), ancestors))
+    return anchors
+
+
+def _soup_attrs(tag) -> List[Tuple[str, str]]:
+    # BeautifulSoup returns multi-valued attributes such as class as lists
+    return [
+        (name, ' '.join(value) if isinstance(value, list) else value)
+        for name, value in tag.attrs.items()
+    ]
@@ -0,0 +1,212 @@
+"""
+Compiled URL filter rules for news extractors.
+
+Each extractor declares its include/exclude rules as data (UrlFilterRules).
+The rules are compiled once per distinct rule set into a small number of
+combined regular expressions, so validating a URL is a single pass per rule
+group instead of a Python loop over every pattern.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class UrlFilterRules:
+    """Declarative URL filter rules for one validation stage of a source."""
+    # Plain substrings that reject the URL when present anywhere
+    exclude_substrings: Tuple[str, ...] = ()
+    # Suffixes that reject the URL when it ends with them
+    exclude_suffixes: Tuple[str, ...] = ()
+    # Regular expressions that reject the URL when they match
+    exclude_patterns: Tuple[str, ...] = ()
+    # Regular expressions that must all match
+    require_patterns: Tuple[str, ...] = ()
+    # Regular expressions of which at least one must match (ignored if empty)
+    include_patterns: Tuple[str, ...] = ()
+    # Minimum URL length in characters
+    min_length: int = 0
+
+
+@dataclass(frozen=True)
+class _CompiledRules:
+    """Compiled form of UrlFilterRules, shared by every filter using the same rules."""
+    exclude: Optional[Pattern]
+    exclude_substrings: frozenset
+    exclude_suffixes: frozenset
+    exclude_each: Tuple[Tuple[str, Pattern], ...]
+    require_literals: Tuple[str, ...]
+    require: Optional[Pattern]
+    require_each: Tuple[Tuple[str, Pattern], ...]
+    include: Optional[Pattern]
+    min_length: int
+
+
+def _literal_trie_pattern(literals: Sequence[str], prefix_closed: bool = True) -> str:
+    """
+    Build a regex matching any of the literals, factored as a prefix trie.
+
+    The trie form lets the regex engine reject most positions on the first
+    character instead of trying every alternative in turn. For substring
+    searches (prefix_closed) a literal that is a prefix of another one makes
+    the longer literal redundant, so it ends the branch; anchored suffixes
+    need both branches kept.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        if is_end and (prefix_closed or len(node) == 1):
+            return ''
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+def _as_literal(pattern: str) -> Optional[str]:
+    """Return the plain string a pattern matches if it has no regex syntax, else None"""
+    unescaped = re.sub(r'\\(\W)', r'\1', pattern)
+    return unescaped if re.escape(unescaped) == pattern else None
+
+
+def _alternation(patterns: Sequence[str]) -> Optional[Pattern]:
+    """Combine patterns into one non-capturing alternation"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f"(?:{pattern})" for pattern in patterns))
+
+
+@lru_cache(maxsize=None)
+def compile_rules(rules: UrlFilterRules) -> _CompiledRules:
+    """Compile a rule set into combined regular expressions (cached per rule set)."""
+    # Every exclusion rule goes into one combined search; the matched text is
+    # enough to tell which rule fired for substring and suffix rules.
+    exclusions = []
+    substrings = [literal for literal in rules.exclude_substrings if literal]
+    if substrings:
+        exclusions.append(_literal_trie_pattern(substrings))
+    suffixes = [suffix for suffix in rules.exclude_suffixes if suffix]
+    if suffixes:
+        exclusions.append(f"(?:{_literal_trie_pattern(suffixes, prefix_closed=False)})$")
+    exclusions.extend(rules.exclude_patterns)
+
+    # Literal requirements are plain substring checks; the remaining required
+    # patterns are checked in one match using lookaheads. The individual
+    # patterns are only used to attribute a rejection.
+    require_literals = []
+    require_patterns = []
+    for pattern in rules.require_patterns:
+        literal = _as_literal(pattern)
+        if literal is not None:
+            require_literals.append(literal)
+        else:
+            require_patterns.append(pattern)
+
+    require = None
+    if require_patterns:
+        require = re.compile("^" + "".join(f"(?=.*?(?:{p}))" for p in require_patterns))
+
+    return _CompiledRules(
+        exclude=_alternation(exclusions),
+        exclude_substrings=frozenset(substrings),
+        exclude_suffixes=frozenset(suffixes),
+        exclude_each=tuple((f"pattern:{p}", re.compile(p)) for p in rules.exclude_patterns),
+        require_literals=tuple(require_literals),
+        require=require,
+        require_each=tuple((f"require:{p}", re.compile(p)) for p in require_patterns),
+        include=_alternation(rules.include_patterns),
+        min_length=rules.min_length
+    )
+
+
+class UrlFilter:
+    """
+    Validates URLs against compiled rules and keeps per-rule rejection counts.
+    """
+
+    def __init__(self, rules: UrlFilterRules):
+        self.rules = rules
+        self._compiled = compile_rules(rules)
+        self.checked = 0
+        self.accepted = 0
+        self.rejections = Counter()
+
+    def rejection_reason(self, url: str) -> Optional[str]:
+        """Return the label of the rule rejecting the URL, or None if it is accepted"""
+        compiled = self._compiled
+
+        if len(url) < compiled.min_length:
+            return "min_length"
+
+        for literal in compiled.require_literals:
+            if literal not in url:
+                return f"require:{literal}"
+
+        if compiled.require is not None and not compiled.require.match(url):
+            for label, pattern in compiled.require_each:
+                if not pattern.search(url):
+                    return label
+
+        if compiled.exclude is not None:
+            match = compiled.exclude.search(url)
+            if match:
+                return self._exclusion_label(url, match.group(0))
+
+        if compiled.include is not None and not compiled.include.search(url):
+            return "no_include_match"
+
+        return None
+
+    def _exclusion_label(self, url: str, matched: str) -> str:
+        """Attribute an exclusion match to the rule that produced it"""
+        compiled = self._compiled
+        if matched in compiled.exclude_substrings:
+            return f"exclude:{matched}"
+        if matched in compiled.exclude_suffixes and url.endswith(matched):
+            return f"suffix:{matched}"
+        for label, pattern in compiled.exclude_each:
+            if pattern.search(url):
+                return label
+        return "exclude"
+
+    def accepts(self, url: str) -> bool:
+        """Check a URL and record the outcome"""
+        self.checked += 1
+        reason = self.rejection_reason(url)
+        if reason is None:
+            self.accepted += 1
+            return True
+
+        self.rejections[reason] += 1
+        return False
+
+    def filter(self, urls: Sequence[str]) -> List[str]:
+        """Return the URLs accepted by this filter, preserving order"""
+        return [url for url in urls if self.accepts(url)]
+
+    def get_stats(self) -> Dict:
+        """Get counts of checked, accepted and rejected URLs by rule"""
+        return {
+            'checked': self.checked,
+            'accepted': self.accepted,
+            'rejected': self.checked - self.accepted,
+            'rejections_by_rule': dict(self.rejections.most_common())
+        }
+
+    def reset_stats(self):
+        """Reset all counters"""
+        self.checked = 0
+        self.accepted = 0
+        self.rejections.clear()
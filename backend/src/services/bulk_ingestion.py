@@ -0,0 +1,297 @@
+"""
+Bulk ingestion of externally scraped articles.
+
+Accepts NDJSON (one NewsArticle-shaped JSON object per line), parses the
+records incrementally as the bytes arrive, classifies them in batches with
+HybridClassifier and writes each batch in a single transaction.
+
+Usage:
+    python -m src.services.bulk_ingestion articles.ndjson [--db news_database.db] [--batch-size 1000]
+    cat articles.ndjson | python -m src.services.bulk_ingestion -
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.db.database_conn import NewsDatabase, article_content_hash, get_database
+from src.models.news_model import NewsArticle
+from src.services.categorization.hybrid_classifier import HybridClassifier
+
+logger = logging.getLogger(__name__)
+
+# Records classified and written per transaction
+DEFAULT_BATCH_SIZE = 1000
+# Longest accepted NDJSON line; longer records are rejected without buffering them
+MAX_RECORD_BYTES = 2 * 1024 * 1024
+# Error messages kept in the ingestion results
+MAX_REPORTED_ERRORS = 100
+
+REQUIRED_FIELDS = ('title', 'url', 'source')
+ARTICLE_FIELDS = tuple(field.name for field in fields(NewsArticle))
+
+
+class NdjsonLineSplitter:
+    """
+    Splits a byte stream into NDJSON lines as chunks arrive.
+
+    Only the current incomplete line is buffered. Lines longer than
+    max_line_bytes are discarded and reported as None.
+    """
+
+    def __init__(self, max_line_bytes: int = MAX_RECORD_BYTES):
+        self.max_line_bytes = max_line_bytes
+        self._buffer = bytearray()
+        self._oversized = False
+
+    def feed(self, chunk: bytes) -> Iterator[Optional[bytes]]:
+        """Yield every line completed by this chunk (None for oversized lines)"""
+        start = 0
+        while True:
+            end = chunk.find(b'\n', start)
+            if end < 0:
+                break
+            yield self._complete(chunk[start:end])
+            start = end + 1
+        self._append(chunk[start:])
+
+    def close(self) -> Iterator[Optional[bytes]]:
+        """Yield the trailing line if the stream does not end with a newline"""
+        if self._buffer or self._oversized:
+            yield self._complete(b'')
+
+    def _append(self, data: bytes):
+        if self._oversized:
+            return
+        if len(self._buffer) + len(data) > self.max_line_bytes:
+            self._buffer.clear()
+            self._oversized = True
+        else:
+            self._buffer.extend(data)
+
+    def _complete(self, data: bytes) -> Optional[bytes]:
+        self._append(data)
+        if self._oversized:
+            line = None
+        else:
+            line = bytes(self._buffer)
+        self._buffer.clear()
+        self._oversized = False
+        return line
+
+
+def parse_record(line: bytes) -> NewsArticle:
+    """Build a NewsArticle from one NDJSON line, raising ValueError if it is invalid"""
+    try:
+        record = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid JSON: {e}")
+
+    if not isinstance(record, dict):
+        raise ValueError("record is not a JSON object")
+
+    missing = [name for name in REQUIRED_FIELDS if not isinstance(record.get(name), str) or not record[name].strip()]
+    if missing:
+        raise ValueError(f"missing required fields: {', '.join(missing)}")
+
+    tags = record.get('tags') or []
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+    if not isinstance(tags, list):
+        raise ValueError("tags must be a list or a comma separated string")
+
+    values = {}
+    for name in ARTICLE_FIELDS:
+        value = record.get(name)
+        if name == 'tags':
+            values[name] = [str(tag) for tag in tags]
+        elif value is None:
+            values[name] = ""
+        elif isinstance(value, str):
+            values[name] = value.strip() if name in REQUIRED_FIELDS else value
+        else:
+            raise ValueError(f"field '{name}' must be a string")
+
+    if not values['extracted_at']:
+        values['extracted_at'] = datetime.now().isoformat()
+
+    return NewsArticle(**values)
+
+
+class BulkIngestionService:
+    """Service for loading NDJSON article records in large batches"""
+
+    def __init__(self, db: NewsDatabase = None, classifier: HybridClassifier = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db or get_database()
+        self.classifier = classifier or HybridClassifier()
+        self.batch_size = batch_size
+
+    def _new_results(self) -> Dict[str, Any]:
+        return {
+            'total_records': 0,
+            'accepted': 0,
+            'rejected': 0,
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'by_category': {},
+            'ingestion_time': 0.0,
+            'errors': []
+        }
+
+    def _reject(self, results: Dict[str, Any], line_number: int, reason: str):
+        results['rejected'] += 1
+        if len(results['errors']) < MAX_REPORTED_ERRORS:
+            results['errors'].append(f"line {line_number}: {reason}")
+
+    def _accept_line(self, results: Dict[str, Any], batch: List[Tuple[int, NewsArticle]],
+                     line_number: int, line: Optional[bytes]):
+        """Parse one line into the pending batch, recording rejections"""
+        if line is None:
+            results['total_records'] += 1
+            self._reject(results, line_number, f"record larger than {MAX_RECORD_BYTES} bytes")
+            return
+        if not line.strip():
+            return
+
+        results['total_records'] += 1
+        try:
+            batch.append((line_number, parse_record(line)))
+        except ValueError as e:
+            self._reject(results, line_number, str(e))
+
+    def _flush_batch(self, results: Dict[str, Any], batch: List[Tuple[int, NewsArticle]]):
+        """Classify a batch and write it in one transaction"""
+        if not batch:
+            return
+
+        # Records already stored with the same content are not classified or written again
+        stored_hashes = self.db.get_content_hashes([article.url for _, article in batch])
+        changed = []
+        for line_number, article in batch:
+            if stored_hashes.get(article.url) == article_content_hash(article):
+                results['accepted'] += 1
+                results['unchanged'] += 1
+            else:
+                changed.append((line_number, article))
+        batch.clear()
+        if not changed:
+            return
+
+        articles = [article for _, article in changed]
+        classification_results = []
+        for article in articles:
+            try:
+                result = self.classifier.classify(article)
+            except Exception as e:
+                logger.error(f"Error classifying article '{article.title[:50]}...': {e}")
+                result = None
+
+            # Records without a category always take the classifier's answer
+            if result and (result.confidence >= self.classifier.confidence_threshold or not article.category):
+                article.category = result.category
+            elif not article.category:
+                article.category = 'unknown'
+            classification_results.append(result)
+
+        outcomes = self.db.save_articles_bulk(articles, classification_results)
+
+        for (line_number, article), outcome in zip(changed, outcomes):
+            if outcome == 'failed':
+                self._reject(results, line_number, "database write failed")
+                continue
+            results['accepted'] += 1
+            results[outcome] += 1
+            if outcome != 'unchanged':
+                results['by_category'][article.category] = results['by_category'].get(article.category, 0) + 1
+
+    def ingest_lines(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """Ingest NDJSON from an iterable of byte chunks (e.g. a binary file)"""
+        start_time = time.time()
+        results = self._new_results()
+        splitter = NdjsonLineSplitter()
+        batch = []
+        line_number = 0
+
+        for chunk in chunks:
+            for line in splitter.feed(chunk):
+                line_number += 1
+                self._accept_line(results, batch, line_number, line)
+                if len(batch) >= self.batch_size:
+                    self._flush_batch(results, batch)
+
+        for line in splitter.close():
+            line_number += 1
+            self._accept_line(results, batch, line_number, line)
+        self._flush_batch(results, batch)
+
+        results['ingestion_time'] = time.time() - start_time
+        logger.info(f"Bulk ingestion finished: {results['accepted']} accepted, {results['rejected']} rejected")
+        return results
+
+    async def ingest_stream(self, chunks: AsyncIterable[bytes]) -> Dict[str, Any]:
+        """
+        Ingest NDJSON from an async byte stream (e.g. a request body).
+
+        Classification and database writes run in a worker thread so the
+        event loop keeps serving requests while a batch is flushed.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        results = self._new_results()
+        splitter = NdjsonLineSplitter()
+        batch = []
+        line_number = 0
+
+        async for chunk in chunks:
+            for line in splitter.feed(chunk):
+                line_number += 1
+                self._accept_line(results, batch, line_number, line)
+                if len(batch) >= self.batch_size:
+                    pending, batch = batch, []
+                    await loop.run_in_executor(None, self._flush_batch, results, pending)
+
+        for line in splitter.close():
+            line_number += 1
+            self._accept_line(results, batch, line_number, line)
+        await loop.run_in_executor(None, self._flush_batch, results, batch)
+
+        results['ingestion_time'] = time.time() - start_time
+        logger.info(f"Bulk ingestion finished: {results['accepted']} accepted, {results['rejected']} rejected")
+        return results
+
+
+def _read_chunks(stream, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingest NDJSON article records")
+    parser.add_argument('path', help="NDJSON file to ingest, or - for stdin")
+    parser.add_argument('--db', default="news_database.db", help="SQLite database path")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Records per transaction")
+    args = parser.parse_args()
+
+    service = BulkIngestionService(NewsDatabase(args.db), batch_size=args.batch_size)
+    if args.path == '-':
+        results = service.ingest_lines(_read_chunks(sys.stdin.buffer))
+    else:
+        with open(args.path, 'rb') as f:
+            results = service.ingest_lines(_read_chunks(f))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
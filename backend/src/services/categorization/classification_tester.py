@@ -13,7 +13,7 @@ from collections import defaultdict
 from .hybrid_classifier import HybridClassifier
 from .keyword_classifier import KeywordClassifier
 from src.models.news_model import NewsArticle
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import get_database
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +24,14 @@ class ClassificationTester:
         """Initialize classification tester."""
         self.hybrid_classifier = HybridClassifier()
         self.keyword_classifier = KeywordClassifier()
-        self.db = NewsDatabase()
+        self.db = get_database()
 
     def test_sample_articles(self, limit: int = 10) -> Dict:
         """Test classification on sample articles from database."""
         print(f"\n🧪 Testing Classification on {limit} Sample Articles")
         print("=" * 60)
 
-        articles = self.db.get_articles(limit=limit)
+        articles = self.db.get_articles(limit=limit, include_content=True)
         if not articles:
             return {'error': 'No articles found in database'}
 
@@ -107,9 +107,13 @@ class ClassificationTester:
 
         # Get article from database
         import sqlite3
-        with sqlite3.connect(self.db.db_path) as conn:
+        with self.db.reader() as conn:
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
+            cursor = conn.execute(
+                "SELECT a.*, article_content(b.content) AS content FROM articles a "
+                "LEFT JOIN article_bodies b ON b.article_id = a.id WHERE a.id = ?",
+                (article_id,)
+            )
             article_data = cursor.fetchone()
 
         if not article_data:
@@ -164,7 +168,7 @@ class ClassificationTester:
         print(f"\n⚡ Benchmarking Classification Performance ({num_articles} articles)")
         print("=" * 60)
 
-        articles = self.db.get_articles(limit=num_articles)
+        articles = self.db.get_articles(limit=num_articles, include_content=True)
         if not articles:
             return {'error': 'No articles found for benchmarking'}
 
@@ -235,7 +239,7 @@ class ClassificationTester:
 
         from .category_config import CATEGORY_CONFIG
 
-        articles = self.db.get_articles(limit=100)
+        articles = self.db.get_articles(limit=100, include_content=True)
         validation_results = {
             'keyword_hits': defaultdict(lambda: defaultdict(int)),
             'category_coverage': defaultdict(set),
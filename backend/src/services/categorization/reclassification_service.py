@@ -7,7 +7,7 @@ from typing import List, Dict
 import time
 
 from .hybrid_classifier import HybridClassifier
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import get_database
 from src.models.news_model import NewsArticle
 
 logger = logging.getLogger(__name__)
@@ -18,7 +18,7 @@ class ReclassificationService:
     def __init__(self):
         """Initialize re-classification service."""
         self.classifier = HybridClassifier()
-        self.db = NewsDatabase()
+        self.db = get_database()
         logger.info("Initialized ReclassificationService")
 
     def reclassify_all_articles(self, limit: int = None, force: bool = False) -> Dict:
@@ -37,7 +37,7 @@ class ReclassificationService:
 
         # Get articles to re-classify
         if force:
-            articles = self.db.get_articles(limit=limit or 1000)
+            articles = self.db.get_articles(limit=limit or 1000, include_content=True)
         else:
             articles = self.db.get_articles_for_reclassification(limit=limit or 100)
 
@@ -122,7 +122,7 @@ class ReclassificationService:
         print(f"\n🎯 Re-classifying '{category}' Articles")
         print("=" * 50)
 
-        articles = self.db.get_articles(category=category, limit=limit or 100)
+        articles = self.db.get_articles(category=category, limit=limit or 100, include_content=True)
 
         if not articles:
             return {'error': f'No articles found in category: {category}'}
@@ -189,7 +189,7 @@ class ReclassificationService:
         print(f"\n🕵️ Finding Potentially Misclassified Articles")
         print("=" * 50)
 
-        articles = self.db.get_articles(limit=200)
+        articles = self.db.get_articles(limit=200, include_content=True)
         misclassified = []
 
         for article_data in articles:
@@ -18,7 +18,7 @@ load_dotenv()
 
 from src.services.chatbot.retrieval_service import RetrievalService
 from src.services.chatbot.embedding_service import EmbeddingService
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import get_database
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +63,7 @@ class ChatService:
 
         # Initialize services
         self.retrieval_service = retrieval_service or RetrievalService()
-        self.db = NewsDatabase()
+        self.db = get_database()
 
         # Configuration
         self.model_name = "gpt-3.5-turbo"
@@ -441,36 +441,21 @@ Relevance Score: {article.get('final_score', article.get('relevance_score', 0)):
     def get_chat_stats(self) -> Dict:
         """Get statistics about the chat system"""
         try:
-            import sqlite3
-
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                # Count sessions
-                cursor = conn.execute("SELECT COUNT(*) FROM chat_sessions")
-                total_sessions = cursor.fetchone()[0]
-
-                # Count messages
-                cursor = conn.execute("SELECT COUNT(*) FROM chat_messages")
-                total_messages = cursor.fetchone()[0]
-
-                # Count by role
-                cursor = conn.execute("""
-                    SELECT role, COUNT(*) as count
-                    FROM chat_messages
-                    GROUP BY role
-                """)
-                message_counts = dict(cursor.fetchall())
-
-                # Get retrieval stats
-                retrieval_stats = self.retrieval_service.get_retrieval_stats()
-
-                return {
-                    'total_sessions': total_sessions,
-                    'total_messages': total_messages,
-                    'message_counts': message_counts,
-                    'openai_configured': self.openai_client is not None,
-                    'model_name': self.model_name,
-                    'retrieval_stats': retrieval_stats
-                }
+            # Trigger-maintained counters, no table scans
+            counters = self.db.get_stats_counters()
+            message_counts = {role: count for role, (count, _) in counters.get('chat_role', {}).items()}
+
+            # Get retrieval stats
+            retrieval_stats = self.retrieval_service.get_retrieval_stats()
+
+            return {
+                'total_sessions': counters.get('chat_sessions', {}).get('', (0, 0))[0],
+                'total_messages': sum(message_counts.values()),
+                'message_counts': message_counts,
+                'openai_configured': self.openai_client is not None,
+                'model_name': self.model_name,
+                'retrieval_stats': retrieval_stats
+            }
 
         except Exception as e:
             logger.error(f"Error getting chat stats: {e}")
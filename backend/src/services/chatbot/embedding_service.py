@@ -11,18 +11,26 @@ import numpy as np
 # Optional imports for deployment without ML dependencies
 try:
     from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
     ML_AVAILABLE = True
 except ImportError:
     SentenceTransformer = None
-    cosine_similarity = None
     ML_AVAILABLE = False
 
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import get_database
+from src.db.embedding_codec import HEADER_SIZE, decode_embedding, read_header
 from src.models.news_model import NewsArticle
 
 logger = logging.getLogger(__name__)
 
+def embedding_array(stored) -> np.ndarray:
+    """View a stored embedding as a float32 array without copying the BLOB payload"""
+    if isinstance(stored, str):
+        # Legacy JSON row not yet migrated
+        return np.asarray(decode_embedding(stored), dtype=np.float32)
+    _, dimension = read_header(stored)
+    return np.frombuffer(stored, dtype='<f4', count=dimension, offset=HEADER_SIZE)
+
+
 class EmbeddingService:
     """Service for handling text embeddings and similarity search"""
 
@@ -35,7 +43,7 @@ class EmbeddingService:
         """
         self.model_name = model_name
         self.model = None
-        self.db = NewsDatabase()
+        self.db = get_database()
 
     def _load_model(self):
         """Lazy load the sentence transformer model"""
@@ -235,9 +243,8 @@ class EmbeddingService:
         """Get articles that have embeddings from database"""
         try:
             import sqlite3
-            import json
 
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
+            with self.db.reader() as conn:
                 conn.row_factory = sqlite3.Row
 
                 if category_filter:
@@ -262,8 +269,11 @@ class EmbeddingService:
                 articles = []
                 for row in cursor.fetchall():
                     article_dict = dict(row)
-                    article_dict['embedding'] = json.loads(article_dict['embedding_vector'])
-                    del article_dict['embedding_vector']  # Remove raw JSON
+                    try:
+                        article_dict['embedding'] = embedding_array(article_dict.pop('embedding_vector'))
+                    except ValueError as e:
+                        logger.warning(f"Skipping malformed embedding for article {article_dict['id']}: {e}")
+                        continue
                     articles.append(article_dict)
 
                 return articles
@@ -276,37 +286,34 @@ class EmbeddingService:
                               articles_with_embeddings: List[dict]) -> List[dict]:
         """Calculate cosine similarities between query and articles"""
         try:
-            # Convert query embedding to numpy array
-            query_array = np.array(query_embedding).reshape(1, -1)
-
-            similarities = []
-
-            for article in articles_with_embeddings:
-                try:
-                    # Convert article embedding to numpy array
-                    article_embedding = np.array(article['embedding']).reshape(1, -1)
-
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_array, article_embedding)[0][0]
-
-                    # Add to results
-                    result = {
-                        'id': article['id'],
-                        'title': article['title'],
-                        'summary': article['summary'],
-                        'category': article['category'],
-                        'source': article['source'],
-                        'url': article['url'],
-                        'similarity_score': float(similarity)
-                    }
-
-                    similarities.append(result)
-
-                except Exception as e:
-                    logger.warning(f"Error calculating similarity for article {article.get('id')}: {e}")
-                    continue
+            query_array = np.asarray(query_embedding, dtype=np.float32)
+
+            # Score every article in one matrix product
+            dimension = query_array.shape[0]
+            articles = [article for article in articles_with_embeddings
+                        if len(article['embedding']) == dimension]
+            if len(articles) < len(articles_with_embeddings):
+                logger.warning(f"Skipped {len(articles_with_embeddings) - len(articles)} embeddings "
+                               f"with a dimension other than {dimension}")
+            if not articles:
+                return []
 
-            return similarities
+            matrix = np.stack([article['embedding'] for article in articles])
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_array)
+            scores = matrix @ query_array / np.where(norms == 0, 1, norms)
+
+            return [
+                {
+                    'id': article['id'],
+                    'title': article['title'],
+                    'summary': article['summary'],
+                    'category': article['category'],
+                    'source': article['source'],
+                    'url': article['url'],
+                    'similarity_score': float(score)
+                }
+                for article, score in zip(articles, scores)
+            ]
 
         except Exception as e:
             logger.error(f"Error calculating similarities: {e}")
@@ -315,32 +322,13 @@ class EmbeddingService:
     def get_embedding_stats(self) -> dict:
         """Get statistics about stored embeddings"""
         try:
-            import sqlite3
-
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                cursor = conn.execute("""
-                    SELECT
-                        COUNT(*) as total_embeddings,
-                        COUNT(DISTINCT article_id) as unique_articles,
-                        embedding_model
-                    FROM article_embeddings
-                    WHERE embedding_model = ?
-                    GROUP BY embedding_model
-                """, (self.model_name,))
-
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        'total_embeddings': result[0],
-                        'unique_articles': result[1],
-                        'model_name': result[2]
-                    }
-                else:
-                    return {
-                        'total_embeddings': 0,
-                        'unique_articles': 0,
-                        'model_name': self.model_name
-                    }
+            # Embeddings are unique per (article, model), so one counter gives both figures
+            count, _ = self.db.get_stats_counters().get('embedding_model', {}).get(self.model_name, (0, 0))
+            return {
+                'total_embeddings': count,
+                'unique_articles': count,
+                'model_name': self.model_name
+            }
 
         except Exception as e:
             logger.error(f"Error getting embedding stats: {e}")
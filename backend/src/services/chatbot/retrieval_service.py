@@ -4,12 +4,13 @@ Handles context retrieval using hybrid search (semantic + keyword + recency)
 """
 
 import logging
+import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
 from src.services.chatbot.embedding_service import EmbeddingService
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import get_database
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ class RetrievalService:
             embedding_service: Optional embedding service instance
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.db = NewsDatabase()
+        self.db = get_database()
 
     def retrieve_context(self, query: str, max_articles: int = 5,
                         category_filter: Optional[str] = None,
@@ -192,6 +193,11 @@ class RetrievalService:
             if not keywords:
                 return []
 
+            cutoff_ts = int(time.time() - days_back * 86400)
+            if self.db.fulltext_enabled:
+                return self._fulltext_search(keywords, limit, category_filter, cutoff_ts)
+
+            # No FTS5 in this SQLite build: scan with LIKE
             # Build search conditions
             search_conditions = []
             search_params = []
@@ -199,7 +205,7 @@ class RetrievalService:
             # Create LIKE conditions for keywords
             for keyword in keywords:
                 search_conditions.append(
-                    "(LOWER(title) LIKE ? OR LOWER(summary) LIKE ? OR LOWER(content) LIKE ?)"
+                    "(LOWER(title) LIKE ? OR LOWER(summary) LIKE ? OR LOWER(article_content(content)) LIKE ?)"
                 )
                 keyword_pattern = f"%{keyword.lower()}%"
                 search_params.extend([keyword_pattern, keyword_pattern, keyword_pattern])
@@ -210,22 +216,21 @@ class RetrievalService:
                 search_params.append(category_filter)
 
             # Add date filter
-            cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
-            search_conditions.append("created_at >= ?")
-            search_params.append(cutoff_date)
+            search_conditions.append("published_ts >= ?")
+            search_params.append(cutoff_ts)
 
             # Build SQL query
             where_clause = " AND ".join(search_conditions)
             sql = f"""
                 SELECT id, title, summary, category, source, url, created_at
-                FROM articles
+                FROM articles LEFT JOIN article_bodies ON article_bodies.article_id = articles.id
                 WHERE {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY published_ts DESC
                 LIMIT ?
             """
             search_params.append(limit)
 
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
+            with self.db.reader() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute(sql, search_params)
 
@@ -248,6 +253,20 @@ class RetrievalService:
             logger.error(f"Error in keyword search: {e}")
             return []
 
+    def _fulltext_search(self, keywords: List[str], limit: int,
+                         category_filter: Optional[str], cutoff_ts: int) -> List[Dict]:
+        """Keyword search through the FTS5 index, scored by BM25"""
+        results = self.db.search_articles(keywords, limit=limit, category=category_filter, since=cutoff_ts)
+        if not results:
+            return []
+
+        # BM25 scores are negative, best first; scale them so the best match scores 1.0
+        best = results[0]['bm25'] or -1.0
+        for article in results:
+            article['retrieval_method'] = 'keyword'
+            article['relevance_score'] = min(article.pop('bm25') / best, 1.0)
+        return results
+
     def _get_recent_articles(self, limit: int,
                            category_filter: Optional[str] = None,
                            days_back: int = 7) -> List[Dict]:
@@ -273,9 +292,9 @@ class RetrievalService:
                 conditions.append("category = ?")
                 params.append(category_filter)
 
-            cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
-            conditions.append("created_at >= ?")
-            params.append(cutoff_date)
+            # Range scan on the (category, published_ts) index
+            conditions.append("published_ts >= ?")
+            params.append(int(time.time() - days_back * 86400))
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
 
@@ -283,12 +302,12 @@ class RetrievalService:
                 SELECT id, title, summary, category, source, url, created_at
                 FROM articles
                 WHERE {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY published_ts DESC
                 LIMIT ?
             """
             params.append(limit)
 
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
+            with self.db.reader() as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.execute(sql, params)
 
@@ -429,18 +448,10 @@ class RetrievalService:
         try:
             embedding_stats = self.embedding_service.get_embedding_stats()
 
-            import sqlite3
-            with sqlite3.connect(self.db.db_path, timeout=30.0) as conn:
-                cursor = conn.execute("SELECT COUNT(*) FROM articles")
-                total_articles = cursor.fetchone()[0]
-
-                # Get articles by category
-                cursor = conn.execute("""
-                    SELECT category, COUNT(*) as count
-                    FROM articles
-                    GROUP BY category
-                """)
-                category_counts = dict(cursor.fetchall())
+            # Trigger-maintained counters, so health checks never scan articles
+            counters = self.db.get_stats_counters()
+            total_articles = counters.get('articles', {}).get('', (0, 0))[0]
+            category_counts = {category: count for category, (count, _) in counters.get('category', {}).items()}
 
             return {
                 'total_articles': total_articles,
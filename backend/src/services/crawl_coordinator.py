@@ -0,0 +1,163 @@
+"""
+Crawl coordination across requests, workers and processes.
+
+A crawl job is identified by its name and parameters. The first caller
+takes a lease on the job in the database and runs it; concurrent callers
+attach to the running job and receive its result instead of starting a
+crawl of their own:
+
+- callers in the same process await the owner's task directly;
+- callers in other processes poll the lease row until the owner stores
+  the JSON result.
+
+The owner renews the lease while the job runs. A lease that is not renewed
+(e.g. the owning worker died) expires and is taken over by the next caller.
+A caller that can neither take nor read the lease for a few lease
+lifetimes (e.g. a persistent database error) gives up with CrawlJobError.
+Lease calls go through AsyncNewsDatabase: lease writes await the
+database writer queue and lease reads run on its thread pool, so neither
+blocks the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from src.db.async_database import AsyncNewsDatabase
+from src.db.database_conn import NewsDatabase
+
+logger = logging.getLogger(__name__)
+
+# Lease lifetime without a heartbeat
+DEFAULT_LEASE_TTL = 90.0
+# Interval at which callers in other processes check the lease
+DEFAULT_POLL_INTERVAL = 2.0
+# Lease lifetimes a caller keeps retrying while the lease can be neither taken nor read
+LEASE_UNAVAILABLE_PERIODS = 3
+
+
+class CrawlJobError(Exception):
+    """Raised to callers attached to a crawl job that failed in another process"""
+
+
+def crawl_job_key(job_name: str, params: Dict[str, Any]) -> str:
+    """Stable key for a job: its name and a fingerprint of its parameters"""
+    normalized = {
+        name: sorted(value) if isinstance(value, (list, tuple, set)) else value
+        for name, value in params.items()
+    }
+    fingerprint = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{job_name}:{fingerprint[:16]}"
+
+
+class CrawlCoordinator:
+    """Runs each crawl job once at a time across processes using database leases"""
+
+    def __init__(self, db: Union[NewsDatabase, AsyncNewsDatabase], lease_ttl: float = DEFAULT_LEASE_TTL,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.db = db if isinstance(db, AsyncNewsDatabase) else AsyncNewsDatabase(db)
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self._owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    async def run_exclusive(self, job_name: str, params: Dict[str, Any],
+                            job: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run a job, or attach to the same job already running elsewhere.
+
+        Args:
+            job_name: Name of the job, e.g. 'enhanced_extraction'
+            params: Parameters that make two runs equivalent
+            job: Coroutine function running the job; its result must be JSON serialisable
+
+        Returns:
+            The job result, from this caller's run or the one it attached to
+        """
+        key = crawl_job_key(job_name, params)
+
+        task = self._jobs.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_or_attach(key, job))
+            self._jobs[key] = task
+            task.add_done_callback(lambda _: self._jobs.pop(key, None))
+        else:
+            logger.info(f"Attaching to crawl job {key} running in this process")
+
+        # A disconnecting caller must not cancel the job for everyone else
+        return await asyncio.shield(task)
+
+    async def _run_or_attach(self, key: str, job: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        # The lease calls report database errors as False/None; give up if they persist
+        deadline = None
+        while True:
+            owner = f"{self._owner_prefix}:{uuid.uuid4().hex}"
+            if await self.db.try_acquire_crawl_lease(key, owner, self.lease_ttl):
+                return await self._run_as_owner(key, owner, job)
+
+            lease = await self.db.get_crawl_lease(key)
+            if lease is None:
+                if deadline is None:
+                    deadline = time.monotonic() + LEASE_UNAVAILABLE_PERIODS * self.lease_ttl
+                elif time.monotonic() >= deadline:
+                    raise CrawlJobError(f"Crawl lease {key} could not be acquired or read; see the database errors")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            deadline = None
+            if lease['status'] != 'running':
+                # Finished between our attempt and this read
+                return self._lease_result(lease)
+
+            logger.info(f"Crawl job {key} is running in {lease['owner']}, waiting for its result")
+            result = await self._wait_for(key, lease['owner'])
+            if result is not None:
+                return result
+            # The run we waited on was lost or replaced: try to take over or attach again
+
+    async def _wait_for(self, key: str, watched_owner: str) -> Optional[Dict[str, Any]]:
+        """Poll a lease until the watched run finishes; None if it expired or was replaced"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            lease = await self.db.get_crawl_lease(key)
+            if lease is None or lease['owner'] != watched_owner:
+                return None
+            if lease['status'] != 'running':
+                return self._lease_result(lease)
+            if lease['expires_at'] <= time.time():
+                logger.warning(f"Crawl lease {key} held by {watched_owner} expired")
+                return None
+
+    async def _run_as_owner(self, key: str, owner: str,
+                            job: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        logger.info(f"Acquired crawl lease {key} as {owner}")
+        heartbeat = asyncio.create_task(self._heartbeat(key, owner))
+        try:
+            result = await job()
+        except BaseException as e:
+            await self.db.finish_crawl_lease(key, owner, error=str(e) or e.__class__.__name__)
+            raise
+        finally:
+            heartbeat.cancel()
+
+        if not await self.db.finish_crawl_lease(key, owner, result=json.dumps(result, default=str)):
+            logger.warning(f"Crawl lease {key} was taken over before {owner} finished")
+        return result
+
+    async def _heartbeat(self, key: str, owner: str):
+        """Keep the lease alive while the job runs"""
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            if not await self.db.renew_crawl_lease(key, owner, self.lease_ttl):
+                logger.warning(f"Lost crawl lease {key}; another caller may start the same job")
+                return
+
+    def _lease_result(self, lease: Dict) -> Dict[str, Any]:
+        if lease['status'] == 'completed' and lease['result'] is not None:
+            return json.loads(lease['result'])
+        raise CrawlJobError(f"Crawl job {lease['job_key']} failed: {lease.get('error') or 'unknown error'}")
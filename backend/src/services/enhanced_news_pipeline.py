@@ -10,6 +10,7 @@ This service orchestrates the complete workflow:
 """
 
 import asyncio
+import functools
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -18,7 +19,7 @@ import traceback
 from services.news_extraction_pipeline import run_extraction_pipeline
 from services.similarity import SimilarityService
 from services.prioritization import StoryPrioritizationEngine, PrioritizationConfig
-from db.database_conn import NewsDatabase
+from src.db.database_conn import NewsDatabase, get_database
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class EnhancedNewsPipelineService:
     """Enhanced news pipeline with intelligent prioritization."""
 
     def __init__(self, db: Optional[NewsDatabase] = None):
-        self.db = db if db else NewsDatabase()
+        self.db = db if db else get_database()
         self.similarity_service = SimilarityService(self.db)
         self.prioritization_engine = StoryPrioritizationEngine()
 
@@ -169,11 +170,18 @@ class EnhancedNewsPipelineService:
         logger.info("Phase 2: Starting similarity detection and clustering")
 
         try:
+            # Similarity work is synchronous; run it in a worker thread to keep the event loop free
+            loop = asyncio.get_running_loop()
+
             # Run similarity detection on recent articles (last 2 hours to catch fresh content)
-            similarity_metrics = self.similarity_service.detect_all_similarities(hours_back=2)
+            similarity_metrics = await loop.run_in_executor(
+                None, functools.partial(self.similarity_service.detect_all_similarities, hours_back=2)
+            )
 
             # Get article clusters for prioritization
-            clusters = self.similarity_service.get_article_clusters(limit=50)
+            clusters = await loop.run_in_executor(
+                None, functools.partial(self.similarity_service.get_article_clusters, limit=50)
+            )
 
             logger.info(f"Phase 2 completed: {similarity_metrics.similar_pairs_found} similar pairs, "
                        f"{similarity_metrics.clusters_created} clusters created")
@@ -210,8 +218,12 @@ class EnhancedNewsPipelineService:
         logger.info("Phase 3: Starting intelligent story prioritization")
 
         try:
+            loop = asyncio.get_running_loop()
+
             # Get recent articles for prioritization (last 4 hours for comprehensive coverage)
-            recent_articles = self.db.get_articles(limit=500)
+            recent_articles = await loop.run_in_executor(
+                None, functools.partial(self.db.get_recent_articles, hours_back=4, limit=500)
+            )
 
             if not recent_articles:
                 logger.warning("No articles found for prioritization")
@@ -223,7 +235,9 @@ class EnhancedNewsPipelineService:
                 }
 
             # Get article clusters to understand story relationships
-            clusters = self.similarity_service.get_article_clusters(limit=100)
+            clusters = await loop.run_in_executor(
+                None, functools.partial(self.similarity_service.get_article_clusters, limit=100)
+            )
 
             # If no clusters exist, create individual article clusters
             if not clusters:
@@ -320,8 +334,11 @@ class EnhancedNewsPipelineService:
         """Get current status and statistics of the enhanced pipeline."""
         try:
             # Get database statistics
-            classification_stats = self.db.get_classification_stats()
-            similarity_stats = self.db.get_recent_similarities(limit=100)
+            loop = asyncio.get_running_loop()
+            classification_stats = await loop.run_in_executor(None, self.db.get_classification_stats)
+            similarity_stats = await loop.run_in_executor(
+                None, functools.partial(self.db.get_recent_similarities, limit=100)
+            )
 
             return {
                 "database": {
@@ -7,20 +7,24 @@ import asyncio
 
 
 from src.scrapers.aussie_news_extractor import ExtractorFactory
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import article_content_hash, get_database
 from src.services.categorization.hybrid_classifier import HybridClassifier
 
 
 logger = logging.getLogger(__name__)
 
+# Articles written per database transaction
+SAVE_BATCH_SIZE = 200
+
 class NewsExtractionPipeline:
     """Updated main pipeline orchestrator using the extractor factory"""
     
     def __init__(self):
-        self.database = NewsDatabase()
+        self.database = get_database()
         self.extractors = {}
         self.supported_categories = ["sports", "lifestyle", "music", "finance"]
         self.classifier = HybridClassifier()
+        self.save_batch_size = SAVE_BATCH_SIZE
         logger.info("Initialized NewsExtractionPipeline with intelligent categorization")
     
     async def initialize(self):
@@ -85,9 +89,11 @@ class NewsExtractionPipeline:
             'total_articles': 0,
             'successful_saves': 0,
             'failed_saves': 0,
+            'unchanged_articles': 0,
             'by_category': {},
             'by_source': {},
             'extraction_time': None,
+            'url_filter_stats': {},
             'errors': []
         }
         
@@ -118,6 +124,11 @@ class NewsExtractionPipeline:
             
             # Execute all tasks concurrently
             results = await asyncio.gather(*[task for _, _, task in tasks], return_exceptions=True)
+
+            # Articles waiting to be written in one transaction; database calls
+            # run in a worker thread so they do not block the event loop
+            pending_saves = []
+            loop = asyncio.get_running_loop()
             
             # Process results
             for (source, category, _), result in zip(tasks, results):
@@ -136,8 +147,17 @@ class NewsExtractionPipeline:
                 if source not in extraction_results['by_source']:
                     extraction_results['by_source'][source] = 0
                 
-                # Process and save articles with intelligent categorization
+                # Articles already stored with the same content need no classification or write
+                stored_hashes = await loop.run_in_executor(
+                    None, self.database.get_content_hashes, [article.url for article in articles]
+                )
+
+                # Classify articles; they are saved in batches below
                 for article in articles:
+                    if stored_hashes.get(article.url) == article_content_hash(article):
+                        extraction_results['unchanged_articles'] += 1
+                        continue
+
                     try:
                         # Classify the article using intelligent categorization
                         classification_result = self.classifier.classify(article)
@@ -150,41 +170,34 @@ class NewsExtractionPipeline:
                         if classification_result.confidence >= self.classifier.confidence_threshold:
                             # Update article category with intelligent classification
                             article.category = classification_result.category
-
-                            # Save with classification data
-                            if self.database.save_article_with_classification(article, classification_result):
-                                extraction_results['successful_saves'] += 1
-                                extraction_results['by_category'][classification_result.category] += 1
-                                extraction_results['by_source'][source] += 1
-                            else:
-                                extraction_results['failed_saves'] += 1
                         else:
-                            # Keep original category if classification not confident enough
+                            # Keep original category if classification not confident enough,
+                            # the classification attempt is still stored
                             logger.info(f"Low confidence classification ({classification_result.confidence:.3f}) "
                                        f"for article '{article.title[:50]}...', keeping original category '{article.category}'")
 
-                            # Save with original category but include classification attempt
-                            if self.database.save_article_with_classification(article, classification_result):
-                                extraction_results['successful_saves'] += 1
-                                extraction_results['by_category'][article.category] += 1
-                                extraction_results['by_source'][source] += 1
-                            else:
-                                extraction_results['failed_saves'] += 1
-
                     except Exception as e:
                         logger.error(f"Error classifying article '{article.title[:50]}...': {e}")
-                        # Fallback to original save method
-                        if self.database.save_article(article):
-                            extraction_results['successful_saves'] += 1
-                            extraction_results['by_category'][article.category] += 1
-                            extraction_results['by_source'][source] += 1
-                        else:
-                            extraction_results['failed_saves'] += 1
-            
+                        # Save without classification data
+                        classification_result = None
+
+                    pending_saves.append((source, article, classification_result))
+                    if len(pending_saves) >= self.save_batch_size:
+                        await loop.run_in_executor(None, self._flush_saves, pending_saves, extraction_results)
+
+            await loop.run_in_executor(None, self._flush_saves, pending_saves, extraction_results)
+
+            # Per-rule URL filter rejection counts for each source used
+            extraction_results['url_filter_stats'] = {
+                source: self.extractors[source].get_url_filter_stats()
+                for source in valid_sources if source in self.extractors
+            }
+
             extraction_results['extraction_time'] = time.time() - start_time
             
             logger.info(f"Extraction completed: {extraction_results['total_articles']} articles extracted, "
-                       f"{extraction_results['successful_saves']} saved successfully")
+                       f"{extraction_results['successful_saves']} saved successfully, "
+                       f"{extraction_results['unchanged_articles']} unchanged")
             
         except Exception as e:
             logger.error(f"Pipeline execution failed: {e}")
@@ -192,6 +205,29 @@ class NewsExtractionPipeline:
         
         return extraction_results
     
+    def _flush_saves(self, pending_saves: List, extraction_results: Dict[str, Any]):
+        """Write pending articles in one transaction and record the outcomes"""
+        if not pending_saves:
+            return
+
+        outcomes = self.database.save_articles_bulk(
+            [article for _, article, _ in pending_saves],
+            [classification_result for _, _, classification_result in pending_saves]
+        )
+
+        for (source, article, _), outcome in zip(pending_saves, outcomes):
+            if outcome == 'failed':
+                extraction_results['failed_saves'] += 1
+                continue
+            if outcome == 'unchanged':
+                extraction_results['unchanged_articles'] += 1
+                continue
+            extraction_results['successful_saves'] += 1
+            extraction_results['by_category'][article.category] = extraction_results['by_category'].get(article.category, 0) + 1
+            extraction_results['by_source'][source] += 1
+
+        pending_saves.clear()
+
     async def close(self):
         """Clean up resources"""
         if hasattr(self, 'session'):
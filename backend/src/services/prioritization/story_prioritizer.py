@@ -133,7 +133,7 @@ class StoryPrioritizationEngine:
 
         for article in articles:
             # Content length scoring
-            content_length = len(article.get('content', ''))
+            content_length = article.get('content_length') or len(article.get('content') or '')
             if content_length >= self.config.min_content_length:
                 # Score based on content length (normalize between min and max)
                 normalized_length = min(1.0, (content_length - self.config.min_content_length) /
@@ -316,7 +316,7 @@ class StoryPrioritizationEngine:
         latest = datetime.min
         for article in articles:
             try:
-                pub_date = self._parse_date(article.get('published_date', ''))
+                pub_date = self._publish_time(article)
                 if pub_date and pub_date > latest:
                     latest = pub_date
             except:
@@ -333,7 +333,7 @@ class StoryPrioritizationEngine:
         earliest = datetime.max
         for article in articles:
             try:
-                pub_date = self._parse_date(article.get('published_date', ''))
+                pub_date = self._publish_time(article)
                 if pub_date and pub_date < earliest:
                     earliest = pub_date
             except:
@@ -348,7 +348,7 @@ class StoryPrioritizationEngine:
 
         for article in articles:
             try:
-                pub_date = self._parse_date(article.get('published_date', ''))
+                pub_date = self._publish_time(article)
                 if pub_date:
                     times.append(pub_date)
             except:
@@ -356,6 +356,13 @@ class StoryPrioritizationEngine:
 
         return sorted(times)
 
+    def _publish_time(self, article: Dict) -> Optional[datetime]:
+        """Get an article's publication time, preferring the stored epoch timestamp."""
+        published_ts = article.get('published_ts')
+        if published_ts is not None:
+            return datetime.fromtimestamp(published_ts)
+        return self._parse_date(article.get('published_date', ''))
+
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date string to datetime object."""
         if not date_str:
@@ -527,7 +534,7 @@ class StoryPrioritizationEngine:
             score = 0.0
 
             # Content length bonus
-            content_length = len(article.get('content', ''))
+            content_length = article.get('content_length') or len(article.get('content') or '')
             if content_length > 500:
                 score += 0.3
 
@@ -537,7 +544,7 @@ class StoryPrioritizationEngine:
 
             # Recency bonus
             try:
-                pub_date = self._parse_date(article.get('published_date', ''))
+                pub_date = self._publish_time(article)
                 if pub_date:
                     hours_ago = (datetime.now() - pub_date).total_seconds() / 3600
                     if hours_ago < 2:
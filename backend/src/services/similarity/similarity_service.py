@@ -10,12 +10,16 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
 from src.models.news_model import NewsArticle
-from src.db.database_conn import NewsDatabase
+from src.db.article_loader import ArticleLoader
+from src.db.database_conn import NewsDatabase, get_database
 from .similarity_detector import SimilarityDetector
 from .similarity_models import SimilarityResult, ArticleCluster, SimilarityMetrics
 
 logger = logging.getLogger(__name__)
 
+# Most articles compared in one detection run
+RECENT_ARTICLE_LIMIT = 500
+
 class SimilarityService:
     """
     High-level service for managing news article similarity detection.
@@ -28,7 +32,7 @@ class SimilarityService:
         Args:
             database: Database connection (creates new if None)
         """
-        self.db = database or NewsDatabase()
+        self.db = database or get_database()
         self.detector = SimilarityDetector()
         logger.info("Initialized SimilarityService")
 
@@ -44,13 +48,17 @@ class SimilarityService:
             List of similar articles with similarity scores
         """
         try:
+            # Articles for this call are looked up through one loader
+            loader = ArticleLoader(self.db)
+
             # Get the target article
-            target_article = self._get_article_by_id(article_id)
+            target_row = loader.load(article_id)
+            target_article = self._dict_to_article(target_row) if target_row else None
             if not target_article:
                 return []
 
             # Get candidate articles (recent articles from different sources)
-            candidates = self._get_candidate_articles(target_article)
+            candidates = self._get_candidate_articles(target_article, loader=loader)
             if not candidates:
                 return []
 
@@ -59,10 +67,11 @@ class SimilarityService:
                 target_article, candidates, max_results=limit
             )
 
-            # Convert to response format
+            # Convert to response format; candidate rows are already loaded
             result = []
-            for similarity in similarities:
-                similar_article = self._get_article_by_id(similarity.article_id_2)
+            for similarity, row in zip(similarities,
+                                       loader.load_many(similarity.article_id_2 for similarity in similarities)):
+                similar_article = self._dict_to_article(row) if row else None
                 if similar_article:
                     result.append({
                         'article': self._article_to_dict(similar_article),
@@ -103,8 +112,9 @@ class SimilarityService:
             # Store similarity results
             stored_count = self._store_similarities(similarities)
 
-            # Create clusters
-            clusters = self._create_article_clusters(similarities)
+            # Create clusters and store them, replacing the ones they supersede
+            clusters = self._create_article_clusters(similarities, {article.id: article for article in articles})
+            self.db.save_article_clusters(clusters)
 
             # Calculate metrics
             processing_time = time.time() - start_time
@@ -138,31 +148,27 @@ class SimilarityService:
             List of article clusters with metadata
         """
         try:
-            # Get recent similarities
-            similarities = self._get_stored_similarities(limit * 3)  # Get more to create clusters
-
-            # Create clusters
-            clusters = self._create_article_clusters(similarities)
+            # Clusters stored by the last similarity detection run
+            clusters = self.db.get_article_clusters(limit)
 
-            # Convert to response format
+            # Convert to response format; the articles come with the clusters
             result = []
-            for cluster in clusters[:limit]:
+            for cluster in clusters:
+                main_article = self._dict_to_article(cluster['main_article'])
+                if not main_article:
+                    continue
+
+                similar_articles = [self._dict_to_article(article) for article in cluster['similar_articles']]
                 cluster_data = {
-                    'cluster_id': cluster.cluster_id,
-                    'main_article': self._article_to_dict(self._get_article_by_id(cluster.main_article_id)),
-                    'similar_articles': [],
-                    'summary': cluster.summary,
-                    'sources_covered': cluster.sources_covered,
-                    'article_count': cluster.article_count,
-                    'cluster_score': cluster.cluster_score
+                    'cluster_id': cluster['cluster_id'],
+                    'main_article': self._article_to_dict(main_article),
+                    'similar_articles': [self._article_to_dict(article) for article in similar_articles if article],
+                    'summary': cluster['summary'],
+                    'sources_covered': cluster['sources_covered'],
+                    'article_count': len(cluster['similar_articles']) + 1,
+                    'cluster_score': cluster['cluster_score']
                 }
 
-                # Add similar articles
-                for article_id in cluster.similar_articles:
-                    article = self._get_article_by_id(article_id)
-                    if article:
-                        cluster_data['similar_articles'].append(self._article_to_dict(article))
-
                 result.append(cluster_data)
 
             logger.info(f"Retrieved {len(result)} article clusters")
@@ -172,46 +178,14 @@ class SimilarityService:
             logger.error(f"Error getting article clusters: {e}")
             return []
 
-    def _get_article_by_id(self, article_id: int) -> Optional[NewsArticle]:
-        """Convert database article to NewsArticle object."""
-        import sqlite3
-        try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
-                row = cursor.fetchone()
-
-                if row:
-                    import json
-                    article_dict = dict(row)
-                    tags = json.loads(article_dict.get('tags', '[]')) if article_dict.get('tags') else []
-
-                    article = NewsArticle(
-                        title=article_dict.get('title', ''),
-                        url=article_dict.get('url', ''),
-                        category=article_dict.get('category', ''),
-                        summary=article_dict.get('summary', ''),
-                        published_date=article_dict.get('published_date', ''),
-                        author=article_dict.get('author', ''),
-                        content=article_dict.get('content', ''),
-                        source=article_dict.get('source', ''),
-                        tags=tags,
-                        extracted_at=article_dict.get('extracted_at', '')
-                    )
-                    # Add ID for similarity comparison
-                    article.id = article_dict['id']
-                    return article
-
-        except Exception as e:
-            logger.error(f"Error getting article {article_id}: {e}")
-
-        return None
-
-    def _get_candidate_articles(self, target_article: NewsArticle, limit: int = 50) -> List[NewsArticle]:
-        """Get candidate articles for similarity comparison."""
+    def _get_candidate_articles(self, target_article: NewsArticle, limit: int = 50,
+                                loader: Optional[ArticleLoader] = None) -> List[NewsArticle]:
+        """Get candidate articles for similarity comparison, memoizing their rows in loader."""
         try:
             # Get recent articles from different sources
             articles = self.db.get_articles(limit=limit)
+            if loader:
+                loader.prime(articles)
             candidates = []
 
             for article_dict in articles:
@@ -227,10 +201,10 @@ class SimilarityService:
             return []
 
     def _get_recent_articles(self, hours_back: int) -> List[NewsArticle]:
-        """Get recent articles for similarity analysis."""
+        """Get articles published in the last hours_back hours for similarity analysis."""
         try:
-            # Get more articles to ensure we have enough after filtering
-            articles = self.db.get_articles(limit=100)
+            # Pairwise comparison is quadratic, so cap the window size
+            articles = self.db.get_recent_articles(hours_back, limit=RECENT_ARTICLE_LIMIT)
             result = []
 
             for article_dict in articles:
@@ -264,6 +238,8 @@ class SimilarityService:
             )
             # Add ID for similarity comparison
             article.id = article_dict['id']
+            article.published_ts = article_dict.get('published_ts')
+            article.content_length = article_dict.get('content_length')
             return article
 
         except Exception as e:
@@ -279,38 +255,37 @@ class SimilarityService:
             'category': article.category,
             'summary': article.summary,
             'published_date': article.published_date,
+            'published_ts': getattr(article, 'published_ts', None),
+            'content_length': getattr(article, 'content_length', None),
             'author': article.author,
             'source': article.source,
             'tags': article.tags
         }
 
     def _store_similarities(self, similarities: List[SimilarityResult]) -> int:
-        """Store similarity results in database (placeholder for now)."""
-        # TODO: Implement database storage when similarity table is added
-        logger.info(f"Would store {len(similarities)} similarity results")
-        return len(similarities)
-
-    def _get_stored_similarities(self, limit: int) -> List[SimilarityResult]:
-        """Get stored similarity results (placeholder for now)."""
-        # TODO: Implement when similarity table is added
-        return []
-
-    def _create_article_clusters(self, similarities: List[SimilarityResult]) -> List[ArticleCluster]:
-        """Create clusters of similar articles."""
+        """Store similarity results in the database in one transaction."""
+        stored_count = self.db.save_similarities_bulk(similarities)
+        logger.info(f"Stored {stored_count} similarity results")
+        return stored_count
+
+    def _create_article_clusters(self, similarities: List[SimilarityResult],
+                                 articles_by_id: Dict[int, NewsArticle]) -> List[ArticleCluster]:
+        """Create clusters of similar articles, strongest pairs first."""
         clusters = []
         processed_articles = set()
 
-        for similarity in similarities:
+        for similarity in sorted(similarities, key=lambda s: s.similarity_score, reverse=True):
             if similarity.article_id_1 in processed_articles or similarity.article_id_2 in processed_articles:
                 continue
 
             # Create a new cluster
-            main_article = self._get_article_by_id(similarity.article_id_1)
-            similar_article = self._get_article_by_id(similarity.article_id_2)
+            main_article = articles_by_id.get(similarity.article_id_1)
+            similar_article = articles_by_id.get(similarity.article_id_2)
 
             if main_article and similar_article:
                 cluster = ArticleCluster(
-                    cluster_id=f"cluster_{len(clusters) + 1}_{int(time.time())}",
+                    # Stable id, so a later run updates the stored cluster for the same story
+                    cluster_id=f"cluster_{similarity.article_id_1}",
                     main_article_id=similarity.article_id_1,
                     similar_articles=[similarity.article_id_2],
                     cluster_score=similarity.similarity_score,
@@ -9,6 +9,23 @@ from src.scrapers.aussie_news_extractor import ABCNewsExtractor
 from src.models.news_model import NewsArticle
 
 
+def mock_html_response(html, status=200, chunk_size=64):
+    """Create a mock aiohttp response streaming the HTML in chunks"""
+    body = html.encode('utf-8')
+
+    async def iter_chunked(size):
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    response = Mock()
+    response.status = status
+    response.url = "https://www.abc.net.au/test"
+    response.charset = 'utf-8'
+    response.content_length = len(body)
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
 class TestABCNewsExtractor:
     """Test suite for ABCNewsExtractor class"""
 
@@ -170,17 +187,26 @@ class TestABCNewsExtractor:
         for url in invalid_urls:
             assert not extractor.validate_article_url(url)
 
+    def test_url_filter_stats(self, extractor):
+        """Test that URL filter rejections are counted per rule"""
+        extractor.validate_article_url("https://www.abc.net.au/news/topic/some-topic-page")
+        extractor.validate_article_url("https://www.abc.net.au/news/2024-05-01/some-story-title/103812345")
+
+        stats = extractor.get_url_filter_stats()
+
+        assert stats['article']['checked'] == 2
+        assert stats['article']['accepted'] == 1
+        assert stats['article']['rejections_by_rule'] == {'exclude:/topic/': 1}
+
     @pytest.mark.asyncio
     async def test_extract_category_articles_success(self, extractor, mock_session):
         """Test successful category article extraction"""
         # Mock HTTP response
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="""
+        mock_response = mock_html_response("""
             <html>
                 <body>
-                    <a href="/news/sport/article-1">Article 1</a>
-                    <a href="/news/sport/article-2">Article 2</a>
+                    <a href="/news/2023-01-01/test-article-one/101234567">Article 1</a>
+                    <a href="/news/2023-01-02/test-article-two/101234568">Article 2</a>
                 </body>
             </html>
         """)
@@ -257,14 +283,16 @@ class TestABCNewsExtractor:
                 <h1>Test Article Title</h1>
                 <time datetime="2023-01-01T10:00:00Z">January 1, 2023</time>
                 <div data-component="Byline">Test Author</div>
-                <article>This is the main article content with enough text to be considered substantial.</article>
+                <article>
+                    <p>This is the main article content with enough text to be considered substantial.</p>
+                    <p>A second paragraph adds more detail so that the article passes the minimum content length.</p>
+                    <p>A third paragraph closes the story with a quote and some background on the events.</p>
+                </article>
             </body>
         </html>
         """
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.text = AsyncMock(return_value=article_html)
+        mock_response = mock_html_response(article_html)
 
         # Mock the context manager
         mock_session.get.return_value = AsyncMock()
@@ -310,9 +338,7 @@ class TestABCNewsExtractor:
         </html>
         """
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.text = AsyncMock(return_value=article_html)
+        mock_response = mock_html_response(article_html)
 
         # Mock the context manager
         mock_session.get.return_value = AsyncMock()
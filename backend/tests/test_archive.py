@@ -0,0 +1,138 @@
+import pytest
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from src.db.archive import ArticleArchive, archive_month
+from src.db.database_conn import NewsDatabase
+from src.models.news_model import NewsArticle
+from src.services.similarity.similarity_models import SimilarityResult
+
+
+def make_article(index, days_ago, category="sports"):
+    published = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return NewsArticle(
+        title=f"Article {index}",
+        url=f"https://example.com/{index}",
+        category=category,
+        summary=f"Summary {index}",
+        published_date=published.isoformat(),
+        author="Desk",
+        content=f"Body of article {index} " * 50,
+        source="ABC News",
+        tags=["sport"],
+        extracted_at=published.isoformat()
+    )
+
+
+class TestArticleArchive:
+    """Test suite for the cold-storage article archive"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the database and its archive"""
+        path = tempfile.mkdtemp()
+        yield path
+        shutil.rmtree(path, ignore_errors=True)
+
+    @pytest.fixture
+    def db(self, temp_dir):
+        db = NewsDatabase(os.path.join(temp_dir, "news.db"))
+        db.save_articles_bulk([make_article(1, 200), make_article(2, 120, "finance"), make_article(3, 1)])
+        yield db
+        db.close()
+
+    def article_id(self, db, url):
+        with db.reader() as conn:
+            return conn.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()[0]
+
+    def test_old_articles_moved_with_derived_rows(self, db, temp_dir):
+        """Test that old articles, embeddings and similarities leave the hot database"""
+        old_id, new_id = self.article_id(db, "https://example.com/1"), self.article_id(db, "https://example.com/3")
+        db.save_article_embedding(old_id, [0.5, 0.25])
+        db.save_similarities_bulk([SimilarityResult(
+            article_id_1=old_id, article_id_2=new_id, similarity_score=0.9, title_similarity=0.9,
+            keyword_similarity=0.9, time_similarity=0.1, method_used="hybrid", explanation=""
+        )])
+        archive = ArticleArchive(db)
+
+        counts = archive.archive_articles(older_than_days=90)
+
+        assert counts == {'articles': 2, 'embeddings': 1, 'similarities': 1}
+        assert [article['url'] for article in db.get_articles()] == ["https://example.com/3"]
+        assert db.search_articles(["Article"])[0]['id'] == new_id
+        with db.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM article_embeddings").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM article_similarities").fetchone()[0] == 0
+            # Archived articles leave the contentless full-text index too
+            assert conn.execute(
+                "SELECT rowid FROM articles_fts WHERE articles_fts MATCH 'body'"
+            ).fetchall() == [(new_id,)]
+
+        assert len(archive.archive_files()) == 2
+        with sqlite3.connect(archive.archive_files()[-1]) as conn:
+            assert conn.execute("SELECT typeof(content_z) FROM articles").fetchone()[0] == 'blob'
+            assert conn.execute("SELECT COUNT(*) FROM article_embeddings").fetchone()[0] == 1
+
+    def test_archived_articles_queryable(self, db):
+        """Test that the include-archive path merges hot and archived articles"""
+        archive = ArticleArchive(db)
+        archive.archive_articles(older_than_days=90)
+        assert archive.archive_articles(older_than_days=90) == {'articles': 0, 'embeddings': 0, 'similarities': 0}
+
+        articles = db.get_articles(include_content=True, include_archive=True)
+        assert [article['url'] for article in articles] == [
+            "https://example.com/3", "https://example.com/2", "https://example.com/1"
+        ]
+        assert articles[2]['archived']
+        assert articles[2]['content'] == make_article(1, 200).content
+        assert articles[2]['content_length'] == len(articles[2]['content'])
+        assert 'content' not in archive.get_articles()[0]
+
+        finance = archive.get_articles(category="finance")
+        assert [article['url'] for article in finance] == ["https://example.com/2"]
+
+    def test_reads_routed_to_matching_shards(self, db):
+        """Test that time-bounded reads query only the shards that can hold matching rows"""
+        with db.writer() as conn:
+            conn.execute("UPDATE articles SET created_at = datetime(published_ts, 'unixepoch')")
+        archive = db.archive
+        archive.archive_articles(older_than_days=90)
+        queried = []
+        query_shard = archive._query_shard
+        archive._query_shard = lambda shard, *args: queried.append(shard.path) or query_shard(shard, *args)
+
+        since = datetime.now(timezone.utc) - timedelta(days=150)
+        articles = db.get_articles(since=since, include_archive=True)
+        assert [article['url'] for article in articles] == ["https://example.com/3", "https://example.com/2"]
+        assert queried == [archive.archive_path(archive_month(articles[1]['published_ts']))]
+
+        queried.clear()
+        assert [article['url'] for article in db.get_articles(limit=1, include_archive=True)] == [
+            "https://example.com/3"
+        ]
+        assert queried == []
+
+        recent = db.get_recent_articles(hours_back=150 * 24, include_archive=True)
+        assert [article['url'] for article in recent] == ["https://example.com/3", "https://example.com/2"]
+        assert len(queried) == 1
+
+    def test_shard_bounds_cached_until_file_changes(self, db):
+        """Test that shard bounds are read once per file version"""
+        archive = db.archive
+        archive.archive_articles(older_than_days=150)
+        reads = []
+        read_bounds = archive._read_bounds
+        archive._read_bounds = lambda path: reads.append(path) or read_bounds(path)
+
+        shards = archive.shards()
+        assert archive.shards() == shards
+        assert len(reads) == 1
+        assert [shard.articles for shard in shards] == [1]
+
+        stat = os.stat(shards[0].path)
+        os.utime(shards[0].path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert archive.shards() == shards
+        assert len(reads) == 2
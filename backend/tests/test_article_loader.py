@@ -0,0 +1,70 @@
+import pytest
+import os
+import tempfile
+from unittest.mock import patch
+
+from src.db import database_conn
+from src.db.article_loader import ArticleLoader
+from src.db.database_conn import NewsDatabase
+from src.models.news_model import NewsArticle
+
+
+class TestArticleLoader:
+    """Test suite for batched article lookups by id"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def db(self, temp_db_path):
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([NewsArticle(
+            title=f"Article {index}",
+            url=f"https://example.com/{index}",
+            category="sports",
+            summary=f"Summary {index}",
+            published_date="2024-05-01T10:00:00Z",
+            author="Desk",
+            content=f"Body {index}",
+            source="ABC News",
+            tags=["sport"],
+            extracted_at="2024-05-01T10:30:00Z"
+        ) for index in range(1, 6)])
+        yield db
+        db.close()
+
+    def test_get_articles_by_ids(self, db):
+        """Test that articles are read in chunked IN lookups with optional narrow columns"""
+        with patch.object(database_conn, 'LOOKUP_CHUNK_SIZE', 2):
+            articles = db.get_articles_by_ids([1, 3, 5, 99, 3])
+        assert sorted(articles) == [1, 3, 5]
+        assert articles[3]['title'] == "Article 3"
+        assert 'content' not in articles[3]
+
+        narrow = db.get_articles_by_ids([2], columns=('title',), include_content=True)
+        assert narrow == {2: {'id': 2, 'title': "Article 2", 'content': "Body 2"}}
+        assert db.get_articles_by_ids([]) == {}
+        with pytest.raises(ValueError):
+            db.get_articles_by_ids([1], columns=('title; DROP TABLE articles',))
+
+    def test_loader_batches_and_memoizes(self, db):
+        """Test that wanted ids resolve in one query and loaded rows are not fetched again"""
+        loader = ArticleLoader(db, columns=('title',))
+        loader.want([1, 2, 99])
+
+        assert loader.load(1)['title'] == "Article 1"
+        assert loader.load(2)['title'] == "Article 2"
+        assert loader.load(99) is None
+        assert loader.queries == 1
+
+        loader.prime(db.get_articles(limit=2))
+        assert [row['id'] for row in loader.load_many([5, 4, 1])] == [5, 4, 1]
+        assert loader.queries == 1
+        assert [row['title'] for row in loader.load_many([3, 3])] == ["Article 3", "Article 3"]
+        assert loader.queries == 2
@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+import os
+import tempfile
+import time
+
+from src.db.async_database import AsyncNewsDatabase
+from src.db.database_conn import NewsDatabase
+from src.models.news_model import NewsArticle
+
+
+class TestAsyncNewsDatabase:
+    """Test suite for awaitable database access"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def adb(self, temp_db_path):
+        adb = AsyncNewsDatabase(NewsDatabase(temp_db_path))
+        yield adb
+        adb.close()
+
+    @pytest.fixture
+    def sample_article(self):
+        return NewsArticle(
+            title="Test Article Title",
+            url="https://www.abc.net.au/news/test-article",
+            category="sports",
+            summary="This is a test article summary",
+            published_date="2023-01-01T10:00:00Z",
+            author="Test Author",
+            content="This is the main content of the test article",
+            source="ABC News",
+            tags=["sport"],
+            extracted_at="2023-01-01T10:30:00Z"
+        )
+
+    @pytest.mark.asyncio
+    async def test_methods_are_awaitable(self, adb, sample_article):
+        """Test that database methods run through the pool and keep their results"""
+        assert await adb.save_article(sample_article)
+
+        articles = await adb.get_articles(category="sports")
+
+        assert [article['url'] for article in articles] == [sample_article.url]
+        assert adb.db_path == adb.db.db_path
+
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_block_loop_or_queries(self, adb, sample_article):
+        """Test that a slow database call leaves the event loop and other queries free"""
+        await adb.save_article(sample_article)
+
+        slow = asyncio.ensure_future(adb.run(time.sleep, 0.5))
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        articles = await adb.get_articles()
+        elapsed = time.perf_counter() - start
+
+        assert len(articles) == 1
+        assert elapsed < 0.3
+        assert not slow.done()
+        await slow
@@ -0,0 +1,127 @@
+import pytest
+import json
+import os
+import sqlite3
+import tempfile
+
+from src.db.database_conn import NewsDatabase
+from src.services.bulk_ingestion import BulkIngestionService, NdjsonLineSplitter, parse_record
+
+
+def make_record(index, **overrides):
+    """Create a NewsArticle-shaped record"""
+    record = {
+        "title": f"Cricket team wins the final test match {index}",
+        "url": f"https://www.example.com/sport/cricket-final-{index}",
+        "category": "sports",
+        "summary": "The national cricket team won the final test.",
+        "published_date": "2024-05-01T10:00:00Z",
+        "author": "Sports Desk",
+        "content": "The cricket team won the test match after a strong batting performance. " * 5,
+        "source": "Example News",
+        "tags": ["cricket", "sport"],
+        "extracted_at": "2024-05-01T10:30:00Z"
+    }
+    record.update(overrides)
+    return record
+
+
+def to_ndjson(records):
+    return ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestBulkIngestion:
+    """Test suite for NDJSON bulk ingestion"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def service(self, temp_db_path):
+        return BulkIngestionService(NewsDatabase(temp_db_path), batch_size=3)
+
+    def test_line_splitter(self):
+        """Test that lines split across chunks are reassembled"""
+        splitter = NdjsonLineSplitter(max_line_bytes=10)
+
+        lines = list(splitter.feed(b'{"a"')) + list(splitter.feed(b':1}\n{"b":2}\n' + b'x' * 20))
+        lines += list(splitter.feed(b'\n{"c":3}'))
+        lines += list(splitter.close())
+
+        assert lines == [b'{"a":1}', b'{"b":2}', None, b'{"c":3}']
+
+    def test_parse_record_validation(self):
+        """Test that invalid records are rejected with a reason"""
+        article = parse_record(json.dumps(make_record(1, tags="a, b", extracted_at=None)).encode())
+        assert article.tags == ["a", "b"]
+        assert article.extracted_at
+
+        with pytest.raises(ValueError, match="invalid JSON"):
+            parse_record(b'{"title": ')
+        with pytest.raises(ValueError, match="not a JSON object"):
+            parse_record(b'[1, 2]')
+        with pytest.raises(ValueError, match="url"):
+            parse_record(json.dumps(make_record(1, url="")).encode())
+        with pytest.raises(ValueError, match="summary"):
+            parse_record(json.dumps(make_record(1, summary=5)).encode())
+
+    def test_ingest_lines(self, service, temp_db_path):
+        """Test that valid records are saved in batches and invalid ones counted"""
+        records = [make_record(i) for i in range(7)]
+        data = to_ndjson(records) + b'not json\n\n' + to_ndjson([make_record(8, title=None)])
+
+        results = service.ingest_lines(chunked(data, 50))
+
+        assert results['total_records'] == 9
+        assert results['accepted'] == 7
+        assert results['inserted'] == 7
+        assert results['rejected'] == 2
+        assert results['errors'][0].startswith("line 8: invalid JSON")
+        assert results['errors'][1].startswith("line 10: missing required fields: title")
+
+        with sqlite3.connect(temp_db_path) as conn:
+            count, classified = conn.execute(
+                "SELECT COUNT(*), COUNT(classification_method) FROM articles"
+            ).fetchone()
+        assert count == 7
+        assert classified == 7
+
+    def test_reingest_skips_unchanged_records(self, service):
+        """Test that known URLs are updated only when their content changed"""
+        service.ingest_lines([to_ndjson([make_record(1), make_record(2)])])
+        classify = service.classifier.classify
+        classified = []
+        service.classifier.classify = lambda article: classified.append(article.url) or classify(article)
+
+        results = service.ingest_lines([to_ndjson([make_record(2), make_record(3), make_record(3)])])
+
+        assert make_record(2)['url'] not in classified
+        assert results['accepted'] == 3
+        assert results['inserted'] == 1
+        assert results['unchanged'] == 2
+        assert results['updated'] == 0
+
+    @pytest.mark.asyncio
+    async def test_ingest_stream(self, service):
+        """Test that an async byte stream is ingested incrementally"""
+        data = to_ndjson([make_record(i) for i in range(5)])
+
+        async def stream():
+            for chunk in chunked(data, 17):
+                yield chunk
+
+        results = await service.ingest_stream(stream())
+
+        assert results['accepted'] == 5
+        assert results['rejected'] == 0
+        assert sum(results['by_category'].values()) == 5
@@ -0,0 +1,170 @@
+import pytest
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest.mock import patch
+
+from src.db import migrations
+from src.db.content_codec import (
+    CODEC_ZLIB, HEADER_SIZE, ContentCodec, compress, decompress, read_header, train_dictionary
+)
+from src.db.database_conn import NewsDatabase
+from src.models.news_model import NewsArticle
+
+BOILERPLATE = ("Subscribe to our newsletter for the latest headlines every morning. "
+               "Our reporters cover breaking news across Australia and the world. ")
+
+
+def make_article(index, body):
+    return NewsArticle(
+        title=f"Article {index}",
+        url=f"https://example.com/{index}",
+        category="national",
+        summary=f"Summary {index}",
+        published_date="2024-05-01T10:00:00Z",
+        author="Desk",
+        content=body,
+        source="ABC News",
+        tags=["news"],
+        extracted_at="2024-05-01T10:30:00Z"
+    )
+
+
+class TestContentCodec:
+    """Test suite for compressed article body storage"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    def test_round_trip(self):
+        """Test that bodies survive compression with and without a dictionary"""
+        text = "Parliament passed the budget bill late on Thursday. " * 20
+        blob = compress(text)
+        dictionary = BOILERPLATE.encode('utf-8')
+
+        assert read_header(blob) == (CODEC_ZLIB, 0)
+        assert len(blob) < len(text)
+        assert decompress(blob) == text
+        assert decompress(compress(text, dictionary_id=7, dictionary=dictionary), dictionary) == text
+        assert ContentCodec(":memory:").decode(text) == text
+
+    def test_malformed_blob_rejected(self):
+        """Test that truncated or foreign blobs raise ValueError"""
+        blob = compress("Some article text")
+
+        with pytest.raises(ValueError):
+            read_header(blob[:HEADER_SIZE - 1])
+        with pytest.raises(ValueError):
+            read_header(b'XX' + blob[2:])
+
+    def test_dictionary_built_from_shared_sentences(self):
+        """Test that the zlib dictionary holds text repeated across articles and helps compression"""
+        samples = [f"Story {index} about local weather and roads. {BOILERPLATE}" for index in range(5)]
+
+        dictionary = train_dictionary(samples)
+
+        assert b"Subscribe to our newsletter" in dictionary
+        assert b"Story 1" not in dictionary
+        text = f"A new story about the harbour. {BOILERPLATE}"
+        assert len(compress(text, dictionary_id=1, dictionary=dictionary)) < len(compress(text))
+
+    def test_text_bodies_compressed_on_upgrade(self, temp_db_path):
+        """Test that bodies stored as text are compressed by the migration and stay searchable"""
+        older = [migration for migration in migrations.MIGRATIONS if migration[0] <= 12]
+        with patch.object(migrations, 'MIGRATIONS', older), patch.object(migrations, 'LATEST_VERSION', 12):
+            db = NewsDatabase(temp_db_path)
+        with db.writer() as conn:
+            conn.execute("""
+                INSERT INTO articles (title, url, category, source, extracted_at, content_length)
+                VALUES ('Budget', 'https://example.com/1', 'finance', 'ABC News', '2024-05-01', 24)
+            """)
+            conn.execute("INSERT INTO article_bodies (article_id, content) VALUES (1, 'Treasury figures released')")
+        db.close()
+
+        db = NewsDatabase(temp_db_path)
+
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("SELECT typeof(content) FROM article_bodies").fetchone()[0] == 'blob'
+        assert db.get_articles(include_content=True)[0]['content'] == "Treasury figures released"
+        assert len(db.search_articles(["treasury"])) == 1
+
+        with db.writer() as conn:
+            conn.execute("DELETE FROM articles")
+        assert db.search_articles(["treasury"]) == []
+
+    def test_trained_dictionary_used_and_applied_to_stored_bodies(self, temp_db_path):
+        """Test that a trained dictionary compresses new bodies and recompression rewrites old ones"""
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([make_article(index, f"Story {index} on the coast. {BOILERPLATE}")
+                               for index in range(5)])
+
+        dictionary_id = db.train_content_dictionary()
+        assert dictionary_id
+        db.save_article(make_article(9, f"Story 9 on the river. {BOILERPLATE}"))
+
+        with db.reader() as conn:
+            headers = {article_id: read_header(content)[1]
+                       for article_id, content in conn.execute("SELECT article_id, content FROM article_bodies")}
+        assert sorted(headers.values()) == [0, 0, 0, 0, 0, dictionary_id]
+
+        assert db.recompress_article_bodies(batch_size=2) == 5
+        assert db.recompress_article_bodies() == 0
+        bodies = db.get_article_bodies(list(headers))
+        assert bodies[max(headers)] == f"Story 9 on the river. {BOILERPLATE}"
+        assert len(db.search_articles(["coast"])) == 5
+
+        # A new handle picks up the stored dictionary
+        db.close()
+        reopened = NewsDatabase(temp_db_path)
+        assert reopened.content_codec.dictionary_id == dictionary_id
+        assert reopened.get_articles(include_content=True)[0]['content'].endswith(BOILERPLATE)
+
+    def test_schema_usable_without_registered_codec(self, temp_db_path):
+        """Test that plain sqlite3 connections can update and delete articles, reindexed by a rebuild"""
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([make_article(index, f"Story {index} about the harbour bridge. {BOILERPLATE}")
+                               for index in range(2)])
+
+        with closing(sqlite3.connect(temp_db_path)) as conn, conn:
+            assert conn.execute(
+                "SELECT name FROM sqlite_master WHERE sql LIKE '%article_content%'"
+            ).fetchall() == []
+            conn.execute("UPDATE articles SET title = 'Renamed lighthouse' WHERE url = 'https://example.com/0'")
+            conn.execute("DELETE FROM articles WHERE url = 'https://example.com/1'")
+            assert conn.execute("SELECT COUNT(*) FROM article_bodies").fetchone()[0] == 1
+
+        assert [row['title'] for row in db.search_articles(["harbour"])] == ["Renamed lighthouse"]
+        assert db.rebuild_fulltext_index()
+        assert [row['title'] for row in db.search_articles(["lighthouse"])] == ["Renamed lighthouse"]
+        assert db.search_articles(["article"]) == []
+        db.close()
+
+    def test_index_keeps_no_copy_and_follows_updates(self, temp_db_path):
+        """Test that the contentless index drops an article's old text when it is saved again"""
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([make_article(0, f"Ferry timetable changes. {BOILERPLATE}"),
+                               make_article(1, f"Council rates rise. {BOILERPLATE}")])
+        # Saved twice in one batch: only the last version stays indexed
+        db.save_articles_bulk([make_article(0, f"Tram extension opens. {BOILERPLATE}"),
+                               make_article(0, f"Tram extension delayed. {BOILERPLATE}")])
+
+        def indexed(word):
+            with db.reader() as conn:
+                return [row[0] for row in conn.execute("SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?",
+                                                       (word,))]
+
+        assert indexed("ferry") == []
+        assert indexed("opens") == []
+        assert len(indexed("delayed")) == 1
+        assert len(indexed("newsletter")) == 2
+        with db.writer() as conn:
+            assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'articles_fts_content'").fetchone() is None
+            conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('integrity-check')")
+        db.close()
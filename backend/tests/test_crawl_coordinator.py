@@ -0,0 +1,182 @@
+import pytest
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from src.db.database_conn import NewsDatabase
+from src.services.crawl_coordinator import CrawlCoordinator, CrawlJobError, crawl_job_key
+
+
+class TestCrawlCoordinator:
+    """Test suite for lease-based crawl coordination"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def db(self, temp_db_path):
+        return NewsDatabase(temp_db_path)
+
+    def make_job(self, calls, result=None, delay=0.2, error=None):
+        async def job():
+            calls.append(time.time())
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return result or {'total_articles': 5}
+        return job
+
+    def test_job_key_ignores_list_order(self):
+        """Test that equivalent parameters produce the same key"""
+        key = crawl_job_key('extraction', {'sources': ['abc', 'smh'], 'max_articles': 20})
+
+        assert key == crawl_job_key('extraction', {'max_articles': 20, 'sources': ['smh', 'abc']})
+        assert key != crawl_job_key('extraction', {'sources': ['abc', 'smh'], 'max_articles': 10})
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_in_process_share_one_run(self, db):
+        """Test that concurrent callers in one process attach to the first run"""
+        coordinator = CrawlCoordinator(db, poll_interval=0.05)
+        calls = []
+
+        results = await asyncio.gather(*[
+            coordinator.run_exclusive('extraction', {'sources': ['abc']}, self.make_job(calls))
+            for _ in range(5)
+        ])
+
+        assert len(calls) == 1
+        assert results == [{'total_articles': 5}] * 5
+        assert db.get_crawl_lease(crawl_job_key('extraction', {'sources': ['abc']}))['status'] == 'completed'
+
+    @pytest.mark.asyncio
+    async def test_callers_in_other_processes_receive_the_result(self, db, temp_db_path):
+        """Test that a coordinator sharing only the database waits for the owner's result"""
+        owner = CrawlCoordinator(db, poll_interval=0.05)
+        other = CrawlCoordinator(NewsDatabase(temp_db_path), poll_interval=0.05)
+        calls = []
+
+        first = asyncio.ensure_future(owner.run_exclusive('extraction', {}, self.make_job(calls, {'run': 1})))
+        await asyncio.sleep(0.05)
+        second = await other.run_exclusive('extraction', {}, self.make_job(calls, {'run': 2}))
+
+        assert await first == {'run': 1}
+        assert second == {'run': 1}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_finished_job_runs_again(self, db):
+        """Test that a completed lease does not block the next run"""
+        coordinator = CrawlCoordinator(db, poll_interval=0.05)
+        calls = []
+
+        await coordinator.run_exclusive('extraction', {}, self.make_job(calls, delay=0))
+        await coordinator.run_exclusive('extraction', {}, self.make_job(calls, delay=0))
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_stolen(self, db):
+        """Test that a lease left by a dead owner is taken over"""
+        key = crawl_job_key('extraction', {})
+        assert db.try_acquire_crawl_lease(key, 'dead-worker', ttl_seconds=0.1)
+        assert not db.try_acquire_crawl_lease(key, 'other-worker', ttl_seconds=0.1)
+
+        coordinator = CrawlCoordinator(db, poll_interval=0.05)
+        calls = []
+        result = await coordinator.run_exclusive('extraction', {}, self.make_job(calls, delay=0))
+
+        assert result == {'total_articles': 5}
+        assert len(calls) == 1
+        # The dead owner can no longer renew or finish the lease
+        assert not db.renew_crawl_lease(key, 'dead-worker', 10)
+        assert not db.finish_crawl_lease(key, 'dead-worker', result='{}')
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_attached_callers(self, db, temp_db_path):
+        """Test that a failed run is reported to callers waiting in other processes"""
+        owner = CrawlCoordinator(db, poll_interval=0.05)
+        other = CrawlCoordinator(NewsDatabase(temp_db_path), poll_interval=0.05)
+        calls = []
+
+        first = asyncio.ensure_future(
+            owner.run_exclusive('extraction', {}, self.make_job(calls, error=RuntimeError("site down")))
+        )
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(CrawlJobError, match="site down"):
+            await other.run_exclusive('extraction', {}, self.make_job(calls))
+        with pytest.raises(RuntimeError):
+            await first
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_lease_queries_do_not_block_the_event_loop(self, db):
+        """Test that other coroutines keep running while a lease query is in progress"""
+        coordinator = CrawlCoordinator(db, poll_interval=0.05)
+        get_lease = db.get_crawl_lease
+        ticks = []
+
+        def slow_get(*args):
+            time.sleep(0.2)
+            return get_lease(*args)
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.time())
+                await asyncio.sleep(0.02)
+
+        # Another holder makes the coordinator read the lease before waiting
+        assert db.try_acquire_crawl_lease(crawl_job_key('extraction', {}), 'dead-worker', ttl_seconds=0.1)
+        with patch.object(db, 'get_crawl_lease', slow_get):
+            await asyncio.gather(
+                coordinator.run_exclusive('extraction', {}, self.make_job([], delay=0)),
+                ticker()
+            )
+
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+
+    @pytest.mark.asyncio
+    async def test_lease_writes_wait_for_busy_writer_without_blocking(self, db):
+        """Test that lease writes queued behind other writes leave the event loop free"""
+        coordinator = CrawlCoordinator(db, poll_interval=0.05)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.time())
+                await asyncio.sleep(0.02)
+
+        # Hold the writer thread so the lease write has to queue
+        busy = db.submit_write(time.sleep, 0.3)
+        result, _ = await asyncio.gather(
+            coordinator.run_exclusive('extraction', {}, self.make_job([], delay=0)),
+            ticker()
+        )
+
+        assert result == {'total_articles': 5}
+        assert busy.done()
+        assert ticks[-1] - ticks[0] < 0.2
+
+    @pytest.mark.asyncio
+    async def test_unavailable_lease_raises_instead_of_retrying_forever(self, db):
+        """Test that a persistent database error ends the call with CrawlJobError"""
+        coordinator = CrawlCoordinator(db, lease_ttl=0.1, poll_interval=0.02)
+        calls = []
+
+        with patch.object(db, 'try_acquire_crawl_lease', lambda *args: False), \
+                patch.object(db, 'get_crawl_lease', lambda *args: None):
+            with pytest.raises(CrawlJobError, match="could not be acquired"):
+                await asyncio.wait_for(
+                    coordinator.run_exclusive('extraction', {}, self.make_job(calls)), timeout=2
+                )
+
+        assert calls == []
@@ -3,10 +3,13 @@ import sqlite3
 import tempfile
 import os
 import json
+import time
 from unittest.mock import patch, Mock
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from src.db.database_conn import NewsDatabase
+from src.db.database_conn import NewsDatabase, article_content_hash, encode_cursor, get_database
+from src.db import migrations
+from src.db.content_codec import decompress
 from src.models.news_model import NewsArticle
 
 
@@ -39,6 +42,20 @@ class TestNewsDatabase:
             extracted_at="2023-01-01T10:30:00Z"
         )
 
+    def create_database_at(self, path, version, article):
+        """Create a database as an older release left it: migrated to version, with one article"""
+        older = [migration for migration in migrations.MIGRATIONS if migration[0] <= version]
+        with patch.object(migrations, 'MIGRATIONS', older), patch.object(migrations, 'LATEST_VERSION', version):
+            db = NewsDatabase(path)
+        with db.writer() as conn:
+            conn.execute("""
+                INSERT INTO articles (title, url, category, summary, published_date, author, content,
+                                      source, tags, extracted_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (article.title, article.url, article.category, article.summary, article.published_date,
+                  article.author, article.content, article.source, json.dumps(article.tags), article.extracted_at))
+        db.close()
+
     def test_database_initialization_default_path(self):
         """Test database initialization with default path"""
         # Use a temporary directory to avoid creating files in the project
@@ -74,6 +91,44 @@ class TestNewsDatabase:
             table_exists = cursor.fetchone()
             assert table_exists is not None
 
+    def test_migrations_run_once(self, temp_db_path):
+        """Test that migrations are recorded and not re-run when the database is reopened"""
+        db = NewsDatabase(temp_db_path)
+        assert db.schema_version == migrations.LATEST_VERSION
+
+        with sqlite3.connect(temp_db_path) as conn:
+            versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        assert versions == [number for number, _, _ in migrations.MIGRATIONS]
+
+        failing = [(number, description, Mock(side_effect=AssertionError("re-run")))
+                   for number, description, _ in migrations.MIGRATIONS]
+        with patch.object(migrations, 'MIGRATIONS', failing):
+            reopened = NewsDatabase(temp_db_path)
+        assert reopened.fulltext_enabled
+
+    def test_pending_migration_applied_to_existing_database(self, temp_db_path, sample_article):
+        """Test that a newly added migration runs once against a database at the previous version"""
+        NewsDatabase(temp_db_path).save_article(sample_article)
+        added = Mock()
+        pending = migrations.MIGRATIONS + [(migrations.LATEST_VERSION + 1, "test migration", added)]
+
+        with patch.object(migrations, 'MIGRATIONS', pending), \
+             patch.object(migrations, 'LATEST_VERSION', migrations.LATEST_VERSION + 1):
+            db = NewsDatabase(temp_db_path)
+            NewsDatabase(temp_db_path)
+
+        assert added.call_count == 1
+        assert db.schema_version == migrations.LATEST_VERSION + 1
+        assert len(db.get_articles()) == 1
+
+    def test_get_database_is_shared(self, temp_db_path):
+        """Test that get_database hands out one instance per database file"""
+        db = get_database(temp_db_path)
+
+        assert get_database(temp_db_path) is db
+        assert get_database(os.path.join(os.path.dirname(temp_db_path), ".", os.path.basename(temp_db_path))) is db
+        db.close()
+
     def test_init_database_creates_correct_schema(self, temp_db_path):
         """Test that the articles table has the correct schema"""
         db = NewsDatabase(temp_db_path)
@@ -88,7 +143,9 @@ class TestNewsDatabase:
             # Expected columns
             expected_columns = {
                 'id', 'title', 'url', 'category', 'summary', 'published_date',
-                'author', 'content', 'source', 'tags', 'extracted_at', 'created_at'
+                'author', 'content_length', 'source', 'tags', 'extracted_at', 'created_at',
+                'classification_method', 'classification_confidence', 'classification_explanation',
+                'manual_override', 'content_hash', 'published_ts', 'created_ts'
             }
 
             actual_columns = {col[1] for col in columns}
@@ -149,11 +206,14 @@ class TestNewsDatabase:
             assert row['summary'] == sample_article.summary
             assert row['published_date'] == sample_article.published_date
             assert row['author'] == sample_article.author
-            assert row['content'] == sample_article.content
+            assert row['content_length'] == len(sample_article.content)
             assert row['source'] == sample_article.source
             assert json.loads(row['tags']) == sample_article.tags
             assert row['extracted_at'] == sample_article.extracted_at
 
+            body = conn.execute("SELECT content FROM article_bodies WHERE article_id = ?", (row['id'],)).fetchone()
+            assert decompress(body['content']) == sample_article.content
+
     def test_save_article_duplicate_url_replace(self, temp_db_path):
         """Test that saving article with duplicate URL replaces existing"""
         db = NewsDatabase(temp_db_path)
@@ -187,9 +247,11 @@ class TestNewsDatabase:
         )
 
         db.save_article(article1)
+        with sqlite3.connect(temp_db_path) as conn:
+            original_id = conn.execute("SELECT id FROM articles").fetchone()[0]
         db.save_article(article2)
 
-        # Should still only have one article
+        # Should still only have one article, with the same id
         with sqlite3.connect(temp_db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM articles")
@@ -199,9 +261,42 @@ class TestNewsDatabase:
             # Check that the content was updated
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            cursor.execute("SELECT title FROM articles WHERE url = ?", (article1.url,))
+            cursor.execute("SELECT id, title FROM articles WHERE url = ?", (article1.url,))
             row = cursor.fetchone()
             assert row['title'] == "Updated Title"
+            assert row['id'] == original_id
+
+    def test_save_unchanged_article_skips_write(self, temp_db_path, sample_article):
+        """Test that re-saving identical content writes nothing and keeps derived data"""
+        db = NewsDatabase(temp_db_path)
+        db.save_article(sample_article)
+        with sqlite3.connect(temp_db_path) as conn:
+            article_id = conn.execute("SELECT id FROM articles").fetchone()[0]
+        db.save_article_embedding(article_id, [0.5, 0.25])
+
+        recrawled = NewsArticle(**{**sample_article.__dict__, 'extracted_at': "2024-02-01T00:00:00Z"})
+        changed = NewsArticle(**{**sample_article.__dict__, 'url': "https://www.abc.net.au/news/other"})
+        assert db.save_articles_bulk([recrawled, changed, changed]) == ['unchanged', 'inserted', 'unchanged']
+
+        with sqlite3.connect(temp_db_path) as conn:
+            extracted_at = conn.execute("SELECT extracted_at FROM articles WHERE id = ?", (article_id,)).fetchone()[0]
+        assert extracted_at == sample_article.extracted_at
+        assert db.get_article_embedding(article_id) == [0.5, 0.25]
+        assert db.get_content_hashes([sample_article.url, "https://unknown"]) == {
+            sample_article.url: article_content_hash(sample_article)
+        }
+
+    def test_changed_article_drops_derived_data(self, temp_db_path, sample_article):
+        """Test that an update drops embeddings computed from the old content"""
+        db = NewsDatabase(temp_db_path)
+        db.save_article(sample_article)
+        with sqlite3.connect(temp_db_path) as conn:
+            article_id = conn.execute("SELECT id FROM articles").fetchone()[0]
+        db.save_article_embedding(article_id, [0.5, 0.25])
+
+        updated = NewsArticle(**{**sample_article.__dict__, 'content': "Corrected content"})
+        assert db.save_articles_bulk([updated]) == ['updated']
+        assert db.get_article_embedding(article_id) is None
 
     def test_save_article_database_error(self, temp_db_path, sample_article):
         """Test handling of database errors during save"""
@@ -214,6 +309,30 @@ class TestNewsDatabase:
             result = db.save_article(sample_article)
             assert result is False
 
+    def test_save_articles_bulk(self, temp_db_path, sample_article):
+        """Test bulk save outcomes, including a row that fails on its own"""
+        db = NewsDatabase(temp_db_path)
+        db.save_article(sample_article)
+
+        updated_article = NewsArticle(**{**sample_article.__dict__, 'title': "Updated Title"})
+        new_article = NewsArticle(**{**sample_article.__dict__, 'url': "https://www.abc.net.au/news/new-article"})
+        bad_article = NewsArticle(**{**sample_article.__dict__, 'url': "https://www.abc.net.au/news/bad", 'title': None})
+
+        outcomes = db.save_articles_bulk([updated_article, new_article, bad_article])
+
+        assert outcomes == ['updated', 'inserted', 'failed']
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+
+    def test_save_articles_bulk_database_error(self, temp_db_path, sample_article):
+        """Test that a database error fails every article in the batch"""
+        db = NewsDatabase(temp_db_path)
+
+        with patch('sqlite3.connect') as mock_connect:
+            mock_connect.side_effect = sqlite3.Error("Database error")
+
+            assert db.save_articles_bulk([sample_article]) == ['failed']
+
     def test_get_articles_all(self, temp_db_path):
         """Test retrieving all articles"""
         db = NewsDatabase(temp_db_path)
@@ -328,6 +447,195 @@ class TestNewsDatabase:
         articles = db.get_articles(category="nonexistent")
         assert articles == []
 
+    def test_get_articles_keyset_pagination(self, temp_db_path, sample_article):
+        """Test that cursor pages cover every matching article once, newest first"""
+        db = NewsDatabase(temp_db_path)
+        for i in range(7):
+            source = "ABC News" if i % 2 else "The Guardian"
+            db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': f"https://example.com/{i}", 'source': source}))
+
+        with sqlite3.connect(temp_db_path) as conn:
+            # Two articles share a timestamp so the id breaks the tie
+            conn.execute("UPDATE articles SET created_at = '2024-01-0' || (id % 3 + 1) || ' 00:00:00'")
+
+        pages = []
+        cursor = None
+        while True:
+            page = db.get_articles(limit=3, cursor=cursor)
+            pages.append(page)
+            if len(page) < 3:
+                break
+            cursor = encode_cursor(page[-1])
+
+        keys = [(article['created_at'], article['id']) for page in pages for article in page]
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert keys == sorted(set(keys), reverse=True)
+
+        abc_articles = db.get_articles(source="abc news")
+        assert len(abc_articles) == 3
+        assert {article['source'] for article in abc_articles} == {"ABC News"}
+
+        recent = db.get_articles(since="2024-01-02T00:00:00Z", until=datetime(2024, 1, 3))
+        assert {article['created_at'] for article in recent} == {'2024-01-02 00:00:00'}
+
+        with pytest.raises(ValueError):
+            db.get_articles(cursor="not-a-cursor")
+
+    def test_fulltext_search_tracks_changes(self, temp_db_path, sample_article):
+        """Test that the FTS index follows inserts, updates and deletes and ranks by BM25"""
+        db = NewsDatabase(temp_db_path)
+        assert db.fulltext_enabled
+
+        db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': "https://example.com/1",
+                                       'title': "Budget surplus announced", 'content': "Treasury figures"}))
+        db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': "https://example.com/2",
+                                       'title': "Weekend sport", 'content': "The budget for stadiums"}))
+
+        titles = [article['title'] for article in db.search_articles(["budget"])]
+        assert titles == ["Budget surplus announced", "Weekend sport"]
+        assert db.search_articles(["budgets"])  # stemmed
+
+        db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': "https://example.com/2",
+                                       'title': "Weekend sport", 'content': "Stadium crowds"}))
+        with db.writer() as conn:
+            conn.execute("DELETE FROM articles WHERE url = ?", ("https://example.com/1",))
+
+        assert db.search_articles(["budget"]) == []
+        assert [article['title'] for article in db.search_articles(["stadium"])] == ["Weekend sport"]
+
+    def test_fulltext_index_built_for_existing_articles(self, temp_db_path, sample_article):
+        """Test that opening an older database indexes the articles it already has"""
+        self.create_database_at(temp_db_path, 8, sample_article)
+
+        db = NewsDatabase(temp_db_path)
+        assert len(db.search_articles(sample_article.title.split()[:1])) == 1
+        assert db.rebuild_fulltext_index()
+
+    def test_article_bodies_loaded_on_request(self, temp_db_path, sample_article):
+        """Test that list queries return narrow rows and bodies load only when asked for"""
+        db = NewsDatabase(temp_db_path)
+        db.save_article(sample_article)
+
+        article = db.get_articles()[0]
+        assert 'content' not in article
+        assert article['content_length'] == len(sample_article.content)
+        assert 'content' not in db.get_recent_articles(hours_back=24 * 365 * 100)[0]
+
+        assert db.get_articles(include_content=True)[0]['content'] == sample_article.content
+        assert db.get_recent_articles(hours_back=24 * 365 * 100, include_content=True)[0]['content'] == \
+            sample_article.content
+        assert db.get_article_bodies([article['id'], 999]) == {article['id']: sample_article.content}
+
+        with db.writer() as conn:
+            conn.execute("DELETE FROM articles")
+            assert conn.execute("SELECT COUNT(*) FROM article_bodies").fetchone()[0] == 0
+
+    def test_article_bodies_moved_out_of_existing_database(self, temp_db_path, sample_article):
+        """Test that upgrading moves stored content into article_bodies and keeps it searchable"""
+        self.create_database_at(temp_db_path, 11, sample_article)
+
+        db = NewsDatabase(temp_db_path)
+
+        with db.reader() as conn:
+            assert 'content' not in {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        article = db.get_articles(include_content=True)[0]
+        assert article['content'] == sample_article.content
+        assert article['content_length'] == len(sample_article.content)
+        assert len(db.search_articles(["main"])) == 1
+
+        db.save_article(NewsArticle(**{**sample_article.__dict__, 'content': "Rewritten body about rainfall"}))
+        assert db.search_articles(["main"]) == []
+        assert [found['id'] for found in db.search_articles(["rainfall"])] == [article['id']]
+        assert db.rebuild_fulltext_index()
+        assert len(db.search_articles(["rainfall"])) == 1
+
+    def test_get_recent_articles_window(self, temp_db_path, sample_article):
+        """Test that recent articles are selected by publication time, not insertion order"""
+        db = NewsDatabase(temp_db_path)
+        now = datetime.now(timezone.utc)
+        for index, hours_ago in enumerate([1, 30, 3]):
+            published = (now - timedelta(hours=hours_ago)).isoformat()
+            db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': f"https://example.com/{index}",
+                                           'published_date': published}))
+        db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': "https://example.com/undated",
+                                       'published_date': "", 'category': "finance"}))
+
+        recent = db.get_recent_articles(hours_back=4)
+        assert [article['url'] for article in recent] == [
+            "https://example.com/undated", "https://example.com/0", "https://example.com/2"
+        ]
+        assert [a['url'] for a in db.get_recent_articles(hours_back=4, category="sports", limit=1)] == [
+            "https://example.com/0"
+        ]
+
+        with sqlite3.connect(temp_db_path) as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM articles WHERE category = ? AND published_ts >= ? "
+                "ORDER BY published_ts DESC", ("sports", 0)))
+        assert "idx_articles_category_published_ts" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_timestamp_columns_backfilled(self, temp_db_path, sample_article):
+        """Test that opening an older database fills in the epoch timestamp columns"""
+        self.create_database_at(temp_db_path, 9, sample_article)
+
+        NewsDatabase(temp_db_path)
+
+        with sqlite3.connect(temp_db_path) as conn:
+            published_ts, created_ts = conn.execute("SELECT published_ts, created_ts FROM articles").fetchone()
+        assert published_ts == int(datetime(2023, 1, 1, 10, tzinfo=timezone.utc).timestamp())
+        assert abs(created_ts - time.time()) < 60
+
+    def test_stats_counters_match_table_scans(self, temp_db_path, sample_article):
+        """Test that the trigger-maintained counters follow inserts, updates and deletes"""
+        db = NewsDatabase(temp_db_path)
+
+        def scanned_stats():
+            with db.reader() as conn:
+                return {
+                    'total_articles': conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+                    'classified_articles': conn.execute(
+                        "SELECT COUNT(*) FROM articles WHERE classification_method IS NOT NULL").fetchone()[0],
+                    'by_category': dict(conn.execute(
+                        "SELECT category, COUNT(*) FROM articles GROUP BY category ORDER BY COUNT(*) DESC")),
+                    'by_method': dict(conn.execute("""
+                        SELECT classification_method, COUNT(*) FROM articles
+                        WHERE classification_method IS NOT NULL GROUP BY classification_method""")),
+                    'avg_confidence_by_category': {cat: round(conf, 3) for cat, conf in conn.execute("""
+                        SELECT category, AVG(classification_confidence) FROM articles
+                        WHERE classification_confidence IS NOT NULL GROUP BY category""")},
+                }
+
+        result = Mock(category="finance", method_used="keyword", confidence=0.8, explanation="")
+        for index in range(3):
+            db.save_article(NewsArticle(**{**sample_article.__dict__, 'url': f"https://example.com/{index}"}))
+        db.save_article_with_classification(
+            NewsArticle(**{**sample_article.__dict__, 'url': "https://example.com/3"}), result)
+        with db.writer() as conn:
+            conn.execute("""UPDATE articles SET category = 'music', classification_method = 'manual',
+                            classification_confidence = 0.5 WHERE url = ?""", ("https://example.com/0",))
+            conn.execute("DELETE FROM articles WHERE url = ?", ("https://example.com/1",))
+
+        assert db.get_classification_stats() == scanned_stats()
+        assert db.get_classification_stats()['by_category'] == {'sports': 1, 'finance': 1, 'music': 1}
+
+        db.save_article_embedding(1, [0.5, 0.25])
+        db.save_article_embedding(1, [0.25, 0.5])
+        db.save_chat_session("s1", title="First")
+        db.save_chat_session("s1", title="Renamed")
+        db.save_chat_message("s1", "user", "hello")
+        db.save_chat_message("s1", "assistant", "hi")
+        counters = db.get_stats_counters()
+        assert counters['embedding_model'] == {'all-MiniLM-L6-v2': (1, 0)}
+        assert counters['chat_sessions'] == {'': (1, 0)}
+        assert counters['chat_role'] == {'user': (1, 0), 'assistant': (1, 0)}
+
+        # Re-running the migration recounts from the tables
+        expected = db.get_stats_counters()
+        with sqlite3.connect(temp_db_path) as conn:
+            migrations._add_stats_counters(conn)
+        assert db.get_stats_counters() == expected
+
     def test_database_connection_context_manager(self, temp_db_path):
         """Test that database connections are properly managed"""
         db = NewsDatabase(temp_db_path)
@@ -342,6 +650,61 @@ class TestNewsDatabase:
             count = cursor.fetchone()[0]
             assert count == 0  # Empty database
 
+    def test_connection_pool_uses_wal(self, temp_db_path):
+        """Test that the database runs in WAL mode with tuned pooled connections"""
+        db = NewsDatabase(temp_db_path)
+
+        with db.reader() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+        db.close()
+
+    def test_readers_not_blocked_by_writer(self, temp_db_path, sample_article):
+        """Test that reads proceed while a write transaction is open"""
+        db = NewsDatabase(temp_db_path)
+        db.save_article(sample_article)
+
+        with db.writer() as conn:
+            conn.execute("UPDATE articles SET title = 'Being updated'")
+
+            # Readers see the last committed state instead of waiting
+            articles = db.get_articles()
+            assert len(articles) == 1
+            assert articles[0]['title'] == sample_article.title
+
+        assert db.get_articles()[0]['title'] == 'Being updated'
+        db.close()
+
+    def test_writer_rolls_back_on_error(self, temp_db_path, sample_article):
+        """Test that a failed write block leaves no partial changes"""
+        db = NewsDatabase(temp_db_path)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.writer() as conn:
+                conn.execute(
+                    "INSERT INTO articles (title, url, category, source, extracted_at) VALUES ('a', 'u1', 'c', 's', 'e')"
+                )
+                conn.execute(
+                    "INSERT INTO articles (title, url, category, source, extracted_at) VALUES ('a', 'u1', 'c', 's', 'e')"
+                )
+
+        assert db.get_articles() == []
+        db.close()
+
+    def test_read_pool_size(self, temp_db_path):
+        """Test that no more readers than the configured pool size are opened"""
+        db = NewsDatabase(temp_db_path, read_pool_size=2)
+
+        with db.reader() as first, db.reader() as second:
+            assert first is not second
+        with db.reader() as again:
+            assert again in (first, second)
+
+        assert db.pool._reader_count == 2
+        db.close()
+
     def test_database_file_permissions(self, temp_db_path):
         """Test that database file is created with proper permissions"""
         db = NewsDatabase(temp_db_path)
@@ -0,0 +1,80 @@
+import pytest
+import json
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+
+from src.db.database_conn import NewsDatabase
+from src.db.embedding_codec import HEADER_SIZE, decode_embedding, encode_embedding, read_header
+from src.services.chatbot.embedding_service import EmbeddingService, embedding_array
+
+
+class TestEmbeddingCodec:
+    """Test suite for binary embedding storage"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    def test_round_trip(self):
+        """Test that vectors survive encoding as float32 with a header"""
+        vector = [0.5, -1.25, 3.0, 0.0]
+        blob = encode_embedding(vector)
+
+        assert len(blob) == HEADER_SIZE + 4 * len(vector)
+        assert read_header(blob)[1] == 4
+        assert decode_embedding(blob) == vector
+        assert embedding_array(blob).tolist() == vector
+        assert decode_embedding(json.dumps(vector)) == vector
+
+    def test_malformed_blob_rejected(self):
+        """Test that truncated or foreign blobs raise ValueError"""
+        blob = encode_embedding([1.0, 2.0])
+
+        with pytest.raises(ValueError):
+            read_header(blob[:-1])
+        with pytest.raises(ValueError):
+            read_header(b'XX' + blob[2:])
+
+    def test_json_embeddings_migrated(self, temp_db_path):
+        """Test that JSON text embeddings from older databases are converted"""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("""
+                CREATE TABLE article_embeddings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_id INTEGER NOT NULL,
+                    embedding_vector TEXT NOT NULL,
+                    embedding_model TEXT NOT NULL DEFAULT 'all-MiniLM-L6-v2',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(article_id, embedding_model)
+                )
+            """)
+            conn.execute("INSERT INTO article_embeddings (article_id, embedding_vector) VALUES (1, ?)",
+                         (json.dumps([0.25, 0.5]),))
+
+        db = NewsDatabase(temp_db_path)
+
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("SELECT typeof(embedding_vector) FROM article_embeddings").fetchone()[0] == 'blob'
+        assert db.get_article_embedding(1) == [0.25, 0.5]
+
+    def test_similarities_match_cosine(self):
+        """Test the vectorised cosine similarity against a direct computation"""
+        service = EmbeddingService.__new__(EmbeddingService)
+        vectors = [[1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 0.0, 0.0]]
+        articles = [
+            {'id': i, 'title': '', 'summary': '', 'category': '', 'source': '', 'url': '',
+             'embedding': embedding_array(encode_embedding(vector))}
+            for i, vector in enumerate(vectors)
+        ]
+
+        scores = [result['similarity_score'] for result in service._calculate_similarities([1.0, 0.0, 0.0], articles)]
+
+        assert scores == pytest.approx([1.0, 1 / np.sqrt(2), 0.0])
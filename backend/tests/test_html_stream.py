@@ -0,0 +1,131 @@
+import pytest
+from unittest.mock import Mock
+
+from bs4 import BeautifulSoup
+
+from src.scrapers.aussie_news_extractor import GuardianAUExtractor, SMHExtractor
+from src.scrapers.html_stream import ContentBoundaryTracker, read_html
+
+
+def mock_stream_response(body, chunk_size=32, content_length=None, charset='utf-8'):
+    """Create a mock aiohttp response recording how many chunks were read"""
+    response = Mock()
+    response.url = "https://www.abc.net.au/news/test"
+    response.charset = charset
+    response.content_length = content_length
+    response.chunks_read = 0
+
+    async def iter_chunked(size):
+        for start in range(0, len(body), chunk_size):
+            response.chunks_read += 1
+            yield body[start:start + chunk_size]
+
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+class TestHtmlStream:
+    """Test suite for streaming HTML reads"""
+
+    @pytest.fixture
+    def article_html(self):
+        """Article page with related content and scripts after the body"""
+        paragraphs = ''.join(f'<p>Paragraph {i} of the story with enough words to count.</p>' for i in range(8))
+        return (
+            '<html><head><meta name="description" content="Summary"></head><body>'
+            '<article><h1>Title</h1>'
+            f'<div data-component="Text">{paragraphs}</div></article>'
+            '<div class="related"><p>Related story</p></div>'
+            + '<script>var x = 1;</script>' * 200 +
+            '</body></html>'
+        )
+
+    @pytest.mark.asyncio
+    async def test_stops_after_content_closes(self, article_html):
+        """Test that reading stops once the content container has closed"""
+        body = article_html.encode('utf-8')
+        response = mock_stream_response(body)
+        tracker = ContentBoundaryTracker(['[data-component="Text"] p', '[data-component="Text"]'])
+
+        html = await read_html(response, tracker)
+
+        assert tracker.done
+        assert 'Paragraph 7' in html
+        assert '<script>' not in html
+        assert response.chunks_read * 32 < len(body)
+
+    @pytest.mark.asyncio
+    async def test_short_teaser_does_not_stop_reading(self):
+        """Test that a content block with too little text keeps the read going"""
+        html_content = (
+            '<html><body><aside><div class="story-body">Teaser</div></aside>'
+            '<article><div class="story-body">' + 'Full story text. ' * 30 + '</div></article>'
+            '<footer>' + 'Footer link. ' * 100 + '</footer></body></html>'
+        )
+        tracker = ContentBoundaryTracker(['.story-body'])
+
+        html = await read_html(mock_stream_response(html_content.encode('utf-8')), tracker)
+
+        assert tracker.done
+        assert 'Full story text.' in html
+        assert len(html) < len(html_content)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("extractor_class,block", [
+        (SMHExtractor, '<div data-component="TextBlock">{}</div>'),
+        (GuardianAUExtractor, '<div data-component="text-block">{}</div>'),
+    ])
+    @pytest.mark.parametrize("wrapper", ['article', 'div'])
+    async def test_sibling_content_blocks_read_to_the_end(self, extractor_class, block, wrapper):
+        """Test that a selector matching repeated sibling blocks keeps reading until their container closes"""
+        extractor = extractor_class(Mock())
+        blocks = '<figure><img src="/ad.jpg"></figure>'.join(
+            block.format(f'<p>Block {i} of the story, long enough to pass the content threshold alone. '
+                         f'It carries several sentences of reporting on the budget.</p>' * 2)
+            for i in range(3)
+        )
+        html_content = (
+            f'<html><body><{wrapper} class="story"><h1>Budget passes</h1>{blocks}'
+            '<span class="author-name">Jane Reporter</span>'
+            f'<a class="topics" href="/topic/budget">Budget</a></{wrapper}>'
+            '<footer>' + '<script>var x = 1;</script>' * 100 + '</footer></body></html>'
+        )
+        tracker = ContentBoundaryTracker(extractor.selectors['content'])
+
+        html = await read_html(mock_stream_response(html_content.encode('utf-8')), tracker)
+
+        assert tracker.done
+        assert len(html) < len(html_content)
+        content = extractor._extract_content(BeautifulSoup(html, 'html.parser'))
+        assert all(f"Block {i} of the story" in content for i in range(3))
+        assert 'Jane Reporter' in html
+
+    @pytest.mark.asyncio
+    async def test_reads_whole_page_without_content_match(self):
+        """Test that pages without matching containers are read completely"""
+        html_content = '<html><body><p>No containers here</p></body></html>'
+        tracker = ContentBoundaryTracker(['article'])
+
+        html = await read_html(mock_stream_response(html_content.encode('utf-8')), tracker)
+
+        assert not tracker.done
+        assert html == html_content
+
+    @pytest.mark.asyncio
+    async def test_byte_cap(self, article_html):
+        """Test that oversized pages are rejected, with or without Content-Length"""
+        body = article_html.encode('utf-8')
+
+        assert await read_html(mock_stream_response(body, content_length=len(body)), max_bytes=1024) is None
+
+        response = mock_stream_response(body)
+        assert await read_html(response, max_bytes=1024) is None
+        assert response.chunks_read == 1024 // 32 + 1
+
+    @pytest.mark.asyncio
+    async def test_incremental_decoding(self):
+        """Test that multi-byte characters split across chunks decode correctly"""
+        html_content = '<p>Café – “quoted” 東京</p>'
+        response = mock_stream_response(html_content.encode('utf-8'), chunk_size=3, charset=None)
+
+        assert await read_html(response) == html_content
@@ -0,0 +1,80 @@
+import pytest
+
+from src.scrapers.link_harvester import AnchorCollector, harvest_anchors, parse_selector
+
+
+class TestLinkHarvester:
+    """Test suite for single-pass anchor harvesting and link selectors"""
+
+    @pytest.fixture
+    def html_content(self):
+        """Category page with nested, unclosed and void elements"""
+        return """
+        <html>
+            <body>
+                <div class="ContentHub_articles wide">
+                    <ul>
+                        <li><a class="Card_link" href="/news/2024-05-01/story-one/103812345">One</a><br><img src="x.png"></li>
+                    </ul>
+                </div>
+                <h3><a href='/news/story-two'>Two</a></h3>
+                <a href="/news/story-three" data-component="Link">Three</a>
+                <p>Unclosed paragraph <a href="/other/page">Other</a>
+                <a>No href</a>
+                <a href="  ">Blank href</a>
+            </body>
+        </html>
+        """
+
+    def test_harvest_anchors(self, html_content):
+        """Test that every anchor with an href is collected with its ancestors"""
+        anchors = harvest_anchors(html_content)
+
+        assert [anchor.href for anchor in anchors] == [
+            "/news/2024-05-01/story-one/103812345",
+            "/news/story-two",
+            "/news/story-three",
+            "/other/page"
+        ]
+        assert [element.tag for element in anchors[0].ancestors] == ['html', 'body', 'div', 'ul', 'li']
+        assert [element.tag for element in anchors[1].ancestors] == ['html', 'body', 'h3']
+        assert [element.tag for element in anchors[2].ancestors] == ['html', 'body']
+
+    def test_selectors(self, html_content):
+        """Test that selectors match the same anchors as CSS would"""
+        anchors = harvest_anchors(html_content)
+
+        def selected(selector):
+            return [anchor.href for anchor in anchors if parse_selector(selector).matches(anchor)]
+
+        assert selected('a[href*="/news/"]') == [
+            "/news/2024-05-01/story-one/103812345",
+            "/news/story-two",
+            "/news/story-three"
+        ]
+        assert selected('.ContentHub_articles a') == ["/news/2024-05-01/story-one/103812345"]
+        assert selected('.Card_link') == ["/news/2024-05-01/story-one/103812345"]
+        assert selected('div[class~="wide"] li a') == ["/news/2024-05-01/story-one/103812345"]
+        assert selected('h3 a') == ["/news/story-two"]
+        assert selected('div h3 a') == []
+        assert selected('[data-component="Link"]') == ["/news/story-three"]
+        assert selected('a[href^="/other"]') == ["/other/page"]
+        assert selected('a[href$="-two"]') == ["/news/story-two"]
+
+    def test_incremental_feed(self, html_content):
+        """Test that feeding the page in chunks gives the same anchors"""
+        collector = AnchorCollector()
+        for start in range(0, len(html_content), 7):
+            collector.feed(html_content[start:start + 7])
+        collector.close()
+
+        assert [anchor.href for anchor in collector.anchors] == [
+            anchor.href for anchor in harvest_anchors(html_content)
+        ]
+
+    def test_unsupported_selector(self):
+        """Test that selectors outside the supported subset are rejected"""
+        with pytest.raises(ValueError):
+            parse_selector('ul > li a')
+        with pytest.raises(ValueError):
+            parse_selector('a:first-child')
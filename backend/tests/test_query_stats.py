@@ -0,0 +1,112 @@
+import pytest
+import logging
+import os
+import sqlite3
+import tempfile
+
+from src.db.database_conn import ConnectionPool, NewsDatabase
+from src.db.query_stats import fingerprint
+from src.models.news_model import NewsArticle
+
+
+class TestQueryStats:
+    """Test suite for SQL statement instrumentation"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def db(self, temp_db_path):
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([NewsArticle(
+            title=f"Article {index}",
+            url=f"https://example.com/{index}",
+            category="sports",
+            summary="Summary",
+            published_date="2024-05-01T10:00:00Z",
+            author="Desk",
+            content="Body text",
+            source="ABC News",
+            tags=["sport"],
+            extracted_at="2024-05-01T10:30:00Z"
+        ) for index in range(3)])
+        db.query_stats.reset()
+        yield db
+        db.close()
+
+    def entry(self, db, prefix):
+        return next(entry for entry in db.query_stats.snapshot() if entry['statement'].startswith(prefix))
+
+    def test_fingerprint_groups_literals(self):
+        """Test that statements differing only in literals and IN list length share a fingerprint"""
+        assert fingerprint("SELECT * FROM articles\n   WHERE id = 5 AND url = 'x''y'") == \
+            "SELECT * FROM articles WHERE id = ? AND url = ?"
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == fingerprint("SELECT 1 FROM t WHERE id IN (?)")
+        assert fingerprint("SAVEPOINT writer_2") == "SAVEPOINT ?"
+
+    def test_statements_timed_with_rows(self, db):
+        """Test that pooled queries are counted per statement with the rows they returned"""
+        for category in ("sports", "finance"):
+            db.get_articles(category=category)
+        with db.reader() as conn:
+            assert conn.execute("SELECT id FROM articles WHERE url = ?", ("https://example.com/1",)).fetchone()
+            list(conn.execute("SELECT id FROM articles ORDER BY id"))
+
+        listing = self.entry(db, "SELECT a.* FROM articles a")
+        assert listing['count'] == 2
+        assert listing['rows'] == 3
+        assert 0 < listing['mean_ms'] <= listing['p99_ms'] <= listing['max_ms']
+        assert self.entry(db, "SELECT id FROM articles WHERE url")['rows'] == 1
+        assert self.entry(db, "SELECT id FROM articles ORDER BY")['rows'] == 3
+        assert listing['plan'] is None
+
+        db.query_stats.reset()
+        assert db.query_stats.snapshot() == []
+
+    def test_slow_statement_logged_with_plan(self, db, caplog):
+        """Test that statements over the threshold are logged once with their query plan"""
+        db.query_stats.slow_query_ms = 0
+        with caplog.at_level(logging.WARNING, logger="src.db.query_stats"):
+            db.get_articles(category="sports")
+            db.get_articles(category="sports")
+
+        listing = self.entry(db, "SELECT a.* FROM articles a")
+        assert listing['slow'] == 2
+        assert any("idx_" in step for step in listing['plan'])
+        assert sum("Slow query" in record.message and "FROM articles a" in record.message
+                   for record in caplog.records) == 1
+
+    def test_disabled_stats_leave_plain_connections(self, temp_db_path):
+        """Test that a pool without QueryStats opens ordinary connections"""
+        pool = ConnectionPool(temp_db_path)
+        try:
+            with pool.reader() as conn:
+                assert type(conn) is sqlite3.Connection
+        finally:
+            pool.close()
+
+    def test_slow_batch_explained_with_its_parameters(self, db):
+        """Test that executemany statements get a query plan bound with their first parameter row"""
+        db.query_stats.slow_query_ms = 0
+        db.save_articles_bulk([NewsArticle(
+            title="Late article",
+            url="https://example.com/late",
+            category="sports",
+            summary="Summary",
+            published_date="2024-05-02T10:00:00Z",
+            author="Desk",
+            content="Body text",
+            source="ABC News",
+            tags=["sport"],
+            extracted_at="2024-05-02T10:30:00Z"
+        )])
+
+        bodies = self.entry(db, "INSERT INTO article_bodies")
+        assert bodies['count'] == 1
+        assert any("articles" in step for step in bodies['plan'])
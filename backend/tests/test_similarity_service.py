@@ -0,0 +1,117 @@
+import pytest
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from src.db.database_conn import NewsDatabase
+from src.models.news_model import NewsArticle
+from src.services.similarity.similarity_service import SimilarityService
+
+
+def make_article(index, title, source, hours_ago=1):
+    published = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return NewsArticle(
+        title=title,
+        url=f"https://example.com/{source.replace(' ', '-').lower()}/{index}",
+        category="finance",
+        summary=title,
+        published_date=published.isoformat(),
+        author="Desk",
+        content=f"{title}. The Reserve Bank decision surprised economists across the country.",
+        source=source,
+        tags=["rates"],
+        extracted_at=published.isoformat()
+    )
+
+
+class TestSimilarityService:
+    """Test suite for similarity detection persistence"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def service(self, temp_db_path):
+        db = NewsDatabase(temp_db_path)
+        db.save_articles_bulk([
+            make_article(1, "Reserve Bank raises interest rates to 4.5 percent", "ABC News"),
+            make_article(2, "Reserve Bank raises interest rates to 4.5 percent", "The Guardian"),
+            make_article(3, "Local football club wins grand final in thriller", "SMH"),
+        ])
+        return SimilarityService(db)
+
+    def test_detection_stores_similarities_and_clusters(self, service, temp_db_path):
+        """Test that detected pairs and clusters are written and read back"""
+        metrics = service.detect_all_similarities()
+
+        assert metrics.similar_pairs_found == 1
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM article_similarities").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM article_clusters").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM cluster_articles").fetchone()[0] == 1
+
+        clusters = service.get_article_clusters()
+        assert len(clusters) == 1
+        assert clusters[0]['article_count'] == 2
+        assert set(clusters[0]['sources_covered']) == {"ABC News", "The Guardian"}
+        assert clusters[0]['main_article']['title'].startswith("Reserve Bank")
+
+    def test_detection_rerun_replaces_stored_rows(self, service, temp_db_path):
+        """Test that running detection again updates rather than duplicates"""
+        service.detect_all_similarities()
+        service.detect_all_similarities()
+
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM article_similarities").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM article_clusters").fetchone()[0] == 1
+            assert conn.execute("SELECT COUNT(*) FROM cluster_articles").fetchone()[0] == 1
+
+    def test_detection_ignores_articles_outside_window(self, service):
+        """Test that detection only compares articles published within hours_back"""
+        service.db.save_article(make_article(4, "Reserve Bank raises interest rates to 4.5 percent",
+                                             "SBS News", hours_ago=72))
+
+        metrics = service.detect_all_similarities(hours_back=48)
+
+        assert metrics.similar_pairs_found == 1
+
+    def test_clusters_read_in_two_queries(self, service):
+        """Test that clusters and all their articles are loaded with set-based queries"""
+        service.detect_all_similarities()
+
+        statements = []
+        with service.db.reader() as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            clusters = service.get_article_clusters(limit=100)
+        finally:
+            with service.db.reader() as conn:
+                conn.set_trace_callback(None)
+
+        assert len(clusters) == 1
+        assert len(clusters[0]['similar_articles']) == 1
+        assert len(statements) == 2
+
+    def test_find_similar_articles_batches_lookups(self, service):
+        """Test that the target and matched articles are loaded without per-article queries"""
+        with service.db.reader() as conn:
+            target_id = conn.execute("SELECT id FROM articles WHERE source = 'ABC News'").fetchone()[0]
+
+        statements = []
+        with service.db.reader() as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            similar = service.find_similar_articles(target_id)
+        finally:
+            with service.db.reader() as conn:
+                conn.set_trace_callback(None)
+
+        assert [item['article']['source'] for item in similar] == ["The Guardian"]
+        assert len(statements) == 2
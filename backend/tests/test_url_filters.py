@@ -0,0 +1,85 @@
+import pytest
+
+from src.scrapers.url_filters import UrlFilter, UrlFilterRules, compile_rules
+
+
+class TestUrlFilter:
+    """Test suite for compiled URL filter rules"""
+
+    @pytest.fixture
+    def rules(self):
+        """Rules exercising every kind of rule"""
+        return UrlFilterRules(
+            exclude_substrings=('/topic/', '/news/sport/', '/news/sport/live', '#'),
+            exclude_suffixes=('/sport', '/sport/', '/about'),
+            exclude_patterns=(r'/page/\d+$',),
+            require_patterns=(r'abc\.net\.au', r'/news/'),
+            include_patterns=(r'/\d{8,}$', r'/(?=[^/]*-[^/]*-)[^/]{9,}$'),
+            min_length=30
+        )
+
+    def test_accepts_valid_urls(self, rules):
+        """Test that URLs passing every rule are accepted"""
+        url_filter = UrlFilter(rules)
+
+        assert url_filter.accepts("https://www.abc.net.au/news/2024-05-01/some-story-title/103812345")
+        assert url_filter.accepts("https://www.abc.net.au/news/business/long-article-title-here")
+
+    def test_rejection_reasons(self, rules):
+        """Test that each rejection is attributed to the rule that fired"""
+        url_filter = UrlFilter(rules)
+
+        assert url_filter.rejection_reason("https://abc.net.au/x") == "min_length"
+        assert url_filter.rejection_reason("https://www.example.com/news/a-long-story-title") == "require:abc.net.au"
+        assert url_filter.rejection_reason("https://www.abc.net.au/other/a-long-story-title") == "require:/news/"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/topic/a-long-story-title") == "exclude:/topic/"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/sport/a-long-story-title") == "exclude:/news/sport/"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/item-a-b#top") == "exclude:#"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/health/about") == "suffix:/about"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/page/12345678") == r"pattern:/page/\d+$"
+        assert url_filter.rejection_reason("https://www.abc.net.au/news/health/story") == "no_include_match"
+
+    def test_overlapping_suffixes(self):
+        """Test that a suffix which is a prefix of another suffix keeps both"""
+        url_filter = UrlFilter(UrlFilterRules(exclude_suffixes=('/sport', '/sport/')))
+
+        assert not url_filter.accepts("https://www.smh.com.au/sport")
+        assert not url_filter.accepts("https://www.smh.com.au/sport/")
+        assert url_filter.accepts("https://www.smh.com.au/sport/a-story-p5abc.html")
+
+    def test_rejection_counts(self, rules):
+        """Test that per-rule rejection counts are recorded"""
+        url_filter = UrlFilter(rules)
+
+        urls = [
+            "https://www.abc.net.au/news/topic/a-long-story-title",
+            "https://www.abc.net.au/news/topic/another-story-title",
+            "https://www.abc.net.au/news/health/story",
+            "https://www.abc.net.au/news/2024-05-01/some-story-title/103812345"
+        ]
+        accepted = url_filter.filter(urls)
+
+        assert accepted == ["https://www.abc.net.au/news/2024-05-01/some-story-title/103812345"]
+
+        stats = url_filter.get_stats()
+        assert stats['checked'] == 4
+        assert stats['accepted'] == 1
+        assert stats['rejected'] == 3
+        assert stats['rejections_by_rule'] == {'exclude:/topic/': 2, 'no_include_match': 1}
+
+        url_filter.reset_stats()
+        assert url_filter.get_stats()['checked'] == 0
+
+    def test_empty_rules_accept_everything(self):
+        """Test that a filter without rules accepts any URL"""
+        url_filter = UrlFilter(UrlFilterRules())
+
+        assert url_filter.accepts("")
+        assert url_filter.accepts("https://www.abc.net.au/news/anything")
+
+    def test_rules_are_compiled_once(self, rules):
+        """Test that equal rule sets share one compiled form"""
+        equal_rules = UrlFilterRules(**rules.__dict__)
+
+        assert compile_rules(rules) is compile_rules(equal_rules)
+        assert UrlFilter(rules)._compiled is UrlFilter(equal_rules)._compiled
@@ -0,0 +1,116 @@
+import pytest
+import os
+import sqlite3
+import tempfile
+import threading
+
+from src.db.async_database import AsyncNewsDatabase
+from src.db.database_conn import ConnectionPool, NewsDatabase, WriteQueue
+
+
+class TestWriteQueue:
+    """Test suite for the single-writer write queue"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database file for testing"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_file.close()
+        yield temp_file.name
+        if os.path.exists(temp_file.name):
+            os.unlink(temp_file.name)
+
+    @pytest.fixture
+    def db(self, temp_db_path):
+        db = NewsDatabase(temp_db_path)
+        yield db
+        db.close()
+
+    def insert_session(self, db, session_id, fail=False):
+        with db.writer() as conn:
+            conn.execute("INSERT INTO chat_sessions (id) VALUES (?)", (session_id,))
+        if fail:
+            raise ValueError("operation failed")
+        return session_id
+
+    def hold_writer(self, db):
+        """Occupy the writer thread until the returned event is set"""
+        release, started = threading.Event(), threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+        future = db.submit_write(blocker)
+        started.wait(5)
+        return release, future
+
+    def session_ids(self, db):
+        with db.reader() as conn:
+            return {row[0] for row in conn.execute("SELECT id FROM chat_sessions")}
+
+    def test_queued_writes_share_one_transaction(self, db):
+        """Test that writes waiting behind the writer are committed together"""
+        statements = []
+        with db.writer() as conn:
+            conn.set_trace_callback(statements.append)
+        release, blocker = self.hold_writer(db)
+
+        futures = [db.submit_write(self.insert_session, db, f"s{index}") for index in range(10)]
+        release.set()
+
+        assert [future.result(5) for future in futures] == [f"s{index}" for index in range(10)]
+        blocker.result(5)
+        assert statements.count("BEGIN IMMEDIATE") == 2  # the blocker, then one group
+
+    def test_failed_operation_only_undoes_itself(self, db):
+        """Test that a failing operation is rolled back without its batch"""
+        release, _ = self.hold_writer(db)
+        ok = db.submit_write(self.insert_session, db, "kept")
+        failed = db.submit_write(self.insert_session, db, "dropped", fail=True)
+        later = db.submit_write(self.insert_session, db, "also-kept")
+        release.set()
+
+        assert ok.result(5) == "kept" and later.result(5) == "also-kept"
+        with pytest.raises(ValueError):
+            failed.result(5)
+        assert self.session_ids(db) == {"kept", "also-kept"}
+
+    def test_full_queue_pushes_back(self, temp_db_path):
+        """Test that producers block and then time out while the queue is full"""
+        NewsDatabase(temp_db_path).close()
+        write_queue = WriteQueue(ConnectionPool(temp_db_path, timeout=0.2), max_pending=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+        write_queue.submit(blocker)
+        started.wait(5)
+        write_queue.submit(lambda: None)
+
+        with pytest.raises(sqlite3.OperationalError):
+            write_queue.submit(lambda: None)
+        release.set()
+        write_queue.close()
+
+    def test_write_methods_run_on_writer_thread(self, db):
+        """Test that decorated write methods run on the writer thread and nest inline"""
+        assert db.save_chat_session("s1")
+        assert db.save_chat_message("s1", "user", "hello")
+        with db.writer():
+            # Already inside a writer() block: runs inline instead of deadlocking
+            assert db.save_chat_session("s2")
+
+        assert db.submit_write(threading.current_thread).result(5).name == "news-db-writer"
+        assert self.session_ids(db) == {"s1", "s2"}
+
+    @pytest.mark.asyncio
+    async def test_async_writes_await_the_queue(self, db):
+        """Test that awaited write methods resolve from the writer queue"""
+        adb = AsyncNewsDatabase(db)
+
+        assert await adb.save_chat_session("s1", title="Async")
+        assert await adb.write(self.insert_session, db, "s2") == "s2"
+        assert self.session_ids(db) == {"s1", "s2"}
+        adb._executor.shutdown()